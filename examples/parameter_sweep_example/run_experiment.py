@@ -3,8 +3,7 @@
 import os
 import argparse
 import yaml
-import pandas as pd
-from simulator.doe import run_parameter_sweep, create_doe_table, append_results_to_doe_table
+from simulator.doe import run_parameter_sweep
 from experiments.predator_prey.logic import PredatorPreyExperiment
 import matplotlib.pyplot as plt
 
@@ -44,41 +43,27 @@ def main():
 
 
     # --- Run Parameter Sweep ---
-    results = run_parameter_sweep(
+    sweep = run_parameter_sweep(
         PredatorPreyExperiment,
         base_config,
         param_ranges,
         output_dir=sweep_output_dir, # Use the sweep-specific directory
-        output_transform='list'  # Always return list for consistency
+        output_transform='stacked'  # One (n_combinations, n_steps + 1) array per output
     )
+    print("Parameter Table:\n", sweep.params)
 
-    # --- Create and Append to DOE Table ---
-    doe_table = create_doe_table(param_ranges)
-    results_table = append_results_to_doe_table(doe_table, results)
-    print("Results Table:\n", results_table)
-
-     # --- Example Analysis (Simplified) ---
-    try:
-        mean_final_prey = results_table.groupby(['prey_growth_rate', 'prey_death_rate'])['prey_population_199'].mean()
-        print("\nMean Final Prey Population:\n", mean_final_prey)
-    except KeyError:
-        print("\nMean Final Prey Population: Could not calculate (n_steps too small?).")
+    # --- Example Analysis (Simplified) ---
+    summary = sweep.params[list(param_ranges)].copy()
+    summary['final_prey'] = sweep['prey_population'][:, -1]
+    mean_final_prey = summary.groupby(list(param_ranges))['final_prey'].mean()
+    print("\nMean Final Prey Population:\n", mean_final_prey)
 
     # --- Plotting (Simplified and Corrected) ---
     if args.plot:
         plt.figure()
-        for label, row in results_table.iterrows():
-            param_combination = ", ".join(f"{k}={v}" for k, v in row[:2].items())  # First 2 columns
-            # Extract the relevant columns *by name*
-            prey_columns = [col for col in results_table.columns if 'prey_population_' in col]
-            time_columns = [col for col in results_table.columns if 'time_' in col]
-            if len(prey_columns) > 0 and len(time_columns) > 0: # added check
-                # Extract the data as NumPy arrays for plotting
-                time_data = results_table[time_columns].values.flatten()
-                prey_data = row[prey_columns].values.flatten()
-                # Trim arrays to same length, use min_len for slicing
-                min_len = min(len(time_data), len(prey_data))
-                plt.plot(time_data[:min_len], prey_data[:min_len], label=param_combination)
+        for i, row in sweep.params.iterrows():
+            param_combination = ", ".join(f"{k}={row[k]}" for k in param_ranges)
+            plt.plot(sweep['time'][i], sweep['prey_population'][i], label=param_combination)
 
         plt.xlabel("Step")
         plt.ylabel("Prey Population")
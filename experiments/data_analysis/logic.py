@@ -1,27 +1,45 @@
 # experiments/data_analysis/logic.py
 from simulator.base import ExperimentLogic
 from simulator.utils import DataDescriptor, DataType
-from simulator.data_handler import load_csv
+from simulator.data_handler import load_csv, iter_csv_chunks
 import numpy as np
 import pandas as pd
 import os # For the file name
 
 class DataAnalysisExperiment(ExperimentLogic): # Corrected Class name
+    init_keys = ('input_data_path', 'chunksize')  # Sweeps load each input file once per mode
+
     def __init__(self, config):
         self.config = config
         self.data_info = None  # Store loaded data and descriptor here
         self.data = None
+        self.summary = None  # Streaming mode: statistics of the 'value' column
 
     def initialize(self, config):
+        if config.get('chunksize'):
+            # Streaming mode: one pass over the file, memory bounded by the chunk size
+            self.summary = summarize_csv_column(config['input_data_path'], 'value', config['chunksize'])
+            return {'summary': self.summary}
         # Load the data in the initialization step
         self.data_info = load_csv(config['input_data_path'])
         self.data = self.data_info['data']  # Access the DataFrame
-        return {} # No persistent state
+        return {'data_info': self.data_info}  # Shared with warm-started runs
+
+    def warm_start(self, config, initial_state):
+        if 'summary' in initial_state:
+            self.summary = initial_state['summary']
+            return initial_state
+        self.data_info = initial_state['data_info']
+        self.data = self.data_info['data']
+        return initial_state
 
     def run_step(self, state, step):
         pass  # No simulation steps
 
     def get_results(self):
+        if self.summary is not None:
+            return self._summary_results(self.summary)
+
         # Perform some basic analysis (example)
         mean_value = self.data['value'].mean()
         std_value = self.data['value'].std()
@@ -63,4 +81,55 @@ class DataAnalysisExperiment(ExperimentLogic): # Corrected Class name
               "descriptor": self.data_info['descriptor']
             }
 
-        }
\ No newline at end of file
+        }
+
+    def _summary_results(self, summary):
+        # The series and the loaded data are not kept in streaming mode
+        results = {}
+        for name in ("mean", "std", "max", "min"):
+            results[name] = {
+                "data": summary[name],
+                "descriptor": DataDescriptor(name, DataType.FLOAT, units="measurement", group="summary")
+            }
+        results["count"] = {
+            "data": summary["count"],
+            "descriptor": DataDescriptor("count", DataType.INT, group="summary")
+        }
+        return results
+
+
+def summarize_csv_column(file_path, column, chunksize=100_000):
+    """
+    Computes count, mean, sample std, max and min of a CSV column in one pass.
+
+    The file is streamed in typed chunks; per-chunk moments are merged with
+    Chan et al.'s parallel update, so the result matches the in-memory
+    statistics without holding more than one chunk.
+    """
+    count, mean, m2 = 0, 0.0, 0.0
+    maximum, minimum = -np.inf, np.inf
+    for chunk in iter_csv_chunks(file_path, chunksize=chunksize, usecols=[column], dtype={column: 'float64'}):
+        values = chunk[column].to_numpy()
+        values = values[~np.isnan(values)]  # Skip missing values, as pandas does
+        if values.size == 0:
+            continue
+        chunk_count = values.size
+        chunk_mean = values.mean()
+        chunk_m2 = ((values - chunk_mean) ** 2).sum()
+        delta = chunk_mean - mean
+        total = count + chunk_count
+        mean += delta * chunk_count / total
+        m2 += chunk_m2 + delta ** 2 * count * chunk_count / total
+        count = total
+        maximum = max(maximum, values.max())
+        minimum = min(minimum, values.min())
+
+    if count == 0:
+        return {"count": 0, "mean": np.nan, "std": np.nan, "max": np.nan, "min": np.nan}
+    return {
+        "count": count,
+        "mean": float(mean),
+        "std": float(np.sqrt(m2 / (count - 1))) if count > 1 else np.nan,  # Sample std, like pandas
+        "max": float(maximum),
+        "min": float(minimum),
+    }
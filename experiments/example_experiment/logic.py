@@ -4,6 +4,9 @@ from simulator.utils import DataDescriptor, DataType
 import numpy as np
 
 class ExampleExperiment(ExperimentLogic):
+    vectorized_sweeps = True  # Outputs are closed-form, see get_results_batch
+    prefix_consistent = True  # Every output has one value per step
+
     def __init__(self, config):
         self.n_steps = config['n_steps']
         self.amplitude = config['amplitude']
@@ -31,4 +34,24 @@ class ExampleExperiment(ExperimentLogic):
                 "data": value_data,
                 "descriptor": DataDescriptor("value", DataType.NDARRAY, shape=value_data.shape, units="arbitrary", group="time_series", plot_type="line")
             }
-        }
\ No newline at end of file
+        }
+
+    @classmethod
+    def get_results_batch(cls, param_table):
+        n_steps = param_table['n_steps'].unique()
+        if len(n_steps) != 1:
+            raise ValueError("All runs of a vectorized sweep must have the same n_steps.")
+        time_row = np.arange(int(n_steps[0]))
+        time_data = np.broadcast_to(time_row, (len(param_table), len(time_row)))  # Shared, not copied
+        value_data = param_table['amplitude'].to_numpy()[:, None] * np.sin(time_row)
+
+        return {
+            "time": {
+                "data": time_data,
+                "descriptor": DataDescriptor("time", DataType.NDARRAY, shape=time_row.shape, units="seconds", group="time_series")
+            },
+            "value": {
+                "data": value_data,
+                "descriptor": DataDescriptor("value", DataType.NDARRAY, shape=time_row.shape, units="arbitrary", group="time_series", plot_type="line")
+            }
+        }
@@ -1,6 +1,7 @@
 # experiments/example_random_walk/logic.py
 from simulator.base import ExperimentLogic
 from simulator.utils import DataDescriptor, DataType
+from simulator.recorder import Recorder
 import numpy as np
 
 class RandomWalkExperiment(ExperimentLogic):
@@ -8,9 +9,12 @@ class RandomWalkExperiment(ExperimentLogic):
         self.n_steps = config['n_steps']
         self.step_size = config['step_size']
         self.position = 0  # Initialize position
-        # Create arrays to store values
-        self.positions = [0]
-        self.steps = [0]
+        # Record values (which steps are kept follows the config's recording policy)
+        self.recorder = Recorder.from_config(config, {
+            "step": DataDescriptor("step", DataType.NDARRAY,  units="steps", group="time_series", x_axis='step', dtype="<i8"),
+            "position": DataDescriptor("position", DataType.NDARRAY,  units="units", group="time_series", plot_type="line", x_axis="step", dtype="<f8"),
+        }, index="step")
+        self.recorder.record(0, step=0, position=0)
 
 
     def initialize(self, config):
@@ -20,18 +24,8 @@ class RandomWalkExperiment(ExperimentLogic):
         # Generate a random step (-1 or 1)
         step_direction = np.random.choice([-1, 1])
         new_position = state['position'] + self.step_size * step_direction
-        self.steps.append(step + 1)
-        self.positions.append(new_position)
+        self.recorder.record(step + 1, step=step + 1, position=new_position)
         return {'step': step + 1, 'position': new_position}
 
     def get_results(self):
-        return {
-            "step": {
-                "data": np.array(self.steps),
-                "descriptor": DataDescriptor("step", DataType.NDARRAY,  units="steps", group="time_series", x_axis='step')
-            },
-            "position": {
-                "data": np.array(self.positions),
-                "descriptor": DataDescriptor("position", DataType.NDARRAY,  units="units", group="time_series", plot_type="line", x_axis="step")
-            }
-        }
\ No newline at end of file
+        return self.recorder.results()
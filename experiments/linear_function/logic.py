@@ -4,6 +4,8 @@ from simulator.utils import DataDescriptor, DataType
 import numpy as np
 
 class LinearFunctionExperiment(ExperimentLogic):
+    vectorized_sweeps = True  # y = m * x + c for every (m, c) at once, see get_results_batch
+
     def __init__(self, config):
         self.n_points = config['n_points']
         self.m = config['m']
@@ -31,4 +33,32 @@ class LinearFunctionExperiment(ExperimentLogic):
                 "data": y_values,
                 "descriptor": DataDescriptor("y", DataType.NDARRAY, shape=y_values.shape, units="y_units", group="time_series", plot_type="line", x_axis = 'x')
             }
-        }
\ No newline at end of file
+        }
+
+    @classmethod
+    def get_results_batch(cls, param_table):
+        n_points = param_table['n_points'].unique()
+        if len(n_points) != 1:
+            raise ValueError("All runs of a vectorized sweep must have the same n_points.")
+        x_min = param_table['x_min'].to_numpy(dtype=float)
+        x_max = param_table['x_max'].to_numpy(dtype=float)
+        if np.all(x_min == x_min[0]) and np.all(x_max == x_max[0]):
+            x_row = np.linspace(x_min[0], x_max[0], int(n_points[0]))
+            x_values = np.broadcast_to(x_row, (len(param_table), len(x_row)))  # Shared, not copied
+        else:
+            x_values = np.linspace(x_min, x_max, int(n_points[0]), axis=-1)
+        m = param_table['m'].to_numpy(dtype=float)[:, None]
+        c = param_table['c'].to_numpy(dtype=float)[:, None]
+        y_values = m * x_values + c
+
+        shape = x_values.shape[1:]
+        return {
+            "x": {
+                "data": x_values,
+                "descriptor": DataDescriptor("x", DataType.NDARRAY, shape=shape, units="x_units", group="time_series",  x_axis='x')
+            },
+            "y": {
+                "data": y_values,
+                "descriptor": DataDescriptor("y", DataType.NDARRAY, shape=shape, units="y_units", group="time_series", plot_type="line", x_axis = 'x')
+            }
+        }
@@ -6,25 +6,50 @@ from experiments.predator_prey.logic import PredatorPreyExperiment  # Import the
 import numpy as np
 
 class PredatorPreyCalibrationExperiment(PredatorPreyExperiment):  # Inherit
+    prefix_consistent = False  # Outputs are trimmed to the observed data length
+    init_keys = PredatorPreyExperiment.init_keys + ('observed_data_path',)
+
     def __init__(self, config):
         super().__init__(config)  # Call the base class constructor
-        self.observed_data_info = None
-        if 'observed_data_path' in config:
-            try:
-                self.observed_data_info = load_csv(config['observed_data_path'])
-            except FileNotFoundError as e:
-                print(f"Warning: Observed data file not found: {e}")
-                # Don't raise the error; allow the simulation to run
-                # even if the observed data is missing (for flexibility).
-            except Exception as e:
-                print(f"Warning: Error loading observed data: {e}")
+        self._observed_data_path = config.get('observed_data_path')
+        self._observed_data_info = None
+        self._observed_data_loaded = False  # Loaded on first access (or adopted in warm_start)
+
+    @property
+    def observed_data_info(self):
+        if not self._observed_data_loaded:
+            self._observed_data_loaded = True
+            if self._observed_data_path is not None:
+                try:
+                    self._observed_data_info = load_csv(self._observed_data_path)
+                except FileNotFoundError as e:
+                    print(f"Warning: Observed data file not found: {e}")
+                    # Don't raise the error; allow the simulation to run
+                    # even if the observed data is missing (for flexibility).
+                except Exception as e:
+                    print(f"Warning: Error loading observed data: {e}")
+        return self._observed_data_info
+
+    def initialize(self, config):
+        state = super().initialize(config)
+        state['observed_data_info'] = self.observed_data_info  # Shared with warm-started runs
+        return state
+
+    def warm_start(self, config, initial_state):
+        self._observed_data_info = initial_state.get('observed_data_info')
+        self._observed_data_loaded = True
+        return initial_state
 
     def get_results(self):
         results = super().get_results() # Get result from parent class
         if self.observed_data_info:
             results['observed_data'] = self.observed_data_info
-            # Adjust length
-            results['time']['data'] = results['time']['data'][:len(results['observed_data']['data'])]
-            results["prey_population"]['data'] = results["prey_population"]['data'][:len(results['observed_data']['data'])]
-            results["predator_population"]['data'] = results["predator_population"]['data'][:len(results['observed_data']['data'])]
-        return results
\ No newline at end of file
+            observed = results['observed_data']['data']
+            if 'time' in observed.columns:
+                # Keep the simulation up to the grid point at or after the last observation
+                n_rows = int(np.searchsorted(results['time']['data'], observed['time'].max())) + 1
+            else:
+                n_rows = len(observed)  # Observations are assumed to be one per step
+            for name in ('time',) + self.output_names:
+                results[name]['data'] = results[name]['data'][:n_rows]
+        return results
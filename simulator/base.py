@@ -1,12 +1,91 @@
 # simulator/base.py
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional, Tuple
+from typing import Dict, Any, List, Optional, Tuple
+
+import pandas as pd
 
 class ExperimentLogic(ABC):
     """
     Abstract base class for defining experiment logic.
     """
 
+    #: Whether a partially run instance can be continued past the ``n_steps``
+    #: it was created with (see ``extend_horizon``).  Multi-fidelity sweeps use
+    #: this to promote a run to a longer horizon instead of restarting it.
+    supports_resume: bool = False
+
+    #: Whether the results of a run with fewer ``n_steps`` are an exact prefix
+    #: of a longer run with otherwise identical configuration.  Sweeps over
+    #: ``n_steps`` then run only the longest horizon and slice the shorter ones
+    #: (array outputs whose length is ``n_steps`` or ``n_steps + 1`` are cut to
+    #: the shorter horizon).  A run with any other output (scalars, summaries,
+    #: samples on a custom grid) is never sliced; the shorter horizon is run on
+    #: its own.  Only deterministic experiments whose outputs are all indexed by
+    #: step should opt in.
+    prefix_consistent: bool = False
+
+    @classmethod
+    def is_prefix_consistent(cls, config: Dict[str, Any]) -> bool:
+        """
+        Whether runs with this configuration are prefix consistent.
+
+        Defaults to ``prefix_consistent``; experiments for which it depends on
+        the configuration (e.g. the integrator) override this.
+        """
+        return cls.prefix_consistent
+
+    #: Config keys that ``initialize`` depends on.  When set, sweeps call
+    #: ``initialize`` once per distinct combination of these values and hand
+    #: every other run a shared copy of that initial state through
+    #: ``warm_start``.  ``None`` means every run is initialized from scratch.
+    init_keys: Optional[Tuple[str, ...]] = None
+
+    #: Config keys that may differ between runs integrated together by
+    #: ``run_batch``.  When set, sweeps group combinations that agree on every
+    #: other key and run each group as a batch.  ``None`` means the experiment
+    #: has no batched mode.
+    batch_keys: Optional[Tuple[str, ...]] = None
+
+    @classmethod
+    def run_batch(cls, configs: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Dict[str, Any]]], Any]:
+        """
+        Runs several configurations, differing only in ``batch_keys``, at once.
+
+        Only called when ``batch_keys`` is set.
+
+        Args:
+            configs: The configurations of the runs.
+
+        Returns:
+            The results of every run (as returned by ``get_results``) and a
+            boolean mask of the runs that failed.
+        """
+        raise NotImplementedError(f"{cls.__name__} does not support batched runs.")
+
+    #: Whether ``get_results_batch`` is implemented: the outputs are closed-form
+    #: functions of the config, so a whole sweep can be computed with array
+    #: operations instead of one run per combination.
+    vectorized_sweeps: bool = False
+
+    @classmethod
+    def get_results_batch(cls, param_table: pd.DataFrame) -> Dict[str, Dict[str, Any]]:
+        """
+        Computes the results of many configurations at once.
+
+        Only called when ``vectorized_sweeps`` is True.
+
+        Args:
+            param_table: One row per run, one column per config key.
+
+        Returns:
+            A results dictionary like ``get_results``, except that every
+            ``data`` array has a leading axis over the rows of ``param_table``
+            (it may be a read-only broadcast view) and the descriptors
+            describe a single run.  Raises ValueError if the rows cannot be
+            computed together (e.g. outputs of different lengths).
+        """
+        raise NotImplementedError(f"{cls.__name__} does not support vectorized sweeps.")
+
     @abstractmethod
     def initialize(self, config: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -20,6 +99,25 @@ class ExperimentLogic(ABC):
         """
         pass
 
+    def warm_start(self, config: Dict[str, Any], initial_state: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Adopts an initial state computed by ``initialize`` on another instance.
+
+        Called instead of ``initialize`` when the other instance's config agreed
+        on all ``init_keys``.  Arrays in ``initial_state`` are read-only views and
+        DataFrames are shallow copies, so they must not be modified in place.
+        Experiments that keep initialization results on the instance override
+        this to restore them from the state.
+
+        Args:
+            config: A dictionary of configuration parameters.
+            initial_state: The shared initial state.
+
+        Returns:
+            A dictionary representing the initial state of the simulation.
+        """
+        return initial_state
+
     @abstractmethod
     def run_step(self, state: Dict[str, Any], step: int) -> Dict[str, Any]:
         """
@@ -34,6 +132,27 @@ class ExperimentLogic(ABC):
         """
         pass
 
+    def advance(self, state: Dict[str, Any], start: int, stop: int) -> Dict[str, Any]:
+        """
+        Runs steps ``start`` .. ``stop - 1`` and returns the new state.
+
+        The engine and sweeps advance runs through this method.  The default
+        calls ``run_step`` for every step; experiments that can cover a span
+        of steps at once (e.g. integrate an ODE over the whole horizon)
+        override it.
+
+        Args:
+            state: A dictionary representing the current state of the simulation.
+            start: The first step to run.
+            stop: The step to stop before.
+
+        Returns:
+            A dictionary representing the state after step ``stop - 1``.
+        """
+        for step in range(start, stop):
+            state = self.run_step(state, step)
+        return state
+
     @abstractmethod
     def get_results(self) -> Dict[str, Dict[str, Any]]:
         """
@@ -45,6 +164,19 @@ class ExperimentLogic(ABC):
         """
         pass
 
+    def extend_horizon(self, n_steps: int) -> None:
+        """
+        Prepares a partially run experiment to continue up to ``n_steps`` total steps.
+
+        Only called when ``supports_resume`` is True.  After this call, ``run_step``
+        is called for the remaining steps and ``get_results`` must describe the
+        full ``n_steps`` horizon.
+
+        Args:
+            n_steps: The new total number of steps.
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not support resuming runs.")
+
     def visualize(self, results: Dict[str, Dict[str, Any]]) -> None:
         """
         Optionally provides custom visualization logic.
@@ -0,0 +1,260 @@
+# simulator/blob_store.py
+import hashlib
+import io
+import os
+import time
+import uuid
+import zlib
+from typing import Dict, Any, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+BLOB_DIR = "blobs"  # Store location inside an output directory
+BLOB_KEY = "__blob__"  # {"__blob__": "<digest>"} stands for a stored output in a record
+BLOB_MIN_NBYTES = 256  # Smaller outputs are cheaper to keep inline
+GC_GRACE_SECONDS = 300.0  # collect_garbage leaves younger unreferenced blobs alone (their writer may still be adding refs)
+
+
+def _available_codecs() -> List[str]:
+    codecs = []
+    try:
+        import zstandard  # noqa: F401
+        codecs.append("zstd")
+    except ImportError:
+        pass
+    try:
+        import lz4.frame  # noqa: F401
+        codecs.append("lz4")
+    except ImportError:
+        pass
+    codecs.append("zlib")  # Always available
+    return codecs
+
+
+class BlobStore:
+    """
+    Content-addressed, compressed store for array and DataFrame outputs.
+
+    Every value is serialized to ``.npy`` bytes, hashed (SHA-256 of the bytes)
+    and written once, compressed, as ``objects/<digest[:2]>/<digest>.<codec>``.
+    Identical outputs of different runs (the same ``time`` axis, the same
+    observed data) therefore take up space only once.
+
+    References are empty marker files ``refs/<digest>/<owner>``, one per
+    (blob, record) pair, so concurrent writers (sweep workers) never need a
+    lock: creating or removing a reference is a single atomic file operation.
+    `put` adds the reference before it looks for or writes the object, and
+    `collect_garbage` moves an unreferenced object aside and checks its
+    references again before deleting it, so a collection running alongside
+    writers never deletes a blob that a record is about to reference.
+    """
+
+    def __init__(self, root: str, codec: Optional[str] = None):
+        """
+        Args:
+            root: Store directory (usually ``<output_dir>/blobs``).
+            codec: 'zstd', 'lz4' or 'zlib'.  Defaults to the best one installed;
+                   blobs written with any codec can always be read back if that
+                   codec is available.
+        """
+        available = _available_codecs()
+        if codec is None:
+            codec = available[0]
+        if codec not in available:
+            raise ValueError(f"Codec '{codec}' is not available. Available codecs: {available}.")
+        self.root = root
+        self.codec = codec
+        os.makedirs(os.path.join(root, "objects"), exist_ok=True)
+        os.makedirs(os.path.join(root, "refs"), exist_ok=True)
+
+    # --- Writing and reading ---
+
+    def put(self, value: Union[np.ndarray, pd.DataFrame], owner: Optional[str] = None) -> str:
+        """Stores a value (if not stored yet), adds a reference from `owner` and returns its digest."""
+        payload = _serialize(value)
+        digest = hashlib.sha256(payload).hexdigest()
+        if owner is not None:
+            self.add_ref(digest, owner)  # First: from now on, garbage collection keeps (or restores) the object
+        if self._find(digest) is None:
+            path = self._object_path(digest, self.codec)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            temp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+            with open(temp_path, "wb") as f:
+                f.write(_compress(payload, self.codec))
+            os.replace(temp_path, path)  # Same digest, same content: concurrent writers agree
+        return digest
+
+    def get(self, digest: str) -> Union[np.ndarray, pd.DataFrame]:
+        path = self._find(digest)
+        if path is None:
+            raise KeyError(f"Blob not found: {digest}")
+        with open(path, "rb") as f:
+            payload = _decompress(f.read(), path.rsplit(".", 1)[1])
+        return _deserialize(payload)
+
+    def __contains__(self, digest: str) -> bool:
+        return self._find(digest) is not None
+
+    # --- References ---
+
+    def add_ref(self, digest: str, owner: str) -> None:
+        ref_dir = os.path.join(self.root, "refs", digest)
+        while True:
+            os.makedirs(ref_dir, exist_ok=True)
+            try:
+                open(os.path.join(ref_dir, owner), "a").close()
+                return
+            except FileNotFoundError:
+                continue  # The empty directory was just removed by collect_garbage; create it again
+
+    def refcount(self, digest: str) -> int:
+        ref_dir = os.path.join(self.root, "refs", digest)
+        return len(os.listdir(ref_dir)) if os.path.isdir(ref_dir) else 0
+
+    def release(self, owner: str) -> int:
+        """Drops every reference held by `owner` (e.g. a deleted run); returns how many."""
+        released = 0
+        for digest in os.listdir(os.path.join(self.root, "refs")):
+            ref_path = os.path.join(self.root, "refs", digest, owner)
+            if os.path.exists(ref_path):
+                os.remove(ref_path)
+                released += 1
+        return released
+
+    def collect_garbage(self, live_owners: Optional[List[str]] = None,
+                        grace_seconds: float = GC_GRACE_SECONDS) -> Dict[str, int]:
+        """
+        Deletes blobs that are no longer referenced.
+
+        Safe to run while other processes write: objects and empty reference
+        directories younger than `grace_seconds` are kept, and an object is
+        moved aside and its references checked again before it is deleted.
+
+        Args:
+            live_owners: If given, references from owners not in this list (runs
+                         whose directories were deleted) are dropped first.
+            grace_seconds: Minimum age of the unreferenced objects and empty
+                           reference directories to delete.
+
+        Returns:
+            Counts of the dropped references and deleted blobs, and the bytes freed.
+        """
+        stats = {"released_refs": 0, "deleted_blobs": 0, "freed_bytes": 0}
+        live = set(live_owners) if live_owners is not None else None
+        cutoff = time.time() - grace_seconds
+        refs_root = os.path.join(self.root, "refs")
+        referenced = set()
+        for digest in os.listdir(refs_root):
+            ref_dir = os.path.join(refs_root, digest)
+            try:
+                if live is not None:
+                    for owner in os.listdir(ref_dir):
+                        if owner not in live:
+                            os.remove(os.path.join(ref_dir, owner))
+                            stats["released_refs"] += 1
+                if os.listdir(ref_dir):
+                    referenced.add(digest)
+                elif os.path.getmtime(ref_dir) <= cutoff:
+                    os.rmdir(ref_dir)  # Fails if a reference was added meanwhile
+            except OSError:
+                referenced.add(digest)  # Changed by a concurrent writer
+        objects_root = os.path.join(self.root, "objects")
+        for prefix in os.listdir(objects_root):
+            for name in os.listdir(os.path.join(objects_root, prefix)):
+                if name.endswith((".tmp", ".gc")):
+                    continue  # Being written, or being collected by another process
+                digest = name.split(".", 1)[0]
+                if digest in referenced:
+                    continue
+                path = os.path.join(objects_root, prefix, name)
+                trash_path = f"{path}.{uuid.uuid4().hex}.gc"
+                try:
+                    if os.path.getmtime(path) > cutoff:
+                        continue  # Just written; its reference may not exist yet
+                    os.replace(path, trash_path)
+                except FileNotFoundError:
+                    continue
+                if self.refcount(digest):
+                    os.replace(trash_path, path)  # Referenced meanwhile: put it back
+                    continue
+                stats["freed_bytes"] += os.path.getsize(trash_path)
+                os.remove(trash_path)
+                stats["deleted_blobs"] += 1
+        return stats
+
+    def stats(self) -> Dict[str, Any]:
+        """Number of blobs and their stored (compressed) size."""
+        count, stored = 0, 0
+        objects_root = os.path.join(self.root, "objects")
+        for prefix in os.listdir(objects_root):
+            for name in os.listdir(os.path.join(objects_root, prefix)):
+                if not name.endswith((".tmp", ".gc")):
+                    count += 1
+                    stored += os.path.getsize(os.path.join(objects_root, prefix, name))
+        return {"blobs": count, "stored_bytes": stored, "codec": self.codec}
+
+    # --- Helpers ---
+
+    def _object_path(self, digest: str, codec: str) -> str:
+        return os.path.join(self.root, "objects", digest[:2], f"{digest}.{codec}")
+
+    def _find(self, digest: str) -> Optional[str]:
+        for codec in ("zstd", "lz4", "zlib"):
+            path = self._object_path(digest, codec)
+            if os.path.exists(path):
+                return path
+        return None
+
+
+def _serialize(value: Union[np.ndarray, pd.DataFrame]) -> bytes:
+    """
+    Canonical bytes of a value: .npy of the array, or of a DataFrame's records.
+
+    The first byte marks the kind: 'A' (array) or 'D' (DataFrame), in lower
+    case if the payload holds Python objects (pickled, e.g. string columns).
+    """
+    if isinstance(value, pd.DataFrame):
+        kind, array = b"D", value.to_records(index=False)
+    elif isinstance(value, np.ndarray):
+        kind, array = b"A", np.ascontiguousarray(value)
+    else:
+        raise TypeError(f"Unsupported type for the blob store: {type(value)}")
+    if array.dtype.hasobject:
+        kind = kind.lower()
+    buffer = io.BytesIO()
+    buffer.write(kind)
+    np.save(buffer, array, allow_pickle=array.dtype.hasobject)
+    return buffer.getvalue()
+
+
+def _deserialize(payload: bytes) -> Union[np.ndarray, pd.DataFrame]:
+    kind = payload[:1]
+    array = np.load(io.BytesIO(payload[1:]), allow_pickle=kind.islower())
+    if kind.upper() == b"D":
+        return pd.DataFrame.from_records(array)
+    return array
+
+
+def _compress(payload: bytes, codec: str) -> bytes:
+    if codec == "zstd":
+        import zstandard
+        return zstandard.ZstdCompressor().compress(payload)
+    if codec == "lz4":
+        import lz4.frame
+        return lz4.frame.compress(payload)
+    return zlib.compress(payload, 6)
+
+
+def _decompress(data: bytes, codec: str) -> bytes:
+    if codec == "zstd":
+        import zstandard
+        return zstandard.ZstdDecompressor().decompress(data)
+    if codec == "lz4":
+        import lz4.frame
+        return lz4.frame.decompress(data)
+    return zlib.decompress(data)
+
+
+def is_blob_reference(value: Any) -> bool:
+    return isinstance(value, dict) and set(value) == {BLOB_KEY}
@@ -0,0 +1,251 @@
+# simulator/calibration.py
+import itertools
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, Callable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .base import ExperimentLogic
+from .doe import _run_combination, _save_run_record, _batch_row
+from .observations import ObservationMap, sse, stack_outputs, observed_columns
+from .utils import DataDescriptor, DataType
+
+logger = logging.getLogger(__name__)
+
+Objective = Callable[[Dict[str, Dict[str, Any]]], float]
+
+
+def observed_sse(results: Dict[str, Dict[str, Any]], time_column: str = 'time') -> float:
+    """
+    Sum of squared errors between simulated outputs and the ``observed_data`` output.
+
+    Every column of the observed DataFrame (other than `time_column`) that is
+    also an output is compared at the observation times, interpolating the
+    simulated trajectory between grid points (see `ObservationMap`).  NaN
+    observations are skipped; a failed (NaN) simulation scores ``inf``.
+    """
+    return float(_ObservedSSE(time_column)([results])[0])
+
+
+class CalibrationResult:
+    """Outcome of `calibrate`: the best fit, its results and the optimization trace."""
+
+    def __init__(self, best_params: Optional[Dict[str, float]], best_loss: float,
+                 results: Optional[Dict[str, Dict[str, Any]]],
+                 trace: pd.DataFrame, stop_reason: str, n_evaluations: int,
+                 record_id: Optional[str] = None):
+        self.best_params = best_params
+        self.best_loss = best_loss
+        self.results = results  # Results of the best-fit run (None if every run failed)
+        self.trace = trace  # One row per generation
+        self.stop_reason = stop_reason  # 'converged', 'stagnation', 'max_generations' or 'failed'
+        self.n_evaluations = n_evaluations
+        self.record_id = record_id
+
+    def __repr__(self) -> str:
+        return (f"CalibrationResult(best_loss={self.best_loss:.6g}, best_params={self.best_params}, "
+                f"generations={len(self.trace)}, stop_reason='{self.stop_reason}')")
+
+
+def calibrate(experiment_logic_class: type[ExperimentLogic], base_config: Dict[str, Any],
+              param_bounds: Dict[str, Tuple[float, float]],
+              objective: Optional[Objective] = None,
+              popsize: int = 15,
+              max_generations: int = 100,
+              tol: float = 0.01,
+              patience: Optional[int] = 20,
+              min_improvement: float = 1e-8,
+              mutation: Any = (0.5, 1.0),
+              recombination: float = 0.7,
+              seed: Optional[int] = None,
+              n_workers: Optional[int] = None,
+              output_dir: Optional[str] = "experiments_output") -> CalibrationResult:
+    """
+    Fits config parameters by differential evolution over whole populations.
+
+    Each generation's candidate parameter vectors are evaluated in one call
+    (scipy's `differential_evolution` with ``vectorized=True``): experiments
+    with `batch_keys` covering the fitted parameters simulate the population
+    with one `run_batch`, experiments with `vectorized_sweeps` with one
+    `get_results_batch`, and any other experiment run by run.  With
+    `n_workers`, the population is split across that many processes.
+
+    Args:
+        experiment_logic_class: The *class* of the ExperimentLogic to use (not an instance).
+        base_config: Configuration of the runs, apart from the fitted parameters.
+        param_bounds: `(low, high)` bounds of every fitted parameter.
+        objective: Loss of a results dictionary (lower is better).  Defaults to
+                   `observed_sse`, the squared error against the experiment's
+                   ``observed_data`` output at the observation times, computed
+                   for the whole population at once.
+        popsize: Population size as a multiple of the number of parameters.
+        max_generations: Maximum number of generations.
+        tol: Relative convergence tolerance of the population's losses (see scipy).
+        patience: Stop early once the best loss has not improved by more than
+                  `min_improvement` (relative) for this many generations
+                  (None to disable).
+        min_improvement: Relative improvement that resets the patience counter.
+        mutation: Differential weight, or `(min, max)` for dithering.
+        recombination: Crossover probability.
+        seed: Random seed, for reproducible fits.
+        n_workers: Evaluate each population in this many worker processes.
+        output_dir: Where to save the `ExperimentRecord` of the best fit, with the
+                    trace as its ``calibration_trace`` output (None to skip saving).
+
+    Returns:
+        A `CalibrationResult`.  If no candidate scored a finite loss, its
+        `stop_reason` is 'failed', `best_params` and `results` are None and no
+        record is saved.
+    """
+    from scipy.optimize import differential_evolution  # Only needed for calibration
+
+    if not issubclass(experiment_logic_class, ExperimentLogic):
+        raise TypeError("experiment_logic_class must be a subclass of ExperimentLogic")
+    if not param_bounds:
+        raise ValueError("param_bounds cannot be empty.")
+    default_objective = _ObservedSSE()  # Aligns the observations once, then scores whole populations
+    names = list(param_bounds)
+    bounds = [tuple(map(float, param_bounds[name])) for name in names]
+
+    state = {"best_loss": np.inf, "best_params": None, "best_results": None, "stale": 0, "stop_reason": None}
+    trace: List[Dict[str, Any]] = []
+    n_evaluations = 0
+
+    def to_configs(population: np.ndarray) -> List[Dict[str, Any]]:
+        return [dict(base_config, **{name: float(value) for name, value in zip(names, column)})
+                for column in population.T]
+
+    def evaluate(population: np.ndarray) -> np.ndarray:
+        nonlocal n_evaluations
+        population = population.reshape(len(names), -1)
+        results_list = _simulate_population(experiment_logic_class, to_configs(population), names,
+                                            executor, n_workers)
+        if objective is None:
+            losses = default_objective(results_list)
+        else:
+            losses = np.array([float(objective(results)) for results in results_list])
+        losses[~np.isfinite(losses)] = np.inf
+        n_evaluations += len(losses)
+
+        best = int(np.argmin(losses))
+        previous = state["best_loss"]
+        if losses[best] < previous:
+            state.update(best_loss=float(losses[best]), best_results=results_list[best],
+                         best_params=dict(zip(names, map(float, population[:, best]))))
+        improved = previous - state["best_loss"] > min_improvement * max(abs(previous), 1e-300)
+        state["stale"] = 0 if improved or not np.isfinite(previous) else state["stale"] + 1
+        finite = losses[np.isfinite(losses)]
+        trace.append(dict({'generation': len(trace), 'n_evaluations': n_evaluations,
+                           'best_loss': state["best_loss"],
+                           'generation_best_loss': float(losses[best]),
+                           'mean_loss': float(finite.mean()) if len(finite) else np.inf,
+                           'failed': int(len(losses) - len(finite))},
+                          **{f"best_{name}": value for name, value in (state["best_params"] or {}).items()}))
+        return losses
+
+    def callback(intermediate_result):
+        if patience is not None and state["stale"] >= patience:
+            state["stop_reason"] = 'stagnation'
+            raise StopIteration  # Ends the optimization; the best population member is kept
+
+    executor = ProcessPoolExecutor(max_workers=n_workers) if n_workers and n_workers > 1 else None
+    try:
+        solution = differential_evolution(evaluate, bounds, maxiter=max_generations, popsize=popsize, tol=tol,
+                                          mutation=mutation, recombination=recombination, seed=seed,
+                                          callback=callback, polish=False, updating='deferred',
+                                          vectorized=True)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    stop_reason = state["stop_reason"] or ('converged' if solution.success else 'max_generations')
+    logger.info(f"Calibration stopped ({stop_reason}) after {len(trace)} generations: "
+                f"best loss {state['best_loss']:.6g} at {state['best_params']}")
+
+    trace_table = pd.DataFrame(trace)
+    if state["best_params"] is None:
+        logger.warning("Calibration failed: no candidate had a finite loss (all runs failed or the objective "
+                       "returned NaN or inf); no record is saved.")
+        return CalibrationResult(None, np.inf, None, trace_table, 'failed', n_evaluations)
+    best_config = dict(base_config, **state["best_params"])
+    results = state["best_results"]
+    record_id = None
+    if output_dir is not None:
+        recorded = dict(results)
+        recorded['calibration_trace'] = {
+            'data': trace_table,
+            'descriptor': DataDescriptor('calibration_trace', DataType.DATAFRAME, shape=trace_table.shape,
+                                         group='calibration', x_axis='generation'),
+        }
+        summary = {'method': 'differential_evolution', 'parameters': names, 'best_loss': state["best_loss"],
+                   'generations': len(trace), 'n_evaluations': n_evaluations, 'stop_reason': stop_reason}
+        record_id = _save_run_record(experiment_logic_class, best_config, recorded, output_dir,
+                                     performance={'calibration': summary})
+    return CalibrationResult(state["best_params"], state["best_loss"], results, trace_table, stop_reason,
+                             n_evaluations, record_id)
+
+
+class _ObservedSSE:
+    """`observed_sse` of many runs at once, with the observation map built on first use."""
+
+    def __init__(self, time_column: str = 'time'):
+        self.time_column = time_column
+        self.grid = None
+
+    def __call__(self, results_list: List[Dict[str, Dict[str, Any]]]) -> np.ndarray:
+        if self.grid is None:
+            self._align(results_list[0])
+        if not all(np.array_equal(results['time']['data'], self.grid) for results in results_list):
+            return np.array([observed_sse(results, self.time_column) for results in results_list])
+        losses = sse(stack_outputs(results_list, self.columns), self.values, self.mapping)
+        losses[~np.isfinite(losses)] = np.inf
+        return losses
+
+    def _align(self, results: Dict[str, Dict[str, Any]]) -> None:
+        if 'observed_data' not in results:
+            raise ValueError("The results contain no 'observed_data'; pass an objective.")
+        observed = results['observed_data']['data']
+        self.columns = observed_columns(observed, results, self.time_column)
+        self.values = observed[self.columns].apply(pd.to_numeric, errors='coerce').to_numpy(dtype=float).T
+        self.mapping = ObservationMap.from_results(results, self.time_column)
+        self.grid = results['time']['data']
+
+
+def _simulate_population(experiment_logic_class: type[ExperimentLogic], configs: List[Dict[str, Any]],
+                         names: List[str], executor: Optional[ProcessPoolExecutor] = None,
+                         n_workers: Optional[int] = None) -> List[Dict[str, Dict[str, Any]]]:
+    """
+    Results of every config, through the fastest path the experiment supports.
+
+    With an `executor`, the configs are split into `n_workers` chunks run in its processes.
+    """
+    batch_keys = experiment_logic_class.batch_keys
+    if batch_keys is not None and set(names) <= set(batch_keys):
+        run = _run_batch
+    elif experiment_logic_class.vectorized_sweeps:
+        run = _run_vectorized_batch
+    else:
+        run = _run_each
+    if executor is None:
+        return run(experiment_logic_class, configs)
+    chunks = [list(chunk) for chunk in np.array_split(np.arange(len(configs)), n_workers or 1) if len(chunk)]
+    parts = executor.map(run, itertools.repeat(experiment_logic_class), [[configs[i] for i in chunk] for chunk in chunks])
+    return [results for part in parts for results in part]
+
+
+def _run_batch(experiment_logic_class: type[ExperimentLogic],
+               configs: List[Dict[str, Any]]) -> List[Dict[str, Dict[str, Any]]]:
+    results_list, _ = experiment_logic_class.run_batch(configs)  # Failed runs are NaN and score inf
+    return results_list
+
+
+def _run_vectorized_batch(experiment_logic_class: type[ExperimentLogic],
+                          configs: List[Dict[str, Any]]) -> List[Dict[str, Dict[str, Any]]]:
+    stacked = experiment_logic_class.get_results_batch(pd.DataFrame(configs))
+    return [_batch_row(stacked, i) for i in range(len(configs))]
+
+
+def _run_each(experiment_logic_class: type[ExperimentLogic],
+              configs: List[Dict[str, Any]]) -> List[Dict[str, Dict[str, Any]]]:
+    return [_run_combination(experiment_logic_class, config, None)[0] for config in configs]
@@ -0,0 +1,143 @@
+# simulator/codecs.py
+import zlib
+from abc import ABC, abstractmethod
+from typing import Dict, Any, Tuple, Union
+
+import numpy as np
+
+CodecSpec = Union[str, Dict[str, Any]]  # 'name' or {'name': ..., <options>}
+
+
+class Codec(ABC):
+    """
+    Encodes a numeric NDARRAY output to bytes and back.
+
+    Codecs are selected per output with ``DataDescriptor(codec=...)`` and
+    applied by the persistence layer.  `encode` returns the payload and a
+    small JSON-serializable dict of whatever `decode` needs besides it.
+    """
+
+    name: str = ""
+    lossless: bool = True
+
+    @abstractmethod
+    def encode(self, array: np.ndarray) -> Tuple[bytes, Dict[str, Any]]:
+        pass
+
+    @abstractmethod
+    def decode(self, payload: bytes, meta: Dict[str, Any]) -> np.ndarray:
+        pass
+
+
+class DeltaShuffleDeflate(Codec):
+    """
+    Lossless: delta along the first (time) axis, byte shuffle, deflate.
+
+    Floats are differenced as their integer bit patterns (with wrap-around),
+    which is exact.  Consecutive values of a smooth trajectory share sign,
+    exponent and leading mantissa bytes, so after shuffling (all first bytes,
+    then all second bytes, ...) long runs of zeros compress well.
+    """
+
+    name = "delta_shuffle_deflate"
+
+    def __init__(self, level: int = 6):
+        self.level = level
+
+    def encode(self, array: np.ndarray) -> Tuple[bytes, Dict[str, Any]]:
+        array = np.ascontiguousarray(array)
+        bits = array.view(_unsigned(array.dtype))
+        delta = bits.copy()
+        if delta.ndim and len(delta) > 1:
+            delta[1:] -= bits[:-1]  # Wraps around for unsigned integers
+        return zlib.compress(_shuffle(delta), self.level), {}
+
+    def decode(self, payload: bytes, meta: Dict[str, Any]) -> np.ndarray:
+        dtype, shape = np.dtype(meta["dtype"]), tuple(meta["shape"])
+        unsigned = _unsigned(dtype)
+        delta = _unshuffle(zlib.decompress(payload), unsigned, shape)
+        bits = np.cumsum(delta, axis=0, dtype=unsigned) if delta.ndim else delta
+        return bits.view(dtype)
+
+
+class Quantize(Codec):
+    """
+    Lossy: rounds to a grid of spacing ``2 * error_bound``, then delta+shuffle+deflate.
+
+    Every decoded value is within `error_bound` (absolute) of the original
+    (up to float rounding of the reconstruction).  Only finite float arrays
+    can be quantized.
+    """
+
+    name = "quantize"
+    lossless = False
+
+    def __init__(self, error_bound: float, level: int = 6):
+        if not error_bound > 0:
+            raise ValueError("error_bound must be positive.")
+        self.error_bound = float(error_bound)
+        self.level = level
+
+    def encode(self, array: np.ndarray) -> Tuple[bytes, Dict[str, Any]]:
+        if array.dtype.kind != "f":
+            raise TypeError(f"Quantization needs a float array, got {array.dtype}.")
+        if not np.isfinite(array).all():
+            raise ValueError("Quantization needs finite values (found NaN or inf).")
+        step = 2 * self.error_bound
+        offset = float(array.min()) if array.size else 0.0
+        levels = np.rint((array - offset) / step).astype(np.int64)
+        payload, _ = DeltaShuffleDeflate(self.level).encode(levels)
+        return payload, {"offset": offset, "step": step, "error_bound": self.error_bound}
+
+    def decode(self, payload: bytes, meta: Dict[str, Any]) -> np.ndarray:
+        levels = DeltaShuffleDeflate().decode(payload, {"dtype": "<i8", "shape": meta["shape"]})
+        return (levels * meta["step"] + meta["offset"]).astype(np.dtype(meta["dtype"]))
+
+
+CODECS = {
+    DeltaShuffleDeflate.name: DeltaShuffleDeflate,
+    Quantize.name: Quantize,
+}
+
+
+def register_codec(codec_class: type) -> type:
+    """Makes a Codec subclass selectable by its `name` (usable as a class decorator)."""
+    if not issubclass(codec_class, Codec):
+        raise TypeError("codec_class must be a subclass of Codec")
+    CODECS[codec_class.name] = codec_class
+    return codec_class
+
+
+def get_codec(spec: CodecSpec) -> Codec:
+    """Instantiates the codec named by `spec` ('name' or {'name': ..., **options})."""
+    options = dict(spec) if isinstance(spec, dict) else {"name": spec}
+    name = options.pop("name", None)
+    if name not in CODECS:
+        raise ValueError(f"Unknown codec: {name}. Available codecs: {list(CODECS)}.")
+    return CODECS[name](**options)
+
+
+def encode_array(array: np.ndarray, spec: CodecSpec) -> Tuple[bytes, Dict[str, Any]]:
+    """Encodes an array; the returned meta holds the codec spec, dtype and shape for `decode_array`."""
+    payload, meta = get_codec(spec).encode(array)
+    meta.update({"codec": spec, "dtype": array.dtype.str, "shape": list(array.shape)})
+    return payload, meta
+
+
+def decode_array(payload: bytes, meta: Dict[str, Any]) -> np.ndarray:
+    return get_codec(meta["codec"]).decode(payload, meta)
+
+
+def _unsigned(dtype: np.dtype) -> np.dtype:
+    if dtype.kind not in "biuf" or dtype.itemsize not in (1, 2, 4, 8):
+        raise TypeError(f"Unsupported dtype for encoding: {dtype}")
+    return np.dtype(f"<u{dtype.itemsize}") if dtype.byteorder != ">" else np.dtype(f">u{dtype.itemsize}")
+
+
+def _shuffle(values: np.ndarray) -> bytes:
+    return values.reshape(-1).view(np.uint8).reshape(-1, values.dtype.itemsize).T.tobytes()
+
+
+def _unshuffle(data: bytes, dtype: np.dtype, shape: Tuple[int, ...]) -> np.ndarray:
+    planes = np.frombuffer(data, dtype=np.uint8).reshape(dtype.itemsize, -1)
+    return np.ascontiguousarray(planes.T).view(dtype).reshape(shape)
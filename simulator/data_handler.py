@@ -1,14 +1,199 @@
 # simulator/data_handler.py
+import atexit
+import copy
 import csv
+import itertools
 import json
+import struct
+import threading
+import zipfile
+from collections import OrderedDict
+from collections.abc import Mapping
 import numpy as np
 import pandas as pd
 from .utils import DataDescriptor, DataType
-from typing import Dict, Any, Union, List, Optional
+from typing import Dict, Any, Union, List, Optional, Tuple, Iterator
 import os  # Import os
 
 
-def load_csv(file_path: str, delimiter: str = ',', header: bool = True) -> Dict[str, Any]:
+class DatasetCache:
+    """
+    Process-wide LRU cache of loaded input datasets.
+
+    Entries are keyed by loader, absolute path, modification time, file size
+    and loader options, so a file that changes on disk is simply loaded
+    again.  The cache holds at most `max_bytes` (estimated in-memory size);
+    the least recently used entries are evicted first.
+    """
+
+    def __init__(self, max_bytes: int = 512 * 1024 ** 2):
+        self.max_bytes = max_bytes
+        self.enabled = True
+        self._entries: "OrderedDict[Tuple, Tuple[Any, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Tuple) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: Tuple, value: Any, nbytes: int) -> None:
+        with self._lock:
+            if key in self._entries:
+                self.current_bytes -= self._entries.pop(key)[1]
+            if nbytes > self.max_bytes:
+                return  # Would evict everything else; don't cache
+            self._entries[key] = (value, nbytes)
+            self.current_bytes += nbytes
+            self._evict()
+
+    def resize(self, max_bytes: int) -> None:
+        with self._lock:
+            self.max_bytes = max_bytes
+            self._evict()
+
+    def _evict(self) -> None:
+        while self.current_bytes > self.max_bytes:
+            _, (_, evicted_bytes) = self._entries.popitem(last=False)
+            self.current_bytes -= evicted_bytes
+            self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "entries": len(self._entries),
+                "bytes": self.current_bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+
+_dataset_cache = DatasetCache()
+
+
+def configure_dataset_cache(max_bytes: Optional[int] = None, enabled: Optional[bool] = None) -> None:
+    """
+    Configures the process-wide dataset cache used by the `load_*` functions.
+
+    Args:
+        max_bytes: Memory cap in bytes (entries are evicted LRU-first).
+        enabled: Enable or disable caching for all loaders.
+    """
+    if max_bytes is not None:
+        _dataset_cache.resize(max_bytes)
+    if enabled is not None:
+        _dataset_cache.enabled = enabled
+
+
+def clear_dataset_cache() -> None:
+    """Drops all cached datasets (statistics are kept)."""
+    _dataset_cache.clear()
+
+
+def get_dataset_cache_stats(since: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Returns hit/miss/eviction counts and the hit rate of the dataset cache.
+
+    Args:
+        since: An earlier result of this function; if given, the counts are
+               the difference since then (e.g. for a single experiment run).
+    """
+    stats = _dataset_cache.stats()
+    if since is not None:
+        for key in ("hits", "misses", "evictions"):
+            stats[key] -= since[key]
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+    return stats
+
+
+def _cache_key(loader: str, file_path: str, **options) -> Tuple:
+    """Cache key of a file; raises FileNotFoundError if it does not exist."""
+    stat = os.stat(file_path)
+    return (loader, os.path.abspath(file_path), stat.st_mtime_ns, stat.st_size,
+            tuple(sorted((name, _hashable(value)) for name, value in options.items())))
+
+
+def _hashable(value: Any) -> Any:
+    if isinstance(value, dict):
+        return tuple(sorted((str(k), _hashable(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple, set)):
+        return tuple(_hashable(v) for v in value)
+    if isinstance(value, (str, int, float, bool, type(None))):
+        return value
+    return str(value)  # dtypes, type objects, ...
+
+
+def _estimate_nbytes(value: Any) -> int:
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True).sum())
+    if isinstance(value, dict):
+        return sum(_estimate_nbytes(v) for v in value.values())
+    return 0
+
+
+def _copy_on_write_enabled() -> bool:
+    if int(pd.__version__.split(".")[0]) >= 3:
+        return True  # Always on in pandas >= 3
+    return bool(getattr(pd.options.mode, "copy_on_write", False))
+
+
+def _read_only(value: Any) -> Any:
+    """
+    Copy of a cached dataset that cannot corrupt the cache.
+
+    Arrays become read-only views and DataFrames shallow copy-on-write copies
+    (deep copies on pandas versions without copy-on-write); anything else is
+    deep-copied.
+    """
+    if isinstance(value, np.ndarray):
+        view = value.view()
+        view.flags.writeable = False
+        return view
+    if isinstance(value, pd.DataFrame):
+        return value.copy(deep=not _copy_on_write_enabled())
+    if isinstance(value, DataDescriptor):
+        return copy.copy(value)
+    if isinstance(value, dict):
+        return {k: _read_only(v) for k, v in value.items()}
+    return copy.deepcopy(value)
+
+
+def _cached_load(loader: str, file_path: str, load, use_cache: bool, nbytes: Optional[int] = None, **options) -> Any:
+    """Loads through the dataset cache (if enabled) and returns a read-only copy."""
+    if not (use_cache and _dataset_cache.enabled):
+        return load()
+    key = _cache_key(loader, file_path, **options)
+    value = _dataset_cache.get(key)
+    if value is None:
+        value = load()
+        _dataset_cache.put(key, value, nbytes if nbytes is not None else _estimate_nbytes(value))
+    return _read_only(value)
+
+
+def load_csv(file_path: str, delimiter: str = ',', header: bool = True, use_cache: bool = True,
+             dtype: Optional[Dict[str, Any]] = None, usecols: Optional[List[Union[str, int]]] = None,
+             engine: Optional[str] = None) -> Dict[str, Any]:
     """
     Loads data from a CSV file.
 
@@ -16,18 +201,67 @@ def load_csv(file_path: str, delimiter: str = ',', header: bool = True) -> Dict[
         file_path: Path to the CSV file.
         delimiter: The delimiter character (default: ',').
         header: Whether the CSV file has a header row (default: True).
+        use_cache: Serve repeated loads of an unchanged file from the
+                   process-wide dataset cache (default: True).
+        dtype: Explicit column dtypes (e.g. {'value': 'float32'}); skips type inference.
+        usecols: Only parse these columns.
+        engine: pandas parser engine ('c', 'python' or 'pyarrow').
 
     Returns:
         A dictionary containing the data and a DataDescriptor.  The data
-        will be a Pandas DataFrame.
+        will be a Pandas DataFrame (a copy-on-write view when cached).
+        For files that do not fit in memory, use `iter_csv_chunks`.
     """
     try:
-        if header:
-            df = pd.read_csv(file_path, delimiter=delimiter)
-        else:
-            df = pd.read_csv(file_path, delimiter=delimiter, header=None)
-            # If no header, assign default column names
-            df.columns = [f"col_{i}" for i in range(df.shape[1])]
+        return _cached_load("csv", file_path, lambda: _load_csv(file_path, delimiter, header, dtype, usecols, engine),
+                            use_cache, delimiter=delimiter, header=header,
+                            **_csv_cache_options(dtype=dtype, usecols=usecols, engine=engine))
+    except FileNotFoundError:
+        raise FileNotFoundError(f"CSV file not found: {file_path}")
+
+
+def _csv_cache_options(**options) -> Dict[str, Any]:
+    # Only non-default options enter the cache key, so keys of plain loads stay unchanged
+    return {name: value for name, value in options.items() if value is not None}
+
+
+def _read_csv_kwargs(delimiter: str, header: bool, dtype: Optional[Dict[str, Any]],
+                     usecols: Optional[List[Union[str, int]]], engine: Optional[str]) -> Dict[str, Any]:
+    kwargs: Dict[str, Any] = {"delimiter": delimiter}
+    if not header:
+        kwargs["header"] = None
+        if dtype is not None:
+            # Columns of headerless files are addressed as 'col_<i>'
+            dtype = {_column_position(col): value for col, value in dtype.items()}
+        if usecols is not None:
+            usecols = [_column_position(col) for col in usecols]
+    if dtype is not None:
+        kwargs["dtype"] = dtype
+    if usecols is not None:
+        kwargs["usecols"] = usecols
+    if engine is not None:
+        kwargs["engine"] = engine
+    return kwargs
+
+
+def _column_position(column: Union[str, int]) -> int:
+    if isinstance(column, str) and column.startswith("col_"):
+        return int(column[4:])
+    return int(column)
+
+
+def _name_headerless_columns(df: pd.DataFrame) -> pd.DataFrame:
+    # If no header, assign default column names (by position in the file)
+    df.columns = [f"col_{i}" for i in df.columns]
+    return df
+
+
+def _load_csv(file_path: str, delimiter: str, header: bool, dtype: Optional[Dict[str, Any]] = None,
+              usecols: Optional[List[Union[str, int]]] = None, engine: Optional[str] = None) -> Dict[str, Any]:
+    try:
+        df = pd.read_csv(file_path, **_read_csv_kwargs(delimiter, header, dtype, usecols, engine))
+        if not header:
+            df = _name_headerless_columns(df)
 
 
         descriptor = DataDescriptor(
@@ -44,10 +278,94 @@ def load_csv(file_path: str, delimiter: str = ',', header: bool = True) -> Dict[
     except Exception as e:
         raise RuntimeError(f"Error loading CSV file: {e}") from e
 
-def load_json(file_path: str) ->  Dict[str, Any]:
+
+def iter_csv_chunks(file_path: str, chunksize: int = 100_000, delimiter: str = ',', header: bool = True,
+                    dtype: Optional[Dict[str, Any]] = None, usecols: Optional[List[Union[str, int]]] = None,
+                    engine: str = 'c') -> Iterator[pd.DataFrame]:
+    """
+    Streams a CSV file as a sequence of typed DataFrame chunks.
+
+    Only one chunk is held in memory at a time, so files larger than RAM can
+    be processed in a single pass.  Chunks are never cached.
+
+    Args:
+        file_path: Path to the CSV file.
+        chunksize: Number of rows per chunk.  With the 'pyarrow' engine the
+                   chunks follow pyarrow's read blocks instead (about this many rows).
+        delimiter: The delimiter character (default: ',').
+        header: Whether the CSV file has a header row (default: True).
+        dtype: Explicit column dtypes; skips type inference and keeps every
+               chunk's dtypes identical.
+        usecols: Only parse these columns.
+        engine: 'c' (pandas' C parser) or 'pyarrow' (requires pyarrow).
+
+    Yields:
+        pandas DataFrames with at most `chunksize` rows.
+    """
+    if chunksize <= 0:
+        raise ValueError("chunksize must be a positive integer.")
+    if not os.path.exists(file_path):
+        raise FileNotFoundError(f"CSV file not found: {file_path}")
+    if engine == "pyarrow":
+        yield from _iter_csv_chunks_pyarrow(file_path, chunksize, delimiter, header, dtype, usecols)
+        return
+    if engine != "c":
+        raise ValueError(f"Unsupported engine: {engine}. Must be 'c' or 'pyarrow'.")
+
+    kwargs = _read_csv_kwargs(delimiter, header, dtype, usecols, engine)
+    try:
+        with pd.read_csv(file_path, chunksize=chunksize, **kwargs) as reader:
+            for chunk in reader:
+                yield chunk if header else _name_headerless_columns(chunk)
+    except Exception as e:
+        raise RuntimeError(f"Error loading CSV file: {e}") from e
+
+
+def _iter_csv_chunks_pyarrow(file_path: str, chunksize: int, delimiter: str, header: bool,
+                             dtype: Optional[Dict[str, Any]],
+                             usecols: Optional[List[Union[str, int]]]) -> Iterator[pd.DataFrame]:
+    try:
+        import pyarrow as pa
+        from pyarrow import csv as pa_csv
+    except ImportError as e:
+        raise ImportError("The 'pyarrow' engine requires the pyarrow package (pip install pyarrow).") from e
+
+    read_options = pa_csv.ReadOptions(autogenerate_column_names=not header,
+                                      block_size=max(chunksize * 64, 1 << 20))  # ~64 bytes per row
+    convert_options = pa_csv.ConvertOptions()
+    if dtype is not None:
+        names = {col: (col if header else f"f{_column_position(col)}") for col in dtype}
+        convert_options.column_types = {names[col]: pa.from_numpy_dtype(np.dtype(value)) for col, value in dtype.items()}
+    if usecols is not None:
+        convert_options.include_columns = [col if header else f"f{_column_position(col)}" for col in usecols]
+    try:
+        reader = pa_csv.open_csv(file_path, read_options=read_options,
+                                 parse_options=pa_csv.ParseOptions(delimiter=delimiter),
+                                 convert_options=convert_options)
+        for batch in reader:
+            chunk = batch.to_pandas()
+            if not header:
+                chunk.columns = [f"col_{int(col[1:])}" for col in chunk.columns]  # pyarrow names them f0, f1, ...
+            yield chunk
+    except Exception as e:
+        raise RuntimeError(f"Error loading CSV file: {e}") from e
+
+
+def load_json(file_path: str, use_cache: bool = True) ->  Dict[str, Any]:
     """Loads data from a JSON file.
     Returns dict containing loaded data, and `DataDescriptor` instance.
+    Repeated loads of an unchanged file are served (as deep copies) from the
+    process-wide dataset cache unless `use_cache` is False.
+    For large or newline-delimited files, see `load_json_records` and `iter_json_chunks`.
     """
+    try:
+        return _cached_load("json", file_path, lambda: _load_json(file_path), use_cache,
+                            nbytes=os.path.getsize(file_path))
+    except FileNotFoundError:
+        raise FileNotFoundError(f"JSON file not found: {file_path}")
+
+
+def _load_json(file_path: str) -> Dict[str, Any]:
     try:
         with open(file_path, 'r') as f:
             data = json.load(f)
@@ -67,23 +385,239 @@ def load_json(file_path: str) ->  Dict[str, Any]:
         raise RuntimeError(f"Error during loading JSON file: {e}") from e
 
 
-def load_numpy(file_path: str) -> Dict[str, Any]:
+NDJSON_EXTENSIONS = (".ndjson", ".jsonl")
+_JSON_READ_SIZE = 1 << 20  # Characters read at a time when streaming a JSON array
+
+
+def iter_json_records(file_path: str, format: Optional[str] = None) -> Iterator[Any]:
+    """
+    Streams the records of a newline-delimited JSON file or of a top-level JSON array.
+
+    Records are decoded one at a time, so memory is bounded by the largest
+    record rather than by the file.
+
+    Args:
+        file_path: Path to the file.
+        format: 'ndjson' (one JSON value per line) or 'array'.  If None it is
+                guessed from the extension (.ndjson/.jsonl) or the first character.
+    """
+    if not os.path.exists(file_path):
+        raise FileNotFoundError(f"JSON file not found: {file_path}")
+    if format is None:
+        format = _guess_json_format(file_path)
+    if format not in ("ndjson", "array"):
+        raise ValueError(f"Unsupported JSON format: {format}. Must be 'ndjson' or 'array'.")
+
+    with open(file_path, "r") as f:
+        if format == "ndjson":
+            for line_number, line in enumerate(f, start=1):
+                if line.strip():
+                    try:
+                        yield json.loads(line)
+                    except json.JSONDecodeError as e:
+                        raise ValueError(f"Invalid JSON on line {line_number} of {file_path}: {e}") from e
+            return
+        yield from _iter_json_array(f, file_path)
+
+
+def _guess_json_format(file_path: str) -> str:
+    if file_path.endswith(NDJSON_EXTENSIONS):
+        return "ndjson"
+    with open(file_path, "r") as f:
+        while True:
+            char = f.read(1)
+            if not char or not char.isspace():
+                break
+    return "array" if char == "[" else "ndjson"
+
+
+def _iter_json_array(f, file_path: str) -> Iterator[Any]:
+    """Decodes the elements of a top-level JSON array incrementally with raw_decode."""
+    decoder = json.JSONDecoder()
+    buffer, position, started = "", 0, False
+    eof = False
+    while True:
+        # Skip whitespace and separators, refilling the buffer as needed
+        while True:
+            while position < len(buffer) and (buffer[position].isspace() or (started and buffer[position] == ",")):
+                position += 1
+            if position < len(buffer) or eof:
+                break
+            buffer, position = f.read(_JSON_READ_SIZE), 0
+            eof = not buffer
+        if position >= len(buffer):
+            raise ValueError(f"Invalid JSON format in {file_path}: unterminated array")
+        if not started:
+            if buffer[position] != "[":
+                raise ValueError(f"Invalid JSON format in {file_path}: expected a top-level array")
+            started = True
+            position += 1
+            continue
+        if buffer[position] == "]":
+            return
+        while True:
+            try:
+                record, end = decoder.raw_decode(buffer, position)
+                # A number at the end of the buffer may continue in the next read
+                if end < len(buffer) or eof:
+                    break
+            except json.JSONDecodeError as e:
+                if eof:
+                    raise ValueError(f"Invalid JSON format in {file_path}: {e}") from e
+            more = f.read(_JSON_READ_SIZE)
+            eof = not more
+            buffer, position = buffer[position:] + more, 0
+        yield record
+        position = end
+
+
+def iter_json_chunks(file_path: str, chunksize: int = 10_000, format: Optional[str] = None,
+                     columns: Optional[List[str]] = None) -> Iterator[pd.DataFrame]:
+    """
+    Streams the records of a JSON/NDJSON file (see `iter_json_records`) as DataFrames.
+
+    Args:
+        chunksize: Number of records per DataFrame.
+        columns: Only keep these fields of each (object) record.
+    """
+    if chunksize <= 0:
+        raise ValueError("chunksize must be a positive integer.")
+    batch = []
+    for record in iter_json_records(file_path, format):
+        batch.append(record)
+        if len(batch) == chunksize:
+            yield _records_frame(batch, columns)
+            batch = []
+    if batch:
+        yield _records_frame(batch, columns)
+
+
+def _records_frame(records: List[Any], columns: Optional[List[str]]) -> pd.DataFrame:
+    df = pd.DataFrame.from_records(records, columns=columns) if isinstance(records[0], dict) else pd.DataFrame(records)
+    if columns is not None and not isinstance(records[0], dict):
+        df = df[columns]
+    return df
+
+
+def load_json_records(file_path: str, format: Optional[str] = None, columns: Optional[List[str]] = None,
+                      dtype: Any = np.float64) -> Dict[str, Any]:
+    """
+    Loads numeric JSON/NDJSON records straight into NumPy columns.
+
+    Records are streamed (see `iter_json_records`) into preallocated arrays
+    (sized from the line count for NDJSON, grown geometrically for arrays),
+    so no intermediate list of Python objects is built.
+
+    * Object records (``{"time": 0, "value": 1.5}``) become a DataFrame with one
+      column per field (all fields of the first record unless `columns` is given).
+    * Number records become a 1-D array, list records (``[0, 1.5]``) a 2-D array.
+
+    Returns:
+        A dictionary containing the data and a DataDescriptor whose shape is
+        the inferred (n_records, ...) shape.
+    """
+    records = iter_json_records(file_path, format)
+    if format is None:
+        format = _guess_json_format(file_path)
+    capacity = _count_lines(file_path) if format == "ndjson" else 1024
+    name = os.path.basename(file_path)
+
+    first = next(records, None)
+    if first is None:
+        return {"data": np.empty(0, dtype=dtype),
+                "descriptor": DataDescriptor(name, DataType.NDARRAY, shape=(0,), group="input_data",
+                                             dtype=np.dtype(dtype).str)}
+    if isinstance(first, dict):
+        fields = list(columns) if columns is not None else list(first)
+        convert = lambda record: [record[field] for field in fields]
+        row_shape = (len(fields),)
+    elif isinstance(first, list):
+        fields, convert, row_shape = None, (lambda record: record), (len(first),)
+    else:
+        fields, convert, row_shape = None, (lambda record: record), ()
+
+    array = np.empty((max(capacity, 1),) + row_shape, dtype=dtype)
+    count = 0
+    try:
+        for record in itertools.chain([first], records):
+            if count == len(array):
+                array = np.resize(array, (2 * len(array),) + row_shape)  # Amortized growth
+            array[count] = convert(record)
+            count += 1
+    except (KeyError, TypeError, ValueError) as e:
+        raise ValueError(f"Record {count} of {file_path} is not numeric with the layout of the first record "
+                         f"({e}); use iter_json_chunks for mixed records.") from e
+    array = array[:count]
+
+    if fields is not None:
+        data = pd.DataFrame({field: array[:, i] for i, field in enumerate(fields)}, copy=False)
+        descriptor = DataDescriptor(name, DataType.DATAFRAME, shape=data.shape, group="input_data")
+    else:
+        data = array
+        descriptor = DataDescriptor(name, DataType.NDARRAY, shape=array.shape, group="input_data",
+                                    dtype=array.dtype.str)
+    return {"data": data, "descriptor": descriptor}
+
+
+def _count_lines(file_path: str) -> int:
+    count = 0
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(_JSON_READ_SIZE), b""):
+            count += block.count(b"\n")
+    return count + 1  # The last line may lack a newline
+
+
+def load_numpy(file_path: str, use_cache: bool = True, mmap_mode: Optional[str] = None,
+               lazy: bool = False) -> Union[Dict[str, Any], "NpzArchive"]:
     """
     Loads data from a NumPy .npy or .npz file.
+    Repeated loads of an unchanged file are served from the process-wide
+    dataset cache (as read-only views) unless `use_cache` is False.
+
+    Args:
+        file_path: Path to the .npy or .npz file.
+        use_cache: Use the dataset cache for eager loads (memory-mapped and
+                   lazy loads bypass it; the OS page cache serves them).
+        mmap_mode: Memory-map the data instead of reading it ('r', 'r+' or 'c',
+                   see `np.load`).  For .npz archives this applies to members
+                   stored without compression (`np.savez`); compressed members
+                   are read on access.
+        lazy: For .npz archives, return an `NpzArchive` that reads each array
+              only when it is accessed.  Implied by `mmap_mode` for archives.
+
     Returns:
-        A dictionary containing loaded data and DataDescriptor.
+        A dictionary containing loaded data and DataDescriptor (for .npz, one
+        such dictionary per array, or an `NpzArchive` with the same interface).
+        Descriptors carry the shape and dtype from the file header.
     """
+    if mmap_mode is not None or lazy:
+        if not os.path.exists(file_path):
+            raise FileNotFoundError(f"NumPy file not found: {file_path}")
+        try:
+            if zipfile.is_zipfile(file_path):
+                return NpzArchive(file_path, mmap_mode=mmap_mode)
+            data = np.load(file_path, mmap_mode=mmap_mode)
+            return {"data": data, "descriptor": _array_descriptor(os.path.basename(file_path), data.shape, data.dtype)}
+        except Exception as e:
+            raise RuntimeError(f"Error loading NumPy file: {e}") from e
+    try:
+        return _cached_load("numpy", file_path, lambda: _load_numpy(file_path), use_cache)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"NumPy file not found: {file_path}")
+
+
+def _load_numpy(file_path: str) -> Dict[str, Any]:
     try:
         data = np.load(file_path)
         if isinstance(data, np.ndarray):
-            descriptor =  DataDescriptor(name=os.path.basename(file_path), data_type=DataType.NDARRAY, shape = data.shape, group='input_data')
+            descriptor = _array_descriptor(os.path.basename(file_path), data.shape, data.dtype)
             return {"data": data, "descriptor": descriptor}
         elif isinstance(data, np.lib.npyio.NpzFile):
             # Handle .npz files (archives containing multiple arrays)
             result_data = {}
             for key in data.files: # Iterate through arrays with names in archive
                 arr = data[key]
-                descriptor = DataDescriptor(name=key, data_type=DataType.NDARRAY, shape=arr.shape, group='input_data')
+                descriptor = _array_descriptor(key, arr.shape, arr.dtype)
                 result_data[key] =  {"data": arr, "descriptor": descriptor}
             return result_data # return dict of data
         else:
@@ -95,6 +629,302 @@ def load_numpy(file_path: str) -> Dict[str, Any]:
         raise RuntimeError(f"Error loading NumPy file: {e}") from e
 
 
+def _array_descriptor(name: str, shape: Tuple[int, ...], dtype: np.dtype) -> DataDescriptor:
+    return DataDescriptor(name=name, data_type=DataType.NDARRAY, shape=tuple(shape), group='input_data',
+                          dtype=np.dtype(dtype).str)
+
+
+def _read_npy_header(fp) -> Tuple[Tuple[int, ...], bool, np.dtype]:
+    """Reads the header of a .npy stream (positioned at its start): (shape, fortran_order, dtype)."""
+    version = np.lib.format.read_magic(fp)
+    if version == (1, 0):
+        return np.lib.format.read_array_header_1_0(fp)
+    if version == (2, 0):
+        return np.lib.format.read_array_header_2_0(fp)
+    return np.lib.format._read_array_header(fp, version)  # Format 3.0 has no public reader
+
+
+class NpzArchive(Mapping):
+    """
+    Lazy view of a .npz archive.
+
+    Opening reads only the zip directory and the small header of every
+    member, so `descriptors` (name, shape, dtype) are available immediately.
+    `archive[key]` returns ``{'data': ..., 'descriptor': ...}`` like the eager
+    loader, reading (or memory-mapping) that one array on first access.
+    """
+
+    def __init__(self, file_path: str, mmap_mode: Optional[str] = None):
+        self.file_path = file_path
+        self.mmap_mode = mmap_mode
+        self.descriptors: Dict[str, DataDescriptor] = {}
+        self._members: Dict[str, str] = {}  # key -> member name in the zip file
+        self._loaded: Dict[str, Dict[str, Any]] = {}
+        with zipfile.ZipFile(file_path) as archive:
+            for member in archive.namelist():
+                if not member.endswith(".npy"):
+                    continue
+                key = member[:-len(".npy")]
+                with archive.open(member) as fp:
+                    shape, _, dtype = _read_npy_header(fp)
+                self._members[key] = member
+                self.descriptors[key] = _array_descriptor(key, shape, dtype)
+
+    def __getitem__(self, key: str) -> Dict[str, Any]:
+        if key not in self._loaded:
+            if key not in self._members:
+                raise KeyError(key)
+            self._loaded[key] = {"data": self._read(self._members[key]), "descriptor": self.descriptors[key]}
+        return self._loaded[key]
+
+    def __iter__(self):
+        return iter(self._members)
+
+    def __len__(self) -> int:
+        return len(self._members)
+
+    def is_loaded(self, key: str) -> bool:
+        return key in self._loaded
+
+    def _read(self, member: str) -> np.ndarray:
+        with zipfile.ZipFile(self.file_path) as archive:
+            info = archive.getinfo(member)
+            with archive.open(member) as fp:
+                shape, fortran_order, dtype = _read_npy_header(fp)
+                if self.mmap_mode is None or info.compress_type != zipfile.ZIP_STORED or dtype.hasobject:
+                    fp.seek(0)
+                    return np.lib.format.read_array(fp)
+                header_length = fp.tell()
+            # Stored members are contiguous in the file: map them in place.
+            with open(self.file_path, "rb") as raw:
+                raw.seek(info.header_offset)
+                local_header = raw.read(30)
+            name_length, extra_length = struct.unpack("<HH", local_header[26:30])
+            offset = info.header_offset + 30 + name_length + extra_length + header_length
+        return np.memmap(self.file_path, dtype=dtype, mode=self.mmap_mode, shape=shape, offset=offset,
+                         order="F" if fortran_order else "C")
+
+
+class SharedDataset:
+    """
+    Picklable handle to an input dataset published in shared memory.
+
+    Created by `publish_shared_dataset` in the parent process and passed to
+    worker processes, which turn it back into zero-copy NumPy/pandas views
+    with `attach_shared_dataset`.  Only the publishing process owns (and
+    unlinks) the underlying segment or file, so a crashing worker never
+    leaves it behind or removes it from under the others.
+    """
+
+    def __init__(self, name: str, backend: str, kind: str, size: int,
+                 columns: List[Tuple[str, str, Tuple[int, ...], int]],
+                 pickled_columns: Optional[Tuple[int, int]] = None,
+                 column_order: Optional[List[str]] = None,
+                 descriptor: Optional[Dict[str, Any]] = None,
+                 cache_key: Optional[Tuple] = None):
+        self.name = name  # Shared memory segment name, or memmap file path
+        self.backend = backend  # 'shm' or 'memmap'
+        self.kind = kind  # 'ndarray' or 'dataframe'
+        self.size = size
+        self.columns = columns  # (column name, dtype, shape, byte offset) of every numeric block
+        self.pickled_columns = pickled_columns  # (offset, length) of the pickled non-numeric columns
+        self.column_order = column_order
+        self.descriptor = descriptor
+        self.cache_key = cache_key  # Dataset cache key of the source file, if published from a path
+
+
+_owned_shared_datasets: Dict[str, Tuple[Any, int]] = {}  # Published segments/files by name: (segment, owner pid)
+_attached_shared_datasets: Dict[str, Any] = {}  # Keeps attached segments open while views exist
+_SHARED_ALIGNMENT = 64
+
+
+def publish_shared_dataset(data: Union[str, Dict[str, Any], np.ndarray, pd.DataFrame],
+                           backend: str = "shm") -> SharedDataset:
+    """
+    Copies an input dataset once into shared memory for use by worker processes.
+
+    Args:
+        data: A file path (loaded with `load_csv` or `load_numpy` by extension),
+              a loader result (`{'data': ..., 'descriptor': ...}`), an array or a DataFrame.
+        backend: 'shm' for `multiprocessing.shared_memory`, 'memmap' for a
+                 memory-mapped temporary file.
+
+    Returns:
+        A picklable `SharedDataset` handle.  Call `release_shared_dataset` (or let
+        the process exit) to free it.
+    """
+    if backend not in ("shm", "memmap"):
+        raise ValueError(f"Unsupported backend: {backend}. Must be 'shm' or 'memmap'.")
+
+    cache_key = None
+    if isinstance(data, str):
+        if data.endswith(".csv"):
+            cache_key = _cache_key("csv", data, delimiter=",", header=True)
+            data = load_csv(data)
+        elif data.endswith(".npy"):
+            cache_key = _cache_key("numpy", data)
+            data = load_numpy(data)
+        else:
+            raise ValueError(f"Cannot publish '{data}': only .csv and .npy files can be shared.")
+    if isinstance(data, dict):
+        descriptor = data["descriptor"].to_dict() if "descriptor" in data else None
+        data = data["data"]
+    else:
+        descriptor = None
+
+    if isinstance(data, np.ndarray):
+        kind, blocks, others = "ndarray", [("", np.ascontiguousarray(data))], None
+        column_order = None
+    elif isinstance(data, pd.DataFrame):
+        kind = "dataframe"
+        column_order = [str(c) for c in data.columns]
+        blocks, others = [], {}
+        for col in data.columns:
+            values = data[col].to_numpy()
+            if values.dtype.hasobject or values.dtype.kind not in "biufcmM":
+                others[str(col)] = data[col]
+            else:
+                blocks.append((str(col), np.ascontiguousarray(values)))
+    else:
+        raise TypeError(f"Unsupported data type for shared publishing: {type(data)}")
+
+    columns, offset = [], 0
+    for col, values in blocks:
+        columns.append((col, values.dtype.str, values.shape, offset))
+        offset += -(-values.nbytes // _SHARED_ALIGNMENT) * _SHARED_ALIGNMENT
+    pickled = None
+    if others:
+        import pickle
+        payload = pickle.dumps(others, protocol=pickle.HIGHEST_PROTOCOL)
+        pickled = (offset, len(payload))
+        offset += len(payload)
+    size = max(offset, 1)
+
+    if backend == "shm":
+        from multiprocessing import shared_memory
+        segment = shared_memory.SharedMemory(create=True, size=size)
+        name, buffer = segment.name, segment.buf
+    else:
+        import tempfile
+        fd, name = tempfile.mkstemp(prefix="sds_shared_", suffix=".bin")
+        os.close(fd)
+        segment = np.memmap(name, dtype=np.uint8, mode="w+", shape=(size,))
+        buffer = segment
+
+    for (col, values), (_, dtype, shape, start) in zip(blocks, columns):
+        np.ndarray(shape, dtype=dtype, buffer=buffer, offset=start)[...] = values
+    if pickled is not None:
+        buffer[pickled[0]:pickled[0] + pickled[1]] = np.frombuffer(payload, dtype=np.uint8)
+    if backend == "memmap":
+        segment.flush()
+
+    _owned_shared_datasets[name] = (segment, os.getpid())
+    return SharedDataset(name, backend, kind, size, columns, pickled, column_order, descriptor, cache_key)
+
+
+def attach_shared_dataset(handle: SharedDataset) -> Dict[str, Any]:
+    """
+    Attaches to a published dataset without copying it.
+
+    Returns:
+        A dictionary with the data (read-only array views, or a DataFrame built
+        from them) and its DataDescriptor.
+    """
+    owned = _owned_shared_datasets.get(handle.name)
+    if owned is not None and owned[1] == os.getpid():
+        buffer = owned[0].buf if handle.backend == "shm" else owned[0]
+    elif handle.name in _attached_shared_datasets:
+        segment = _attached_shared_datasets[handle.name]
+        buffer = segment.buf if handle.backend == "shm" else segment
+    elif handle.backend == "shm":
+        segment = _attach_segment(handle.name)
+        _attached_shared_datasets[handle.name] = segment
+        buffer = segment.buf
+    else:
+        buffer = np.memmap(handle.name, dtype=np.uint8, mode="r", shape=(handle.size,))
+        _attached_shared_datasets[handle.name] = buffer
+
+    views = {}
+    for col, dtype, shape, start in handle.columns:
+        view = np.ndarray(tuple(shape), dtype=np.dtype(dtype), buffer=buffer, offset=start)
+        view.flags.writeable = False
+        views[col] = view
+
+    if handle.kind == "ndarray":
+        data = views[""]
+    else:
+        if handle.pickled_columns is not None:
+            import pickle
+            start, length = handle.pickled_columns
+            views.update(pickle.loads(bytes(buffer[start:start + length])))
+        data = pd.DataFrame({col: views[col] for col in handle.column_order}, copy=False)
+
+    if handle.descriptor is not None:
+        descriptor = DataDescriptor(**handle.descriptor)
+    else:
+        descriptor = create_descriptor_from_data(data, "shared_data", group="input_data")
+    return {"data": data, "descriptor": descriptor}
+
+
+def _attach_segment(name: str):
+    """Opens an existing shared memory segment without taking ownership of it."""
+    from multiprocessing import shared_memory
+    import sys
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    # Before 3.13 attaching registers the segment with the resource tracker as
+    # if this process owned it, so a tracker not shared with the publisher
+    # would unlink it when the worker exits.  Skip that registration.
+    from multiprocessing import resource_tracker
+    register = resource_tracker.register
+    resource_tracker.register = lambda res_name, rtype: None if rtype == "shared_memory" else register(res_name, rtype)
+    try:
+        return shared_memory.SharedMemory(name=name)
+    finally:
+        resource_tracker.register = register
+
+
+def release_shared_dataset(handle: SharedDataset) -> None:
+    """Frees a dataset published by this process (views attached to it become invalid)."""
+    owned = _owned_shared_datasets.get(handle.name)
+    if owned is None or owned[1] != os.getpid():
+        return  # Not ours (e.g. inherited by a forked worker)
+    segment = _owned_shared_datasets.pop(handle.name)[0]
+    if handle.backend == "shm":
+        try:
+            segment.close()
+        except BufferError:
+            pass  # Views still exist; the memory is freed once they are gone
+        segment.unlink()
+    else:
+        del segment
+        try:
+            os.remove(handle.name)
+        except OSError:
+            pass
+
+
+def install_shared_datasets(handles: List[SharedDataset]) -> None:
+    """
+    Makes published datasets available to the loaders of this (worker) process.
+
+    Every handle published from a file path is attached and placed in the
+    dataset cache under that file's key, so `load_csv` / `load_numpy` of the
+    same path return zero-copy views instead of reading the file.
+    """
+    for handle in handles:
+        if handle.cache_key is not None:
+            value = attach_shared_dataset(handle)
+            _dataset_cache.put(handle.cache_key, value, 0)  # Lives in shared memory, not in this process
+
+
+@atexit.register
+def _release_owned_shared_datasets() -> None:
+    for name, (segment, _) in list(_owned_shared_datasets.items()):
+        backend = "memmap" if isinstance(segment, np.memmap) else "shm"
+        release_shared_dataset(SharedDataset(name, backend, "", 0, []))
+
+
 def create_descriptor_from_data(data: Any, name:str, group: str = 'data', plot_type: Optional[str] = None, x_axis: Optional[str] = None) -> DataDescriptor:
     """
     Creates a DataDescriptor for data.
@@ -122,34 +952,154 @@ def create_descriptor_from_data(data: Any, name:str, group: str = 'data', plot_t
     else:
         raise TypeError(f"Unsupported data type for descriptor creation: {type(data)}")
 
+RESULTS_FORMATS = {
+    # results_format: (file extension, CSV compression)
+    "csv": (".csv", None),
+    "csv.gz": (".csv.gz", "gzip"),
+    "csv.zst": (".csv.zst", "zstd"),
+    "parquet": (".parquet", None),
+    "feather": (".feather", None),
+}
+
+
+def results_to_frame(data: Dict[str, Any]) -> pd.DataFrame:
+    """
+    Converts a results dictionary to a DataFrame in a single columnar construction.
+
+    * 1-D arrays and lists become one column each; shorter ones are padded
+      with NaN to the longest output.
+    * 2-D arrays become one column per trailing index (``name.0``, ``name.1``, ...).
+    * DataFrame outputs contribute their columns as ``name.column``, and dict
+      outputs their entries as ``name.key``.
+    * Scalars are repeated on every row.
+    """
+    columns: Dict[str, Any] = {}
+    for data_name, data_info in data.items():
+        if isinstance(data_info, dict) and 'data' in data_info: # Check if the structure is right
+            _add_columns(columns, str(data_name), data_info['data'])
+
+    n_rows = max((len(values) for values in columns.values() if not np.isscalar(values)), default=1)
+    frame_columns = {}
+    for name, values in columns.items():
+        if np.isscalar(values):
+            frame_columns[name] = np.full(n_rows, values, dtype=object if isinstance(values, str) else None)
+        elif len(values) < n_rows:
+            padded = np.full(n_rows, np.nan, dtype=np.result_type(values.dtype, np.float64)
+                             if values.dtype.kind in "biufc" else object)
+            padded[:len(values)] = values
+            frame_columns[name] = padded
+        else:
+            frame_columns[name] = values
+    return pd.DataFrame(frame_columns, copy=False)
+
+
+def _add_columns(columns: Dict[str, Any], name: str, value: Any) -> None:
+    if isinstance(value, pd.DataFrame):
+        for col in value.columns:
+            columns[f"{name}.{col}"] = value[col].to_numpy()
+    elif isinstance(value, pd.Series):
+        columns[name] = value.to_numpy()
+    elif isinstance(value, dict):
+        for key, item in value.items():
+            _add_columns(columns, f"{name}.{key}", item)
+    elif isinstance(value, (np.ndarray, list, tuple)):
+        array = np.asarray(value)
+        if array.ndim == 0:
+            columns[name] = array.item()
+        elif array.ndim == 1:
+            columns[name] = array
+        else:
+            array = array.reshape(len(array), -1)
+            for i in range(array.shape[1]):
+                columns[f"{name}.{i}"] = array[:, i]
+    elif isinstance(value, (int, float, str, bool, np.generic)):
+        columns[name] = value
+
+
 def save_csv(data: Union[pd.DataFrame, Dict[str, Any]], file_path: str,
-             delimiter: str = ',', index: bool = False) -> None:
+             delimiter: str = ',', index: bool = False, compression: Optional[str] = None,
+             chunksize: Optional[int] = None) -> None:
     """
     Saves data to a CSV file.  Handles both DataFrames and results dictionaries.
 
     Args:
-        data: The data to save (either a Pandas DataFrame or a dictionary of results).
+        data: The data to save (either a Pandas DataFrame or a dictionary of results,
+              converted with `results_to_frame`).
         file_path: The path to the CSV file to be created.
         delimiter:  Delimiter to use.
         index: Add index to output or not.
+        compression: 'gzip' or 'zstd' (requires the zstandard package), or None
+                     to infer it from the file extension (.gz, .zst).
+        chunksize: Rows formatted and written at a time.
     """
     try:
-        if isinstance(data, pd.DataFrame):
-            df = data
-        elif isinstance(data, dict):
-            # Convert results dictionary to DataFrame
-            df = pd.DataFrame()
-            for data_name, data_info in data.items():
-                if isinstance(data_info, dict) and 'data' in data_info: # Check if the structure is right
-                    if isinstance(data_info['data'], (np.ndarray, list)):
-                         df[data_name] = pd.Series(data_info['data']) # use pandas series
-                    elif isinstance(data_info['data'], (int, float, str)):
-                        df[data_name] = [data_info['data']] # scalar values to list
+        df = _as_frame(data, "CSV")
+        df.to_csv(file_path, sep=delimiter, index=index, compression=compression or "infer",
+                  chunksize=chunksize)
+    except Exception as e:
+        raise RuntimeError(f"Error saving data to CSV: {e}") from e
 
-        else:
-            raise TypeError(f"Unsupported data type for CSV export: {type(data)}")
-        df.to_csv(file_path, sep=delimiter, index=index)
 
+def save_results(data: Union[pd.DataFrame, Dict[str, Any]], file_path: str,
+                 results_format: Optional[str] = None, index: bool = False,
+                 chunksize: Optional[int] = None) -> str:
+    """
+    Saves tabular data or a results dictionary in one of `RESULTS_FORMATS`.
+
+    Args:
+        data: A DataFrame or a results dictionary (see `results_to_frame`).
+        file_path: Output path.  If it has no extension, the one of the format is appended.
+        results_format: 'csv', 'csv.gz', 'csv.zst', 'parquet' or 'feather'
+                        (inferred from `file_path` if None).
+        index: Write the DataFrame index.
+        chunksize: Rows written at a time (CSV chunks, Parquet row groups,
+                   Feather record batches).
+
+    Returns:
+        The path of the written file.
+    """
+    if results_format is None:
+        results_format = _infer_results_format(file_path)
+    if results_format not in RESULTS_FORMATS:
+        raise ValueError(f"Unsupported results_format: {results_format}. "
+                         f"Must be one of {list(RESULTS_FORMATS)}.")
+    extension, compression = RESULTS_FORMATS[results_format]
+    if not os.path.splitext(file_path)[1]:
+        file_path += extension
+
+    if results_format.startswith("csv"):
+        save_csv(data, file_path, index=index, compression=compression, chunksize=chunksize)
+        return file_path
 
+    try:
+        import pyarrow as pa
+    except ImportError as e:
+        raise ImportError(f"Writing {results_format} files requires the pyarrow package (pip install pyarrow).") from e
+    try:
+        table = pa.Table.from_pandas(_as_frame(data, results_format), preserve_index=index)
+        if results_format == "parquet":
+            import pyarrow.parquet as pq
+            with pq.ParquetWriter(file_path, table.schema) as writer:
+                writer.write_table(table, row_group_size=chunksize)
+        else:
+            import pyarrow.feather as feather
+            feather.write_feather(table, file_path, chunksize=chunksize)
     except Exception as e:
-        raise RuntimeError(f"Error saving data to CSV: {e}") from e
\ No newline at end of file
+        raise RuntimeError(f"Error saving data to {results_format}: {e}") from e
+    return file_path
+
+
+def _infer_results_format(file_path: str) -> str:
+    for results_format, (extension, _) in sorted(RESULTS_FORMATS.items(), key=lambda item: -len(item[1][0])):
+        if file_path.endswith(extension):
+            return results_format
+    return "csv"
+
+
+def _as_frame(data: Union[pd.DataFrame, Dict[str, Any]], target: str) -> pd.DataFrame:
+    if isinstance(data, pd.DataFrame):
+        return data
+    if isinstance(data, dict):
+        # Convert results dictionary to DataFrame
+        return results_to_frame(data)
+    raise TypeError(f"Unsupported data type for {target} export: {type(data)}")
@@ -1,16 +1,23 @@
 # simulator/doe.py
 
+import copy
 import itertools
 import pandas as pd
-from typing import Dict, Any, List, Union, Tuple
+from typing import Dict, Any, List, Union, Tuple, Optional, Callable
 import numpy as np
 from .utils import DataDescriptor, DataType  # Import DataDescriptor and DataType
 from .data_handler import create_descriptor_from_data # Corrected import
 from .base import ExperimentLogic
 from .persistence import save_experiment_record  # For saving results
 from .experiment_record import ExperimentRecord # For creating records
+from .sweep_result import SweepResult
+from .data_handler import (get_dataset_cache_stats, SharedDataset, publish_shared_dataset,
+                           release_shared_dataset, install_shared_datasets)
+from .result_channel import export_results, import_results, RESULT_TRANSPORTS
+from .recorder import records_every_step
 import os
 import logging
+from concurrent.futures import ProcessPoolExecutor
 
 logger = logging.getLogger(__name__)
 
@@ -34,19 +41,348 @@ def generate_parameter_combinations(param_ranges: Dict[str, List[Any]]) -> List[
     return [dict(zip(keys, values)) for values in value_combinations]
 
 
+def _run_combination(experiment_logic_class: type[ExperimentLogic], config: Dict[str, Any],
+                     output_dir: Optional[str],
+                     init_cache: Optional[Dict[Any, Dict[str, Any]]] = None) -> Tuple[Dict[str, Dict[str, Any]], Optional[str]]:
+    """
+    Runs a single sweep configuration and saves its ExperimentRecord.
+
+    If `init_cache` is given (a dict owned by the sweep), initial states are
+    shared between runs as described in `_initialize`.
+
+    Returns:
+        The results dictionary and the record ID (None if `output_dir` is None,
+        in which case nothing is written to disk).
+    """
+    cache_stats = get_dataset_cache_stats()
+    # Create an *instance* of the ExperimentLogic class
+    experiment_logic_instance = experiment_logic_class(config)
+
+    # Initialize and run the experiment with the updated config
+    state = _initialize(experiment_logic_instance, config, init_cache)
+    state = _advance(experiment_logic_instance, state, 0, config.get("n_steps", 1))
+    results = experiment_logic_instance.get_results()
+    performance = {"dataset_cache": get_dataset_cache_stats(since=cache_stats)}
+    return results, _save_run_record(experiment_logic_class, config, results, output_dir, performance=performance)
+
+
+def _initialize(experiment_logic_instance: ExperimentLogic, config: Dict[str, Any],
+                init_cache: Optional[Dict[Any, Dict[str, Any]]]) -> Dict[str, Any]:
+    """
+    Initializes a run, reusing the initial state of an earlier run when possible.
+
+    For experiments that declare `init_keys`, the state returned by
+    `initialize` is memoized in `init_cache` under the values of those keys,
+    and every run, including the first, adopts a shared copy of it (see
+    `_share_state`) via `warm_start`.
+    """
+    init_keys = type(experiment_logic_instance).init_keys
+    if init_cache is None or init_keys is None:
+        return experiment_logic_instance.initialize(config)
+
+    key = tuple(repr(config.get(k)) for k in init_keys)
+    if key not in init_cache:
+        init_cache[key] = experiment_logic_instance.initialize(config)
+    return experiment_logic_instance.warm_start(config, _share_state(init_cache[key]))
+
+
+def _share_state(value: Any) -> Any:
+    """Copy of a memoized state that shares its data: read-only array views, shallow DataFrame copies."""
+    if isinstance(value, np.ndarray):
+        view = value.view()
+        view.flags.writeable = False
+        return view
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return value.copy(deep=False)  # Copy-on-write under pandas >= 3 (or with CoW enabled)
+    if isinstance(value, dict):
+        return {k: _share_state(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return type(value)(_share_state(v) for v in value)
+    return copy.copy(value)
+
+
+def _advance(experiment_logic_instance: ExperimentLogic, state: Dict[str, Any], start: int, stop: int) -> Dict[str, Any]:
+    """Runs steps `start` .. `stop - 1` and returns the new state."""
+    if hasattr(experiment_logic_instance, "advance"):
+        return experiment_logic_instance.advance(state, start, stop)
+    if hasattr(experiment_logic_instance, "run_step"):
+        for step in range(start, stop):
+            state = experiment_logic_instance.run_step(state, step)
+    return state
+
+
+def _save_run_record(experiment_logic_class: type[ExperimentLogic], config: Dict[str, Any],
+                     results: Dict[str, Dict[str, Any]], output_dir: Optional[str],
+                     provenance: Optional[Dict[str, Any]] = None,
+                     performance: Optional[Dict[str, Any]] = None) -> Optional[str]:
+    """Saves the ExperimentRecord of a sweep run; returns its ID (None if `output_dir` is None)."""
+    if output_dir is None:
+        return None
+
+    # Create an ExperimentRecord and save the results to disk
+    record = ExperimentRecord(config, experiment_logic_class)
+    for data_name, data_info in results.items():
+        record.add_output_data(data_name, data_info["data"], data_info["descriptor"])
+    for name, info in (performance or {}).items():
+        record.add_performance_info(name, info)
+    if provenance:
+        record.set_provenance(provenance)
+        record.add_log_message(f"Results derived by {provenance['method']} from run "
+                               f"{provenance.get('derived_from')} (n_steps={provenance.get('source_n_steps')}).")
+
+    record_id = record.experiment_id # Get ID
+    save_experiment_record(record, output_dir)
+    logger.info(f"Parameter sweep run completed. Experiment ID: {record_id}")
+    return record_id
+
+
+def _prefix_sources(combinations: List[Dict[str, Any]]) -> List[int]:
+    """
+    For every combination, the index of the combination whose run serves it.
+
+    Combinations that differ only in `n_steps` are grouped and all served by
+    the one with the longest horizon; every other combination serves itself.
+    """
+    sources = list(range(len(combinations)))
+    groups: Dict[Any, List[int]] = {}
+    for i, combination in enumerate(combinations):
+        if "n_steps" not in combination:
+            return sources
+        key = repr(sorted((k, v) for k, v in combination.items() if k != "n_steps"))
+        groups.setdefault(key, []).append(i)
+    for members in groups.values():
+        longest = max(members, key=lambda i: combinations[i]["n_steps"])
+        for i in members:
+            sources[i] = longest
+    return sources
+
+
+def _slice_results(results: Dict[str, Dict[str, Any]], source_n_steps: int,
+                   n_steps: int) -> Optional[Dict[str, Dict[str, Any]]]:
+    """
+    Cuts the outputs of a longer run down to a shorter horizon.
+
+    Returns None if any output is not indexed by step (an array or DataFrame
+    of length `source_n_steps` or `source_n_steps + 1`): such outputs cannot
+    be derived from the longer run.
+    """
+    sliced = {}
+    for data_name, data_info in results.items():
+        data, descriptor = data_info["data"], data_info["descriptor"]
+        if not (isinstance(data, (np.ndarray, list, pd.DataFrame)) and np.ndim(data) > 0):
+            return None
+        offset = len(data) - source_n_steps
+        if offset not in (0, 1):
+            return None
+        length = n_steps + offset
+        data = data.iloc[:length] if isinstance(data, pd.DataFrame) else data[:length]
+        descriptor = copy.copy(descriptor)
+        if descriptor.shape:
+            descriptor.shape = (length,) + tuple(descriptor.shape[1:])
+        sliced[data_name] = {"data": data, "descriptor": descriptor}
+    return sliced
+
+
+def _run_combinations(experiment_logic_class: type[ExperimentLogic], configs: List[Dict[str, Any]],
+                      output_dir: Optional[str], n_workers: Optional[int] = None,
+                      shared_inputs: Optional[List[Union[str, SharedDataset]]] = None,
+                      result_transport: str = 'shm',
+                      batch_size: Optional[int] = None) -> List[Tuple[Dict[str, Dict[str, Any]], Optional[str]]]:
+    """Runs several configurations, serially or in a process pool; returns (results, record_id) per config."""
+    init_cache: Dict[Any, Dict[str, Any]] = {}  # Initial states shared across combinations
+    if batch_size and n_workers and n_workers > 1 and experiment_logic_class.batch_keys is not None:
+        logger.info("batch_size is ignored with n_workers > 1: every combination is run on its own.")
+    if not n_workers or n_workers <= 1 or len(configs) <= 1:
+        if batch_size and batch_size > 1 and experiment_logic_class.batch_keys is not None:
+            return _run_batches(experiment_logic_class, configs, output_dir, batch_size, init_cache)
+        return [_run_combination(experiment_logic_class, config, output_dir, init_cache) for config in configs]
+
+    published = []
+    try:
+        handles = []
+        for item in shared_inputs or []:
+            if isinstance(item, SharedDataset):
+                handles.append(item)
+            else:
+                handles.append(publish_shared_dataset(item))
+                published.append(handles[-1])
+        with ProcessPoolExecutor(max_workers=n_workers, initializer=_init_sweep_worker,
+                                 initargs=(handles,)) as executor:
+            chunksize = max(1, len(configs) // (4 * n_workers))
+            runs = executor.map(_run_in_worker, itertools.repeat(experiment_logic_class), configs,
+                                itertools.repeat(output_dir), itertools.repeat(result_transport),
+                                chunksize=chunksize)
+            # Array outputs arrive as shared memory handles; map them without copying.
+            return [(import_results(results), record_id) for results, record_id in runs]
+    finally:
+        # The parent owns the segments, so they are freed even if a worker crashed.
+        for handle in published:
+            release_shared_dataset(handle)
+
+
+def _run_batches(experiment_logic_class: type[ExperimentLogic], configs: List[Dict[str, Any]],
+                 output_dir: Optional[str], batch_size: int,
+                 init_cache: Dict[Any, Dict[str, Any]]) -> List[Tuple[Dict[str, Dict[str, Any]], Optional[str]]]:
+    """
+    Runs configurations through `run_batch`, in blocks of up to `batch_size`.
+
+    Configurations are grouped by their values of every key that is not one of
+    the experiment's `batch_keys`; groups of one are run on their own.
+    """
+    batch_keys = set(experiment_logic_class.batch_keys)
+    groups: Dict[str, List[int]] = {}
+    for i, config in enumerate(configs):
+        key = repr(sorted((k, v) for k, v in config.items() if k not in batch_keys))
+        groups.setdefault(key, []).append(i)
+
+    runs: List[Optional[Tuple[Dict[str, Dict[str, Any]], Optional[str]]]] = [None] * len(configs)
+    for members in groups.values():
+        for start in range(0, len(members), batch_size):
+            block = members[start:start + batch_size]
+            if len(block) == 1:
+                runs[block[0]] = _run_combination(experiment_logic_class, configs[block[0]], output_dir, init_cache)
+                continue
+            results_list, failed = experiment_logic_class.run_batch([configs[i] for i in block])
+            if np.any(failed):
+                logger.warning(f"{int(np.sum(failed))} of {len(block)} batched runs failed; "
+                               f"their outputs are NaN from the failure on.")
+            for i, results, run_failed in zip(block, results_list, failed):
+                performance = {"batch": {"size": len(block), "failed": bool(run_failed)}}
+                runs[i] = (results, _save_run_record(experiment_logic_class, configs[i], results, output_dir,
+                                                     performance=performance))
+    return runs
+
+
+def _config_table(base_config: Dict[str, Any], combination_table: pd.DataFrame) -> pd.DataFrame:
+    """One row per combination, one column per config key (base values repeated)."""
+    columns = {}
+    for key, value in base_config.items():
+        if key not in combination_table.columns:
+            columns[key] = [value] * len(combination_table) if isinstance(value, (list, dict, tuple)) else value
+    return combination_table.assign(**columns) if columns else combination_table
+
+
+def _run_vectorized(experiment_logic_class: type[ExperimentLogic], config_table: pd.DataFrame,
+                    configs: List[Dict[str, Any]], output_dir: Optional[str],
+                    batch_size: int) -> Optional[Tuple[Dict[str, Dict[str, Any]], List[Optional[str]]]]:
+    """
+    Computes all configurations with `get_results_batch`, `batch_size` rows at a time.
+
+    `config_table` holds the same configurations as `configs` (which are only
+    needed for the run records).
+
+    Returns:
+        The stacked results (leading axis over `configs`) and the record ID of
+        every run, or None if the experiment cannot compute these
+        configurations together (they are then run one by one).
+    """
+    blocks = []
+    for start in range(0, len(config_table), batch_size):
+        try:
+            blocks.append(experiment_logic_class.get_results_batch(config_table.iloc[start:start + batch_size]))
+        except ValueError as e:
+            logger.info(f"Vectorized sweep not possible ({e}); running the combinations one by one.")
+            return None
+    stacked = {
+        name: {"data": (blocks[0][name]["data"] if len(blocks) == 1
+                        else np.concatenate([block[name]["data"] for block in blocks])),
+               "descriptor": info["descriptor"]}
+        for name, info in blocks[0].items()
+    }
+
+    record_ids: List[Optional[str]] = [None] * len(configs)
+    if output_dir is not None:
+        performance = {"vectorized_sweep": {"size": len(configs)}}
+        for index, config in enumerate(configs):
+            record_ids[index] = _save_run_record(experiment_logic_class, config, _batch_row(stacked, index),
+                                                 output_dir, performance=performance)
+    return stacked, record_ids
+
+
+def _batch_row(stacked: Dict[str, Dict[str, Any]], index: int) -> Dict[str, Dict[str, Any]]:
+    """The results dictionary of one run of a vectorized sweep (views of the stacked arrays)."""
+    results = {}
+    for name, info in stacked.items():
+        data = info["data"][index]
+        if np.ndim(data) == 0:
+            data = data.item() if isinstance(data, np.generic) else data
+        results[name] = {"data": data, "descriptor": info["descriptor"]}
+    return results
+
+
+_worker_init_cache: Dict[Any, Dict[str, Any]] = {}  # Per-worker-process initial state cache
+
+
+def _init_sweep_worker(handles: List[SharedDataset]) -> None:
+    _worker_init_cache.clear()
+    install_shared_datasets(handles)
+
+
+def _run_in_worker(experiment_logic_class: type[ExperimentLogic], config: Dict[str, Any],
+                   output_dir: Optional[str], result_transport: str) -> Tuple[Dict[str, Dict[str, Any]], Optional[str]]:
+    results, record_id = _run_combination(experiment_logic_class, config, output_dir, _worker_init_cache)
+    return export_results(results, backend=result_transport), record_id
+
+
 def run_parameter_sweep(experiment_logic_class: type[ExperimentLogic], base_config: Dict[str, Any],
-                        param_ranges: Dict[str, List[Any]],
-                        output_dir: str = "experiments_output",
-                        output_transform: str = 'list') -> Union[List[Dict[str, Any]], Dict[str, Dict[str, Any]]]:
+                        param_ranges: Union[Dict[str, List[Any]], pd.DataFrame],
+                        output_dir: Optional[str] = "experiments_output",
+                        output_transform: str = 'list',
+                        stacked_dir: Optional[str] = None,
+                        reuse_prefixes: bool = True,
+                        n_workers: Optional[int] = None,
+                        shared_inputs: Optional[List[Union[str, SharedDataset]]] = None,
+                        result_transport: str = 'shm',
+                        batch_size: Optional[int] = None) -> Union[List[Dict[str, Any]], Dict[str, Dict[str, Any]], SweepResult]:
     """
     Runs a parameter sweep for a given ExperimentLogic instance.
 
     Args:
         experiment_logic_class: The *class* of the ExperimentLogic to use (not an instance).
         base_config: A dictionary of base configuration parameters.
-        param_ranges: A dictionary of parameter ranges to sweep.
-        output_dir:  The base output directory.  Individual runs will be stored in subdirectories.
-        output_transform: How to format final output, 'list' or 'nested'.
+        param_ranges: A dictionary of parameter ranges to sweep (run as a full
+                      factorial), or a design table (e.g. from `create_doe_table`)
+                      whose rows are run as given.
+        output_dir:  The base output directory.  Individual runs will be stored in subdirectories
+                     (None to skip saving the run records).
+        output_transform: How to format final output, 'list', 'nested' or 'stacked'.
+        stacked_dir: Only used with 'stacked': directory for memory-mapped backing
+                     of the stacked arrays (in memory if None).
+        reuse_prefixes: When `n_steps` is swept and the experiment is
+                        `prefix_consistent`, run only the longest horizon of
+                        each group of combinations that differ just in `n_steps`
+                        and serve the shorter ones by slicing its results (if
+                        every output is indexed by step; otherwise they are run).
+                        The records of derived runs carry a `provenance` entry.
+        n_workers: Run the combinations in this many worker processes (serially if
+                   None or 1).  The experiment class must be importable by the workers.
+        shared_inputs: Input files (or `SharedDataset` handles) that the workers
+                       should read from shared memory instead of loading them
+                       again: each path is published once with
+                       `publish_shared_dataset` for the duration of the sweep, and
+                       `load_csv` / `load_numpy` of that path in a worker return
+                       zero-copy views of it.
+        result_transport: How workers hand large array outputs back to this process:
+                          'shm' (shared memory) or 'memmap' (memory-mapped files)
+                          send only a handle and the arrays are mapped here without
+                          copying; 'pickle' sends them through the pipe.
+        batch_size: Opt-in batching (None, the default, runs every combination on
+                    its own).  For experiments with `batch_keys` (e.g. ODE
+                    experiments), run combinations that differ only in those
+                    keys through `run_batch`, up to this many in one vectorized
+                    integration.  This only applies to serial sweeps: with
+                    `n_workers` > 1 every combination is run on its own.  With
+                    the adaptive integrators, batched runs share error control,
+                    so their results differ from single runs within the
+                    integration tolerances, depending on which runs share a
+                    batch.  For experiments with `vectorized_sweeps`,
+                    compute this many combinations per `get_results_batch`
+                    call (records are still written per combination if
+                    `output_dir` is set).  The vectorized path runs in this
+                    process and needs no prefix reuse, so `n_workers`,
+                    `shared_inputs` and `reuse_prefixes` are ignored; it falls
+                    back to the per-combination path if the combinations
+                    cannot be computed together.
 
     Returns:
         If `output_transform` == 'list':
@@ -59,6 +395,10 @@ def run_parameter_sweep(experiment_logic_class: type[ExperimentLogic], base_conf
             A dictionary where keys are parameter combination names, and values
             are dictionaries containing the `results` (same as returned by get_results).
 
+        If `output_transform` == 'stacked':
+            A `SweepResult` holding the parameter table and one stacked array
+            per output (see `simulator.sweep_result`).
+
         In either case, the results of *each* individual run are saved to disk
         using the standard `ExperimentRecord` and `save_experiment_record` mechanism.
     """
@@ -66,60 +406,410 @@ def run_parameter_sweep(experiment_logic_class: type[ExperimentLogic], base_conf
     if not issubclass(experiment_logic_class, ExperimentLogic):
         raise TypeError("experiment_logic_class must be a subclass of ExperimentLogic")
 
-    if not param_ranges:
+    if len(param_ranges) == 0:
         raise ValueError("param_ranges cannot be empty.")
 
-    combinations = generate_parameter_combinations(param_ranges)
+    if output_transform not in ('list', 'nested', 'stacked'):
+        raise ValueError("Invalid output_transform value. Must be 'list', 'nested' or 'stacked'.")
+
+    if result_transport not in RESULT_TRANSPORTS:
+        raise ValueError(f"Invalid result_transport value. Must be one of {RESULT_TRANSPORTS}.")
+
+    if isinstance(param_ranges, pd.DataFrame):
+        combinations = param_ranges.to_dict('records')
+    else:
+        combinations = generate_parameter_combinations(param_ranges)
     results_list = []
     results_nested = {}
 
+    configs = []
     for combination in combinations:
         # Create a copy of the base config and update with the current combination
         config = base_config.copy()
         config.update(combination)
-        # Create an *instance* of the ExperimentLogic class
-        experiment_logic_instance = experiment_logic_class(config)
+        configs.append(config)
+
+    if batch_size and experiment_logic_class.vectorized_sweeps:
+        ignored = [name for name, value in (('n_workers', n_workers and n_workers > 1),
+                                            ('shared_inputs', shared_inputs)) if value]
+        if ignored:
+            logger.info(f"Vectorized sweep of {experiment_logic_class.__name__}: {', '.join(ignored)} ignored.")
+        if isinstance(param_ranges, pd.DataFrame):
+            combination_table = param_ranges.reset_index(drop=True)
+        else:
+            combination_table = pd.DataFrame(list(itertools.product(*param_ranges.values())),
+                                             columns=list(param_ranges.keys()))
+        vectorized = _run_vectorized(experiment_logic_class, _config_table(base_config, combination_table),
+                                     configs, output_dir, batch_size)
+        if vectorized is not None:
+            stacked, record_ids = vectorized
+            if output_transform == 'stacked':
+                params = combination_table
+                if output_dir is not None:
+                    params = params.assign(record_id=record_ids)
+                sweep = SweepResult(params, {name: info["data"] for name, info in stacked.items()},
+                                    {name: info["descriptor"] for name, info in stacked.items()})
+                return SweepResult.open(sweep.save(stacked_dir)) if stacked_dir is not None else sweep
+            for index, combination in enumerate(combinations):
+                results = _batch_row(stacked, index)
+                if output_transform == 'nested':
+                    combination_name = ", ".join(f"{k}={v}" for k, v in combination.items())
+                    results_nested[combination_name] = results
+                else:
+                    results_list.append({'params': combination, 'results': results, 'record_id': record_ids[index]})
+            return results_list if output_transform == 'list' else results_nested
+
+    # Decimated recordings (see simulator.recorder) cannot be sliced by step
+    if reuse_prefixes and all(experiment_logic_class.is_prefix_consistent(config) and records_every_step(config)
+                              for config in configs):
+        sources = _prefix_sources(combinations)
+    else:
+        sources = list(range(len(combinations)))
+
+    # Run every combination that serves itself or others (in worker processes if requested)
+    run_indices = sorted(set(sources))
+    source_runs = dict(zip(run_indices, _run_combinations(experiment_logic_class, [configs[i] for i in run_indices],
+                                                           output_dir, n_workers, shared_inputs,
+                                                           result_transport, batch_size)))
+
+    derived = {}
+    for index, combination in enumerate(combinations):
+        source = sources[index]
+        if source != index:
+            sliced = _slice_results(source_runs[source][0], combinations[source]["n_steps"], combination["n_steps"])
+            if sliced is not None:
+                derived[index] = sliced
+    unsliceable = [index for index, source in enumerate(sources) if source != index and index not in derived]
+    if unsliceable:
+        logger.info(f"{len(unsliceable)} runs have outputs that are not indexed by step; running them instead of slicing.")
+        source_runs.update(zip(unsliceable, _run_combinations(experiment_logic_class, [configs[i] for i in unsliceable],
+                                                              output_dir, n_workers, shared_inputs,
+                                                              result_transport, batch_size)))
+
+    for index, combination in enumerate(combinations):
+        config = configs[index]
+        if index not in derived:
+            results, record_id = source_runs[index]
+        else:
+            source = sources[index]
+            source_id = source_runs[source][1]
+            source_n_steps = combinations[source]["n_steps"]
+            results = derived[index]
+            record_id = _save_run_record(experiment_logic_class, config, results, output_dir,
+                                         provenance={'method': 'prefix_slice', 'derived_from': source_id,
+                                                     'source_n_steps': source_n_steps})
+
+        if output_transform == 'nested':
+            # Create a descriptive name for the combination (for the nested dict)
+            combination_name = ", ".join(f"{k}={v}" for k, v in combination.items())
+            results_nested[combination_name] = results
+        else:
+            results_list.append({'params': combination, 'results': results, 'record_id': record_id})
 
-        # Initialize and run the experiment with the updated config
-        state = experiment_logic_instance.initialize(config)
-        if hasattr(experiment_logic_instance, "run_step"):
-            for step in range(config.get("n_steps", 1)):
-                state = experiment_logic_instance.run_step(state, step)
-        results = experiment_logic_instance.get_results()
+    if output_transform == 'stacked':
+        return stack_sweep_results(pd.DataFrame(combinations), results_list, directory=stacked_dir)
+    return results_list if output_transform == 'list' else results_nested
 
-        # Create an ExperimentRecord and save the results to disk
-        record = ExperimentRecord(config, experiment_logic_class)
-        for data_name, data_info in results.items():
-            record.add_output_data(data_name, data_info["data"], data_info["descriptor"])
 
-        record_id = record.experiment_id # Get ID
-        save_experiment_record(record, output_dir)
-        logger.info(f"Parameter sweep run completed. Experiment ID: {record_id}")
+def run_adaptive_sweep(experiment_logic_class: type[ExperimentLogic], base_config: Dict[str, Any],
+                       param_bounds: Dict[str, Tuple[float, float]],
+                       summary_fn: Callable[[Dict[str, Dict[str, Any]]], float],
+                       initial_levels: int = 3,
+                       max_runs: int = 50,
+                       tolerance: Optional[float] = None,
+                       batch_size: int = 1,
+                       n_neighbors: Optional[int] = None,
+                       min_spacing: float = 1e-3,
+                       output_dir: Optional[str] = "experiments_output") -> SweepResult:
+    """
+    Runs a parameter sweep that refines where a scalar summary changes fastest.
 
+    The sweep starts from a coarse full factorial grid (`initial_levels` points
+    per parameter).  Every evaluated point is linked to its `n_neighbors`
+    nearest neighbours (in coordinates normalized to the unit hypercube) and
+    the absolute change of the summary along each link is used as the local
+    variation.  Each refinement step evaluates the midpoints of the
+    `batch_size` links with the largest variation, so runs concentrate in
+    regions where the output changes quickly and flat regions stay coarse.
 
-        if output_transform == 'list':
-            results_list.append({'params': combination, 'results': results, 'record_id': record_id})
-        elif output_transform == 'nested':
-            # Create a descriptive name for the combination (for the nested dict)
-            combination_name = ", ".join(f"{k}={v}" for k, v in combination.items())
-            results_nested[combination_name] = results
-        else:
-            raise ValueError("Invalid output_transform value. Must be 'list' or 'nested'.")
+    Args:
+        experiment_logic_class: The *class* of the ExperimentLogic to use (not an instance).
+        base_config: A dictionary of base configuration parameters.
+        param_bounds: `(low, high)` bounds of each swept parameter.  If both
+                      bounds are ints, the parameter is rounded to ints.
+        summary_fn: Maps a results dictionary (as returned by get_results) to a float.
+        initial_levels: Number of grid points per parameter in the initial design.
+        max_runs: Run budget, including the initial design.
+        tolerance: Stop once the largest variation between neighbours is below this value.
+        batch_size: Number of new points per refinement step.
+        n_neighbors: Neighbours linked to each point (default: 2 * number of parameters).
+        min_spacing: Links shorter than this (in normalized coordinates) are not split further.
+        output_dir: The base output directory for the individual run records (None to skip saving).
 
+    Returns:
+        A `SweepResult` whose parameter table also contains the `summary` value
+        and the refinement `iteration` that added each point (0 = initial
+        design).  `attrs['history']` records every refinement step.
+    """
+    if not issubclass(experiment_logic_class, ExperimentLogic):
+        raise TypeError("experiment_logic_class must be a subclass of ExperimentLogic")
+    if not param_bounds:
+        raise ValueError("param_bounds cannot be empty.")
+    if initial_levels < 2:
+        raise ValueError("initial_levels must be at least 2.")
+
+    names = list(param_bounds.keys())
+    low = np.array([float(param_bounds[n][0]) for n in names])
+    high = np.array([float(param_bounds[n][1]) for n in names])
+    integer = np.array([all(isinstance(b, (int, np.integer)) for b in param_bounds[n]) for n in names])
+    if np.any(high <= low):
+        raise ValueError("Each parameter bound must satisfy low < high.")
+    n_neighbors = n_neighbors or 2 * len(names)
+
+    def to_params(unit_point: np.ndarray) -> Dict[str, Any]:
+        values = low + unit_point * (high - low)
+        return {n: (int(round(v)) if is_int else float(v)) for n, v, is_int in zip(names, values, integer)}
+
+    def to_unit(params: Dict[str, Any]) -> np.ndarray:
+        return (np.array([params[n] for n in names], dtype=float) - low) / (high - low)
+
+    points: List[np.ndarray] = []
+    params_list: List[Dict[str, Any]] = []
+    results_list: List[Dict[str, Dict[str, Any]]] = []
+    summaries: List[float] = []
+    iterations: List[int] = []
+    record_ids: List[Optional[str]] = []
+    seen = set()
+    init_cache: Dict[Any, Dict[str, Any]] = {}
+
+    def evaluate(unit_point: np.ndarray, iteration: int) -> bool:
+        params = to_params(unit_point)
+        key = tuple(params[n] for n in names)
+        if key in seen:
+            return False
+        seen.add(key)
+        config = base_config.copy()
+        config.update(params)
+        results, record_id = _run_combination(experiment_logic_class, config, output_dir, init_cache)
+        points.append(to_unit(params))
+        params_list.append(params)
+        results_list.append(results)
+        summaries.append(float(summary_fn(results)))
+        iterations.append(iteration)
+        record_ids.append(record_id)
+        return True
+
+    grid = np.stack(np.meshgrid(*[np.linspace(0.0, 1.0, initial_levels)] * len(names), indexing='ij'), axis=-1)
+    for unit_point in grid.reshape(-1, len(names)):
+        if len(points) >= max_runs:
+            break
+        evaluate(unit_point, 0)
+
+    history = [{'iteration': 0, 'n_runs': len(points), 'max_variation': None,
+                'new_points': list(params_list)}]
+    stop_reason = 'budget'
+    iteration = 0
+    while len(points) < max_runs:
+        iteration += 1
+        X = np.array(points)
+        y = np.array(summaries)
+        distances = np.linalg.norm(X[:, None, :] - X[None, :, :], axis=-1)
+        np.fill_diagonal(distances, np.inf)
+        k = min(n_neighbors, len(X) - 1)
+        neighbours = np.argsort(distances, axis=1)[:, :k]
+        i_idx = np.repeat(np.arange(len(X)), k)
+        j_idx = neighbours.ravel()
+        # Each undirected link once
+        links = np.unique(np.sort(np.stack([i_idx, j_idx], axis=1), axis=1), axis=0)
+        variation = np.abs(y[links[:, 0]] - y[links[:, 1]])
+        splittable = distances[links[:, 0], links[:, 1]] > min_spacing
+        variation = np.where(splittable, variation, -np.inf)
+        max_variation = float(variation.max()) if len(variation) else -np.inf
+
+        if not np.isfinite(max_variation):
+            stop_reason = 'resolution'
+            break
+        if tolerance is not None and max_variation < tolerance:
+            stop_reason = 'tolerance'
+            break
+
+        new_params = []
+        for link in np.argsort(-variation):
+            if len(new_params) >= batch_size or len(points) >= max_runs or not np.isfinite(variation[link]):
+                break
+            i, j = links[link]
+            if evaluate((X[i] + X[j]) / 2.0, iteration):
+                new_params.append(params_list[-1])
+        history.append({'iteration': iteration, 'n_runs': len(points), 'max_variation': max_variation,
+                        'new_points': new_params})
+        if not new_params:
+            stop_reason = 'resolution'
+            break
+        logger.info(f"Adaptive sweep iteration {iteration}: {len(points)} runs, max variation {max_variation:.4g}")
+
+    table = pd.DataFrame(params_list, columns=names)
+    table['summary'] = summaries
+    table['iteration'] = iterations
+    if output_dir is not None:
+        table['record_id'] = record_ids
+    return SweepResult.from_runs(table, results_list,
+                                 attrs={'history': history, 'stop_reason': stop_reason})
+
+
+def run_successive_halving(experiment_logic_class: type[ExperimentLogic], base_config: Dict[str, Any],
+                           param_ranges: Union[Dict[str, List[Any]], pd.DataFrame],
+                           objective: Callable[[Dict[str, Dict[str, Any]]], float],
+                           min_steps: int,
+                           max_steps: Optional[int] = None,
+                           eta: int = 2,
+                           keep_fraction: float = 0.5,
+                           maximize: bool = False,
+                           output_dir: Optional[str] = "experiments_output") -> SweepResult:
+    """
+    Multi-fidelity sweep that uses `n_steps` as the fidelity.
 
-    return results_list if output_transform == 'list' else results_nested
+    Every combination is first run for `min_steps` steps and scored with
+    `objective`.  The best `keep_fraction` of the candidates are promoted to a
+    horizon `eta` times longer, and so on until the survivors reach
+    `max_steps`.  Experiments with `supports_resume` keep their instance and
+    state as an in-memory checkpoint, so a promoted run continues from the
+    step it reached instead of starting over; others are rerun from scratch.
 
+    Args:
+        experiment_logic_class: The *class* of the ExperimentLogic to use (not an instance).
+        base_config: A dictionary of base configuration parameters.
+        param_ranges: Parameter ranges (full factorial) or a design table.
+        objective: Maps a results dictionary to a score (lower is better unless `maximize`).
+        min_steps: Horizon of the first rung.
+        max_steps: Full horizon (defaults to `base_config['n_steps']`).
+        eta: Growth factor of the horizon between rungs.
+        keep_fraction: Fraction of candidates promoted after each rung (at least one).
+        maximize: Treat higher scores as better.
+        output_dir: The base output directory for the run records (None to skip saving).
 
-def create_doe_table(param_ranges: Dict[str, List[Any]], design_type: str = 'full_factorial') -> pd.DataFrame:
+    Returns:
+        A `SweepResult` with one row per evaluation at every fidelity level.  The
+        parameter table holds the swept parameters plus `candidate`, `rung`,
+        `n_steps`, `score`, `promoted` and `resumed`.  `attrs['rungs']`
+        summarizes each rung and `attrs['best']` is the best final candidate.
+    """
+    if not issubclass(experiment_logic_class, ExperimentLogic):
+        raise TypeError("experiment_logic_class must be a subclass of ExperimentLogic")
+    if len(param_ranges) == 0:
+        raise ValueError("param_ranges cannot be empty.")
+    max_steps = max_steps if max_steps is not None else base_config.get("n_steps")
+    if max_steps is None or min_steps < 1 or min_steps > max_steps:
+        raise ValueError("Require 1 <= min_steps <= max_steps (or n_steps in base_config).")
+    if eta < 2:
+        raise ValueError("eta must be at least 2.")
+    if not 0.0 < keep_fraction < 1.0:
+        raise ValueError("keep_fraction must be between 0 and 1.")
+
+    if isinstance(param_ranges, pd.DataFrame):
+        combinations = param_ranges.to_dict('records')
+    else:
+        combinations = generate_parameter_combinations(param_ranges)
+
+    horizons = [min_steps]
+    while horizons[-1] < max_steps:
+        horizons.append(min(horizons[-1] * eta, max_steps))
+
+    resumable = experiment_logic_class.supports_resume
+    checkpoints: Dict[int, Tuple[ExperimentLogic, Dict[str, Any], int]] = {}
+    rows: List[Dict[str, Any]] = []
+    results_list: List[Dict[str, Dict[str, Any]]] = []
+    rung_summaries = []
+    candidates = list(range(len(combinations)))
+    init_cache: Dict[Any, Dict[str, Any]] = {}
+
+    for rung, n_steps in enumerate(horizons):
+        scores = []
+        for candidate in candidates:
+            config = base_config.copy()
+            config.update(combinations[candidate])
+            config["n_steps"] = n_steps
+
+            cache_stats = get_dataset_cache_stats()
+            resumed = resumable and candidate in checkpoints
+            if resumed:
+                logic, state, done = checkpoints[candidate]
+                logic.extend_horizon(n_steps)
+            else:
+                logic = experiment_logic_class(config)
+                state, done = _initialize(logic, config, init_cache), 0
+            state = _advance(logic, state, done, n_steps)
+            if resumable:
+                checkpoints[candidate] = (logic, state, n_steps)
+            results = logic.get_results()
+
+            score = float(objective(results))
+            scores.append(score)
+            performance = {"dataset_cache": get_dataset_cache_stats(since=cache_stats)}
+            record_id = _save_run_record(experiment_logic_class, config, results, output_dir,
+                                         performance=performance)
+            rows.append(dict(combinations[candidate], candidate=candidate, rung=rung, n_steps=n_steps,
+                             score=score, promoted=False, resumed=resumed, record_id=record_id))
+            results_list.append(results)
+
+        order = np.argsort(-np.array(scores) if maximize else np.array(scores), kind='stable')
+        n_keep = max(1, int(np.ceil(keep_fraction * len(candidates))))
+        survivors = [candidates[i] for i in order[:n_keep]]
+        rung_summaries.append({'rung': rung, 'n_steps': n_steps, 'n_candidates': len(candidates),
+                               'best_score': scores[order[0]], 'best_candidate': candidates[order[0]]})
+        logger.info(f"Successive halving rung {rung}: {len(candidates)} runs at n_steps={n_steps}, "
+                    f"best score {scores[order[0]]:.4g}")
+
+        if rung < len(horizons) - 1:
+            for row in rows[-len(candidates):]:
+                row['promoted'] = row['candidate'] in survivors
+            # Checkpoints of eliminated candidates are no longer needed
+            for candidate in set(candidates) - set(survivors):
+                checkpoints.pop(candidate, None)
+            candidates = survivors
+
+    table = pd.DataFrame(rows)
+    if output_dir is None:
+        table = table.drop(columns='record_id')
+    best = rung_summaries[-1]['best_candidate']
+    return SweepResult.from_runs(table, results_list,
+                                 attrs={'rungs': rung_summaries, 'best': combinations[best],
+                                        'horizons': horizons})
+
+
+SPACE_FILLING_DESIGNS = ('latin_hypercube', 'sobol', 'halton', 'random')
+DESIGN_TYPES = ('full_factorial', 'fractional_factorial') + SPACE_FILLING_DESIGNS
+
+
+def create_doe_table(param_ranges: Dict[str, Union[List[Any], Tuple[Any, Any]]], design_type: str = 'full_factorial',
+                     n_samples: Optional[int] = None, seed: Optional[int] = None,
+                     generators: Optional[Dict[str, str]] = None) -> pd.DataFrame:
     """
     Creates a Design of Experiments (DOE) table.
 
+    Parameter ranges can be given in two forms:
+      * a list of levels, e.g. ``[0.1, 0.2, 0.3]`` or ``['a', 'b']``;
+      * a ``(low, high)`` tuple for a continuous range.  If both bounds are
+        ints, sampled values are rounded to ints (useful for e.g. ``n_steps``).
+
     Args:
-        param_ranges: Dictionary of parameter ranges (as in generate_parameter_combinations)
-        design_type:  Currently only supports 'full_factorial'
+        param_ranges: Dictionary of parameter ranges.
+        design_type: One of
+            'full_factorial'       - every combination of levels (tuples are used as two levels);
+            'fractional_factorial' - 2-level 2^(k-p) design on the low/high end of each range;
+            'latin_hypercube', 'sobol', 'halton', 'random' - ``n_samples`` points in the unit
+                                     hypercube mapped onto the ranges (continuous ranges are
+                                     scaled, level lists are binned).
+        n_samples: Number of runs for the space-filling designs.  For
+                   'fractional_factorial', optionally the number of runs: a power of two
+                   no larger than the full factorial, matching the generators if given.
+        seed: Seed for the random and scrambled quasi-random designs.
+        generators: Only for 'fractional_factorial'.  Maps each generated factor to
+                    the product of base factors it is aliased with, e.g.
+                    ``{'d': 'a*b*c'}``.  Chosen automatically (highest-order
+                    interactions first) if not given.
 
     Returns:
-        A Pandas DataFrame representing the DOE table.
+        A Pandas DataFrame representing the DOE table, one row per run.
     """
     if not param_ranges:
       raise ValueError("param_ranges cannot be empty for DOE table creation.")
@@ -127,8 +817,105 @@ def create_doe_table(param_ranges: Dict[str, List[Any]], design_type: str = 'ful
         combinations = generate_parameter_combinations(param_ranges)
         df = pd.DataFrame(combinations)
         return df
+    elif design_type == 'fractional_factorial':
+        return _fractional_factorial_table(param_ranges, n_samples, generators)
+    elif design_type in SPACE_FILLING_DESIGNS:
+        if n_samples is None or n_samples < 1:
+            raise ValueError(f"design_type '{design_type}' requires a positive n_samples.")
+        unit = _unit_samples(design_type, len(param_ranges), n_samples, seed)
+        return pd.DataFrame({name: _scale_unit_column(spec, unit[:, i])
+                             for i, (name, spec) in enumerate(param_ranges.items())})
+    else:
+        raise ValueError(f"Unsupported design_type: {design_type}. Must be one of {DESIGN_TYPES}.")
+
+
+def _unit_samples(design_type: str, n_dims: int, n_samples: int, seed: Optional[int]) -> np.ndarray:
+    """Draws an (n_samples, n_dims) design in the unit hypercube [0, 1)."""
+    if design_type == 'random':
+        return np.random.default_rng(seed).random((n_samples, n_dims))
+
+    from scipy.stats import qmc  # Only needed for the quasi-random designs
+    engine_class = {'latin_hypercube': qmc.LatinHypercube, 'sobol': qmc.Sobol, 'halton': qmc.Halton}[design_type]
+    try:
+        engine = engine_class(n_dims, rng=seed)
+    except TypeError:  # scipy < 1.15
+        engine = engine_class(n_dims, seed=seed)
+    return engine.random(n_samples)
+
+
+def _scale_unit_column(spec: Union[List[Any], Tuple[Any, Any]], unit: np.ndarray) -> np.ndarray:
+    """Maps unit-interval samples onto a continuous range or a list of levels."""
+    if isinstance(spec, tuple):
+        if len(spec) != 2:
+            raise ValueError(f"Continuous ranges must be (low, high) tuples, got {spec}.")
+        low, high = spec
+        if isinstance(low, (int, np.integer)) and isinstance(high, (int, np.integer)):
+            # high - low + 1 equal-width bins, so that both bounds are sampled
+            return np.clip(np.floor(low + unit * (high - low + 1)), low, high).astype(int)
+        return low + unit * (high - low)
+    levels = np.asarray(spec)
+    indices = np.minimum((unit * len(levels)).astype(int), len(levels) - 1)
+    return levels[indices]
+
+
+def _two_levels(spec: Union[List[Any], Tuple[Any, Any]]) -> Tuple[Any, Any]:
+    """Low/high values of a factor in a 2-level design."""
+    if len(spec) < 2:
+        raise ValueError(f"Fractional factorial designs need at least two levels per factor, got {spec}.")
+    return spec[0], spec[-1]
+
+
+def _fractional_factorial_table(param_ranges: Dict[str, Union[List[Any], Tuple[Any, Any]]],
+                                n_samples: Optional[int],
+                                generators: Optional[Dict[str, str]]) -> pd.DataFrame:
+    """Builds a 2-level fractional factorial design from base factors and generators."""
+    names = list(param_ranges.keys())
+    n_factors = len(names)
+
+    if generators is not None:
+        unknown = [g for g in generators if g not in param_ranges]
+        if unknown:
+            raise ValueError(f"Generated factors not in param_ranges: {unknown}")
+        base_names = [n for n in names if n not in generators]
+        if n_samples is not None and n_samples != 2 ** len(base_names):
+            raise ValueError(f"The generators give a design of {2 ** len(base_names)} runs, "
+                             f"not n_samples={n_samples}.")
     else:
-        raise ValueError(f"Unsupported design_type: {design_type}")
+        if n_samples is not None:
+            n_base = int(np.log2(n_samples))
+            if 2 ** n_base != n_samples:
+                raise ValueError("n_samples must be a power of two for a fractional factorial design.")
+        else:
+            # Smallest design that can alias every extra factor with a distinct interaction.
+            n_base = 1
+            while 2 ** n_base - 1 < n_factors:
+                n_base += 1
+        if n_base > n_factors:
+            raise ValueError(f"n_samples={n_samples} exceeds the {2 ** n_factors} runs of the full "
+                             f"factorial design of {n_factors} factors.")
+        if 2 ** n_base - 1 < n_factors:
+            raise ValueError(f"{2 ** n_base} runs are too few for {n_factors} factors.")
+        base_names = names[:n_base]
+        interactions = [combo for order in range(n_base, 1, -1)
+                        for combo in itertools.combinations(base_names, order)]
+        generators = {name: "*".join(combo) for name, combo in zip(names[n_base:], interactions)}
+
+    n_base = len(base_names)
+    # Standard order: column j alternates in blocks of 2**j.
+    base = ((np.arange(2 ** n_base)[:, None] >> np.arange(n_base)) & 1) * 2 - 1
+    coded = {name: base[:, j] for j, name in enumerate(base_names)}
+    for name, word in generators.items():
+        factors = [f.strip() for f in word.split("*") if f.strip()]
+        missing = [f for f in factors if f not in coded or f in generators]
+        if not factors or missing:
+            raise ValueError(f"Generator '{name}={word}' must be a product of base factors {base_names}.")
+        coded[name] = np.prod([coded[f] for f in factors], axis=0)
+
+    table = {}
+    for name in names:
+        low, high = _two_levels(param_ranges[name])
+        table[name] = np.where(coded[name] < 0, np.asarray(low, dtype=object), np.asarray(high, dtype=object))
+    return pd.DataFrame(table).infer_objects()
 
 
 
@@ -182,4 +969,32 @@ def append_results_to_doe_table(doe_table: pd.DataFrame, results: List[Dict[str,
 
     results_df = pd.DataFrame(flattened_results)
     combined_df = pd.concat([doe_table, results_df], axis=1)
-    return combined_df
\ No newline at end of file
+    return combined_df
+
+
+def stack_sweep_results(doe_table: pd.DataFrame, results: List[Dict[str, Any]],
+                        directory: Optional[str] = None) -> SweepResult:
+    """
+    Stacks the results of a sweep into a `SweepResult`.
+
+    Unlike `append_results_to_doe_table`, array outputs are not split into one
+    column per element: each output becomes a single
+    `(n_combinations, ...)` array built with one `np.stack`.
+
+    Args:
+        doe_table: The DOE table (one row per run).
+        results: The results from `run_parameter_sweep` (with output_transform='list').
+        directory: Optional directory for memory-mapped `.npy` backing.
+
+    Returns:
+        A `SweepResult`.
+    """
+    if not isinstance(doe_table, pd.DataFrame):
+        raise TypeError("doe_table must be a pandas DataFrame")
+    if not all('results' in r for r in results):
+        raise ValueError("results must contain 'results' key, ensure output_transform='list'")
+
+    params = doe_table.reset_index(drop=True)
+    if all('record_id' in r for r in results):
+        params = params.assign(record_id=[r['record_id'] for r in results])
+    return SweepResult.from_runs(params, [r['results'] for r in results], directory=directory)
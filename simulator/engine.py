@@ -17,7 +17,9 @@ from datetime import datetime
 import numpy as np
 import pandas as pd
 from .visualization import generate_plots
-from .persistence import save_experiment_record, load_experiment_record  # Import the functions
+from .persistence import save_experiment_record, load_experiment_record, SIDECAR_DIR  # Import the functions
+from .data_handler import get_dataset_cache_stats
+from .recorder import RecordingPolicy
 
 
 # Configure logging
@@ -84,19 +86,28 @@ class SimulatorEngine:
             logger.warning(f"Failed to get software versions: {e}")
 
         try:
+            cache_stats = get_dataset_cache_stats()
+            recording = RecordingPolicy.from_config(config)  # Validate before running
+            if recording.mode != "all":
+                record.add_log_message(f"Recording policy: {recording.to_dict()}")
+            if recording.memory_budget is not None and recording.spill_dir is None:
+                # Spilled columns are written where the record keeps its sidecars, so they are saved in place
+                config = {**config, "recording": {**recording.to_dict(),
+                                                  "spill_dir": os.path.join(experiment_dir, SIDECAR_DIR)}}
+
             # Initialize experiment logic
             experiment_logic = experiment_logic_class(config)
             state = experiment_logic.initialize(config)
 
             # Run simulation steps (if applicable)
             if hasattr(experiment_logic, "run_step"):
-                for step in range(config.get("n_steps", 1)):  # Default to 1 step
-                    state = experiment_logic.run_step(state, step)
-                    logger.debug(f"Step {step}: State = {state}")
+                state = experiment_logic.advance(state, 0, config.get("n_steps", 1))  # Default to 1 step
+                logger.debug(f"Final state = {state}")
 
             # Get results
             results = experiment_logic.get_results()
             self._validate_results(results)
+            record.add_performance_info("dataset_cache", get_dataset_cache_stats(since=cache_stats))
 
             # Add output to record
             for data_name, data_info in results.items():
@@ -109,13 +120,16 @@ class SimulatorEngine:
             generate_plots(results, experiment_dir, static_format=static_format)  # Get from config
             # --- END MODIFIED ---
 
-            # Save result to csv
-            if config.get('save_csv', False): # Check for save_csv option.
+            # Save results as a table (results_format, or the older boolean save_csv)
+            results_format = config.get('results_format')
+            if results_format is None and config.get('save_csv', False):
+                results_format = 'csv'
+            if results_format:
                 try:
-                    from .data_handler import save_csv # Import here to avoid circular import
-                    save_csv(results, os.path.join(experiment_dir, "results.csv"))
+                    from .data_handler import save_results # Import here to avoid circular import
+                    save_results(results, os.path.join(experiment_dir, "results"), results_format=results_format)
                 except Exception as e:
-                    logger.error(f"Could not save to csv: {e}")
+                    logger.error(f"Could not save results as {results_format}: {e}")
 
             record.set_end_time()
             logger.info(f"Experiment completed: {record.experiment_id}")
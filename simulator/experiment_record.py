@@ -28,6 +28,8 @@ class ExperimentRecord:
         self.system_info: Dict[str, Any] = {}  # add this.
         self.software_versions: Dict[str, str] = {}  # and this.
         self.llm_usage: Dict[str, Any] = {} # LLM usage.
+        self.provenance: Dict[str, Any] = {}  # How the outputs were obtained, if not by a plain run.
+        self.performance: Dict[str, Any] = {}  # Runtime statistics (e.g. dataset cache hit rates).
 
     def add_input_data_descriptor(self, name: str, descriptor: DataDescriptor):
         self.input_data_descriptors[name] = descriptor
@@ -50,8 +52,19 @@ class ExperimentRecord:
     def set_llm_usage(self, llm_usage: Dict[str, Any]):
         self.llm_usage = llm_usage
 
-    def to_dict(self) -> Dict[str, Any]:
-        """Serialize the entire record to a dictionary (for saving)."""
+    def set_provenance(self, provenance: Dict[str, Any]):
+        self.provenance = provenance
+
+    def add_performance_info(self, name: str, info: Dict[str, Any]):
+        self.performance[name] = info
+
+    def to_dict(self, include_output_data: bool = True) -> Dict[str, Any]:
+        """
+        Serialize the entire record to a dictionary (for saving).
+
+        With `include_output_data=False` the "output_data" entry is None, so the
+        (potentially large) outputs can be written separately by a streaming writer.
+        """
         # Convert everything to JSON-serializable types
         return {
             "experiment_id": self.experiment_id,
@@ -70,11 +83,13 @@ class ExperimentRecord:
                     "data": _convert_to_serializable(data_info["data"]),  # use convert
                     "descriptor": data_info["descriptor"].to_dict()  # Use a to_dict method
                 } for name, data_info in self.output_data.items()
-            },
+            } if include_output_data else None,
             "log_messages": self.log_messages,
             "system_info": self.system_info,
             "software_versions": self.software_versions,
             'llm_usage': self.llm_usage,
+            'provenance': self.provenance,
+            'performance': self.performance,
         }
 
 
@@ -0,0 +1,128 @@
+# simulator/observations.py
+from typing import Dict, Any, List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+ArrayLike = Union[np.ndarray, Sequence[float]]
+
+
+class ObservationMap:
+    """
+    Maps observation times onto a simulation time grid.
+
+    The grid indices bracketing every observation and its linear
+    interpolation weight are found once (with `np.searchsorted`), so that
+    simulated trajectories of any batch shape can then be compared to the
+    observations with a gather and a multiply-add.
+    """
+
+    def __init__(self, observed_times: ArrayLike, grid: ArrayLike):
+        times = np.asarray(observed_times, dtype=float)
+        grid = np.asarray(grid, dtype=float)
+        if grid.ndim != 1 or len(grid) == 0:
+            raise ValueError("The simulation grid must be a non-empty 1-D array.")
+        if np.any(np.diff(grid) <= 0):
+            raise ValueError("The simulation grid must be strictly increasing.")
+        if np.any(np.isnan(times)) or np.any(times < grid[0]) or np.any(times > grid[-1]):
+            raise ValueError(f"Observation times must lie within the simulated time span "
+                             f"[{grid[0]}, {grid[-1]}].")
+        self.times = times
+        self.grid_size = len(grid)
+        if len(grid) == 1:
+            self.left = self.right = np.zeros(len(times), dtype=np.intp)
+            self.weight = np.zeros(len(times))
+            return
+        self.right = np.searchsorted(grid, times, side='right').clip(1, len(grid) - 1)
+        self.left = self.right - 1
+        self.weight = (times - grid[self.left]) / (grid[self.right] - grid[self.left])
+
+    @classmethod
+    def from_results(cls, results: Dict[str, Dict[str, Any]], time_column: str = 'time') -> 'ObservationMap':
+        """The map of an experiment's ``observed_data`` onto its simulated ``time`` output."""
+        observed = results['observed_data']['data']
+        return cls(observed[time_column], results['time']['data'])
+
+    def interpolate(self, simulated: ArrayLike) -> np.ndarray:
+        """
+        Simulated values at the observation times.
+
+        Args:
+            simulated: Trajectories on the grid, shape `(..., grid_size)`.
+
+        Returns:
+            An array of shape `(..., n_observations)`.
+        """
+        simulated = np.asarray(simulated, dtype=float)
+        if simulated.shape[-1] != self.grid_size:
+            raise ValueError(f"Expected trajectories of length {self.grid_size}, got {simulated.shape[-1]}.")
+        lower = simulated[..., self.left]
+        aligned = simulated[..., self.right]
+        aligned -= lower
+        aligned *= self.weight
+        aligned += lower
+        return aligned
+
+
+def sse(simulated: ArrayLike, observed: ArrayLike, mapping: ObservationMap) -> np.ndarray:
+    """
+    Sum of squared errors of every simulated trajectory.
+
+    `observed` has shape `(n_observations,)` or `(n_columns, n_observations)`;
+    `simulated` has the same leading shape with the grid as last axis, after
+    any batch axes, e.g. `(batch, n_columns, grid_size)`.  NaN observations
+    are skipped.  Returns one loss per batch element.
+    """
+    residuals = _residuals(simulated, observed, mapping)
+    return _reduce(residuals * residuals, np.ndim(observed))
+
+
+def weighted_sse(simulated: ArrayLike, observed: ArrayLike, mapping: ObservationMap,
+                 weights: ArrayLike) -> np.ndarray:
+    """`sse` with every squared error multiplied by `weights` (broadcast against `observed`)."""
+    residuals = _residuals(simulated, observed, mapping)
+    residuals *= residuals
+    residuals *= np.asarray(weights, dtype=float)
+    return _reduce(residuals, np.ndim(observed))
+
+
+def gaussian_log_likelihood(simulated: ArrayLike, observed: ArrayLike, mapping: ObservationMap,
+                            sigma: ArrayLike = 1.0) -> np.ndarray:
+    """
+    Log-likelihood of the observations under independent Gaussian errors.
+
+    `sigma` is the error standard deviation, a scalar or broadcast against
+    `observed` (e.g. one value per column).  NaN observations are skipped.
+    """
+    observed = np.asarray(observed, dtype=float)
+    sigma = np.broadcast_to(np.asarray(sigma, dtype=float), observed.shape)
+    residuals = _residuals(simulated, observed, mapping)
+    residuals /= sigma
+    residuals *= residuals
+    valid = ~np.isnan(observed)
+    normalization = np.sum(np.log(2 * np.pi * sigma[valid] ** 2))
+    return -0.5 * (_reduce(residuals, observed.ndim) + normalization)
+
+
+def stack_outputs(results_list: List[Dict[str, Dict[str, Any]]], columns: Sequence[str]) -> np.ndarray:
+    """The `columns` outputs of several runs as one `(n_runs, n_columns, grid_size)` array."""
+    return np.stack([np.stack([np.asarray(results[column]['data'], dtype=float) for column in columns])
+                     for results in results_list])
+
+
+def observed_columns(observed: pd.DataFrame, results: Dict[str, Dict[str, Any]],
+                     time_column: str = 'time') -> List[str]:
+    """The observed columns that are also outputs of `results`."""
+    return [column for column in observed.columns if column != time_column and column in results]
+
+
+def _residuals(simulated: ArrayLike, observed: ArrayLike, mapping: ObservationMap) -> np.ndarray:
+    observed = np.asarray(observed, dtype=float)
+    residuals = mapping.interpolate(simulated)
+    residuals -= observed
+    np.copyto(residuals, 0.0, where=np.isnan(observed))  # Only missing observations; NaN simulations propagate
+    return residuals
+
+
+def _reduce(values: np.ndarray, observed_ndim: int) -> np.ndarray:
+    return values.sum(axis=tuple(range(-max(observed_ndim, 1), 0)))
@@ -0,0 +1,385 @@
+# simulator/ode.py
+import copy
+from abc import abstractmethod
+from typing import Dict, Any, Callable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from .base import ExperimentLogic
+from .recorder import Recorder, RecordingPolicy
+from .utils import DataDescriptor, DataType
+
+FIXED_STEP_INTEGRATORS = ("euler", "rk4")
+SCIPY_INTEGRATORS = ("RK45", "RK23", "DOP853", "LSODA", "Radau", "BDF")  # Methods of scipy's solve_ivp
+INTEGRATORS = FIXED_STEP_INTEGRATORS + SCIPY_INTEGRATORS
+IMPLICIT_INTEGRATORS = ("LSODA", "Radau", "BDF")  # Batches of these are solved row by row
+OUTPUT_CHUNK_ROWS = 65536  # Output grid rows integrated and sampled at a time
+
+# Dormand-Prince 5(4) tableau (as in scipy's RK45)
+_DOPRI_C = np.array([0, 1 / 5, 3 / 10, 4 / 5, 8 / 9, 1])
+_DOPRI_A = [
+    [],
+    [1 / 5],
+    [3 / 40, 9 / 40],
+    [44 / 45, -56 / 15, 32 / 9],
+    [19372 / 6561, -25360 / 2187, 64448 / 6561, -212 / 729],
+    [9017 / 3168, -355 / 33, 46732 / 5247, 49 / 176, -5103 / 18656],
+]
+_DOPRI_B = np.array([35 / 384, 0, 500 / 1113, 125 / 192, -2187 / 6784, 11 / 84])
+_DOPRI_E = np.array([-71 / 57600, 0, 71 / 16695, -71 / 1920, 17253 / 339200, -22 / 525, 1 / 40])
+
+
+def rk4_integrate(rhs: Callable[[float, np.ndarray], np.ndarray], y0: np.ndarray, times: np.ndarray,
+                  substeps: int = 1, non_negative: bool = False) -> np.ndarray:
+    """
+    Classic fixed-step Runge-Kutta integration, sampled on a time grid.
+
+    Args:
+        rhs: Right-hand side ``f(t, y)``; the state is on the first axis of `y`,
+             any further axes (e.g. parameter sets) are integrated alongside.
+        y0: State at ``times[0]``.
+        times: Increasing output times.
+        substeps: RK4 steps per output interval.
+        non_negative: Clip the state at zero after every step.
+
+    Returns:
+        The state at every output time, shape ``(len(times),) + y0.shape``.
+    """
+    y = np.array(y0, dtype=float)
+    out = np.empty((len(times),) + y.shape)
+    out[0] = y
+    for i in range(1, len(times)):
+        t, h = times[i - 1], (times[i] - times[i - 1]) / substeps
+        for _ in range(substeps):
+            k1 = rhs(t, y)
+            k2 = rhs(t + h / 2, y + h / 2 * k1)
+            k3 = rhs(t + h / 2, y + h / 2 * k2)
+            k4 = rhs(t + h, y + h * k3)
+            y = y + h / 6 * (k1 + 2 * k2 + 2 * k3 + k4)
+            if non_negative:
+                y = np.maximum(y, 0)
+            t += h
+        out[i] = y
+    return out
+
+
+def euler_integrate(rhs: Callable[[float, np.ndarray], np.ndarray], y0: np.ndarray, times: np.ndarray,
+                    non_negative: bool = False) -> np.ndarray:
+    """Explicit Euler, one step per output interval (same arguments and result as `rk4_integrate`)."""
+    y = np.array(y0, dtype=float)
+    out = np.empty((len(times),) + y.shape)
+    out[0] = y
+    for i in range(1, len(times)):
+        y = y + (times[i] - times[i - 1]) * rhs(times[i - 1], y)
+        if non_negative:
+            y = np.maximum(y, 0)
+        out[i] = y
+    return out
+
+
+def dopri_integrate(rhs: Callable[[float, np.ndarray], np.ndarray], y0: np.ndarray, times: np.ndarray,
+                    rtol: float = 1e-6, atol: float = 1e-9,
+                    max_step: float = np.inf) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Adaptive Dormand-Prince 5(4) integration of a batch of systems on a common time grid.
+
+    The state has shape ``(n_state, n_sets)``; all sets take the same steps,
+    and a step is accepted only if the error of *every* set is within
+    tolerance, so each set is as accurate as if it were integrated alone.
+    Steps end exactly on the output times.  A set whose state becomes
+    non-finite, or whose error cannot be reduced below tolerance, is marked
+    as failed, its values become NaN and it no longer limits the step size.
+
+    Returns:
+        The states at every output time, shape ``(len(times), n_state, n_sets)``,
+        and a boolean mask of the failed sets.
+    """
+    y = np.array(y0, dtype=float)
+    out = np.full((len(times),) + y.shape, np.nan)
+    out[0] = y
+    failed = np.zeros(y.shape[1:], dtype=bool)
+    t = float(times[0])
+    with np.errstate(all="ignore"):
+        f = rhs(t, y)
+        h = min(max_step, (times[-1] - times[0]) / 100 if len(times) > 1 else 0.0)
+        for i in range(1, len(times)):
+            target = float(times[i])
+            while t < target:
+                step = min(h, max_step, target - t)
+                k = [f]
+                for c, a in zip(_DOPRI_C[1:], _DOPRI_A[1:]):
+                    k.append(rhs(t + c * step, y + step * sum(a_j * k_j for a_j, k_j in zip(a, k))))
+                y_new = y + step * sum(b * k_j for b, k_j in zip(_DOPRI_B, k))
+                f_new = rhs(t + step, y_new)
+                error = step * sum(e * k_j for e, k_j in zip(_DOPRI_E, k + [f_new]))
+                scale = atol + rtol * np.maximum(np.abs(y), np.abs(y_new))
+                norm = np.sqrt(np.mean((error / scale) ** 2, axis=0))
+                failed |= ~np.isfinite(norm)
+                norm = np.where(failed, 0.0, norm)
+                worst = float(norm.max()) if norm.size else 0.0
+                factor = 10.0 if worst == 0 else min(10.0, max(0.2, 0.9 * worst ** -0.2))
+                if worst <= 1:
+                    t = target if step == target - t else t + step
+                    y, f = y_new, f_new
+                    y[..., failed], f[..., failed] = np.nan, np.nan
+                    h = step * factor
+                elif step < 1e-12 * max(1.0, abs(t)):
+                    failed |= norm > 1  # These sets cannot meet the tolerance
+                else:
+                    h = step * factor
+            out[i] = y
+    out[:, ..., failed] = np.nan
+    return out, failed
+
+
+class ODEExperiment(ExperimentLogic):
+    """
+    Base class for experiments defined by an ODE system ``dy/dt = f(t, y)``.
+
+    Subclasses list their state variables in `state_names`, set the parameters
+    `rhs` uses as attributes before calling ``super().__init__(config)``, and
+    implement `rhs` (and `initial_values`, if the initial state does not come
+    from ``initial_<state name>`` config keys).  `rhs` must accept a state
+    with extra trailing axes (``y`` of shape ``(n_state, k)``), which is how
+    scipy calls vectorized right-hand sides.
+
+    Every engine step advances the time by ``dt``.  The ``integrator`` config
+    key selects the scheme:
+
+    * ``euler`` (default): one explicit Euler update per step, in `run_step`.
+    * ``rk4``: fixed-step Runge-Kutta with ``substeps`` steps per engine step.
+    * ``RK45``, ``LSODA``, ... (scipy's `solve_ivp`): adaptive steps controlled
+      by ``rtol``, ``atol`` and ``max_step``; `advance` integrates a whole
+      span of steps in one call and samples the dense output on the grid.
+
+    Results are recorded on the output grid: every step (``time = step * dt``)
+    by default, or the times listed in ``output_times`` (adaptive and rk4
+    integrators only).  The grid is walked in chunks of `OUTPUT_CHUNK_ROWS`
+    rows and only the rows the recording policy keeps are sampled, so memory
+    follows the policy rather than the horizon.
+
+    `run_batch` integrates many runs that differ only in their `batch_keys`
+    (coefficients, initial values) as one ``(n_state, n_sets)`` system: each
+    instance attribute that differs between the runs becomes an array over
+    the sets, so `rhs` must broadcast its parameters against the last axis.
+    """
+
+    supports_resume = True
+    state_names: Tuple[str, ...] = ()
+    output_names: Optional[Tuple[str, ...]] = None  # Output name of each state (defaults to state_names)
+    state_units: Optional[str] = None
+    non_negative: bool = False  # Clip states at zero after each fixed step
+    jacobian: Optional[Callable[[float, np.ndarray], np.ndarray]] = None  # Used by the implicit scipy methods
+
+    def __init__(self, config: Dict[str, Any]):
+        self.n_steps = config['n_steps']
+        self.integrator = config.get('integrator', 'euler')
+        self.dt = float(config.get('dt', 1.0))
+        self.rtol = float(config.get('rtol', 1e-6))
+        self.atol = float(config.get('atol', 1e-9))
+        self.max_step = float(config.get('max_step', np.inf))
+        self.substeps = int(config.get('substeps', 1))
+        self.output_times = config.get('output_times')
+        if self.integrator not in INTEGRATORS:
+            raise ValueError(f"Unknown integrator: {self.integrator}. Must be one of {INTEGRATORS}.")
+        if self.dt <= 0 or self.substeps < 1:
+            raise ValueError("dt must be positive and substeps at least 1.")
+        if self.output_times is not None:
+            if self.integrator == 'euler':
+                raise ValueError("output_times needs the 'rk4' or an adaptive integrator.")
+            self.output_times = np.asarray(self.output_times, dtype=float)
+            if np.any(np.diff(self.output_times) <= 0) or self.output_times[0] < 0:
+                raise ValueError("output_times must be non-negative and increasing.")
+        self._initial_values = self.initial_values(config)
+
+        self.recorder = Recorder(self._columns(), n_steps=self._n_rows() - 1,
+                                 policy=RecordingPolicy.from_config(config), index="time")
+        if self._row_times(0) == 0:
+            self.recorder.record(0, time=self._time_value(0), **self._outputs(self._initial_values))
+
+    @classmethod
+    def is_prefix_consistent(cls, config: Dict[str, Any]) -> bool:
+        # Adaptive step sequences depend on the horizon, and output_times is not a step grid
+        return (cls.prefix_consistent and config.get('integrator', 'euler') in FIXED_STEP_INTEGRATORS
+                and config.get('output_times') is None)
+
+    # --- Model definition (overridden by subclasses) ---
+
+    @abstractmethod
+    def rhs(self, t: float, y: np.ndarray) -> np.ndarray:
+        """Right-hand side ``dy/dt``; `y` holds one state variable per row."""
+        pass
+
+    def initial_values(self, config: Dict[str, Any]) -> np.ndarray:
+        return np.array([config[f'initial_{name}'] for name in self.state_names], dtype=float)
+
+    def describe_output(self, name: str) -> DataDescriptor:
+        return DataDescriptor(name, DataType.NDARRAY, units=self.state_units, group="time_series",
+                              plot_type="line", x_axis="time", dtype="<f8")
+
+    # --- ExperimentLogic ---
+
+    def initialize(self, config):
+        return self._unpack(self._initial_values)
+
+    def run_step(self, state, step):
+        if self.integrator != 'euler':
+            return self.advance(state, step, step + 1)
+        y = self._pack(state)
+        y = y + self.dt * self.rhs(step * self.dt, y)
+        if self.non_negative:
+            y = np.maximum(y, 0)  # Prevent negative values
+        self.recorder.record(step + 1, time=self._time_value(step + 1), **self._outputs(y))
+        return self._unpack(y)
+
+    def advance(self, state, start, stop):
+        """Integrates from step `start` to `stop` in one call (Euler steps one by one)."""
+        if self.integrator == 'euler' or stop <= start:
+            return super().advance(state, start, stop)
+        t0, t1 = start * self.dt, stop * self.dt
+        y, t = self._pack(state), t0
+        solution = None if self.integrator == 'rk4' else self._solve_ivp(y, (t0, t1))
+        for rows in self._row_chunks(t0, t1):
+            times = self._row_times(rows)
+            keep = self.recorder.retained(rows)
+            if solution is None:  # rk4 steps through every row; only the kept ones are recorded
+                values = rk4_integrate(self.rhs, y, np.concatenate([[t], times]), self.substeps,
+                                       self.non_negative)
+                samples, y, t = values[1:][keep].T, values[-1], times[-1]
+            elif keep.any():
+                samples = solution.sol(times[keep])
+            if keep.any():
+                self.recorder.record_many(rows[keep], time=self._time_value(rows[keep]), **self._outputs(samples))
+        if solution is not None:
+            y = solution.y[:, -1]
+        elif t < t1:  # The span ends between output times
+            y = rk4_integrate(self.rhs, y, np.array([t, t1]), self.substeps, self.non_negative)[-1]
+        return self._unpack(y)
+
+    @classmethod
+    def run_batch(cls, configs: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Dict[str, Any]]], np.ndarray]:
+        """
+        Runs several configurations over their full horizon in one vectorized integration.
+
+        The configurations may differ only in `batch_keys`.  Euler and rk4 runs
+        take the same fixed steps as single runs; the explicit adaptive methods
+        use `dopri_integrate` with the configured tolerances; implicit methods
+        (LSODA, Radau, BDF) are solved run by run.
+
+        Returns:
+            The results of every run (as returned by `get_results`) and a boolean
+            mask of the runs whose integration failed (their outputs are NaN
+            from the failure on).
+        """
+        experiments = [cls(config) for config in configs]
+        first = experiments[0]
+        for experiment in experiments[1:]:
+            if (experiment.integrator != first.integrator or experiment.dt != first.dt
+                    or experiment._n_rows() != first._n_rows()
+                    or not np.array_equal(experiment.output_times, first.output_times)):
+                raise ValueError("The runs of a batch must share the integrator and the output grid.")
+        failed = np.zeros(len(experiments), dtype=bool)
+        if first.integrator in IMPLICIT_INTEGRATORS:
+            for i, experiment in enumerate(experiments):
+                try:
+                    experiment.advance(experiment.initialize({}), 0, experiment.n_steps)
+                except RuntimeError:
+                    failed[i] = True
+            return [experiment.get_results() for experiment in experiments], failed
+
+        batch = copy.copy(first)
+        for name, value in vars(first).items():
+            if isinstance(value, (int, float, np.number)) and not isinstance(value, bool):
+                values = np.array([vars(experiment)[name] for experiment in experiments])
+                if np.any(values != value):
+                    setattr(batch, name, values)  # Broadcasts over the sets in rhs
+        y, t = np.stack([experiment._initial_values for experiment in experiments], axis=-1), 0.0
+        for rows in first._row_chunks(0.0, first._row_times(first._n_rows() - 1)):
+            times = np.concatenate([[t], first._row_times(rows)])
+            with np.errstate(all="ignore"):
+                if first.integrator == 'euler':
+                    values = euler_integrate(batch.rhs, y, times, first.non_negative)
+                elif first.integrator == 'rk4':
+                    values = rk4_integrate(batch.rhs, y, times, first.substeps, first.non_negative)
+                else:
+                    values, chunk_failed = dopri_integrate(batch.rhs, y, times, first.rtol, first.atol,
+                                                           first.max_step)
+                    failed |= chunk_failed
+            failed |= ~np.isfinite(values).all(axis=(0, 1))
+            y, t = values[-1], times[-1]
+
+            keep = first.recorder.retained(rows)
+            for i, experiment in enumerate(experiments):
+                experiment.recorder.record_many(rows[keep], time=experiment._time_value(rows[keep]),
+                                                **experiment._outputs(values[1:][keep][:, :, i].T))
+        return [experiment.get_results() for experiment in experiments], failed
+
+    def extend_horizon(self, n_steps):
+        self.n_steps = n_steps
+        self.recorder.extend(self._n_rows() - 1)
+
+    def get_results(self):
+        return self.recorder.results()
+
+    # --- Helpers ---
+
+    def _solve_ivp(self, y0: np.ndarray, t_span: Tuple[float, float]):
+        from scipy.integrate import solve_ivp  # Only needed for the adaptive integrators
+        options = {"rtol": self.rtol, "atol": self.atol, "max_step": self.max_step}
+        if self.jacobian is not None and self.integrator in ("LSODA", "Radau", "BDF"):
+            options["jac"] = self.jacobian
+        solution = solve_ivp(self.rhs, t_span, y0, method=self.integrator, dense_output=True,
+                             vectorized=True, **options)
+        if not solution.success:
+            raise RuntimeError(f"ODE integration failed at t={solution.t[-1]}: {solution.message}")
+        return solution
+
+    def _n_rows(self) -> int:
+        """Number of rows of the output grid."""
+        return len(self.output_times) if self.output_times is not None else self.n_steps + 1
+
+    def _row_times(self, rows):
+        """Times of output grid rows (the step grid is computed, never materialized)."""
+        if self.output_times is not None:
+            return self.output_times[rows]
+        return rows * self.dt
+
+    def _rows_until(self, t: float) -> int:
+        """Number of output rows at or before time `t`."""
+        if self.output_times is not None:
+            return int(np.searchsorted(self.output_times, t, side='right'))
+        rows = min(max(int(np.floor(t / self.dt)) + 1, 0), self._n_rows())
+        if rows < self._n_rows() and rows * self.dt <= t:  # Correct the rounding of the division
+            rows += 1
+        elif rows > 0 and (rows - 1) * self.dt > t:
+            rows -= 1
+        return rows
+
+    def _row_chunks(self, t0: float, t1: float) -> Iterator[np.ndarray]:
+        """The output rows with ``t0 < time <= t1``, at most `OUTPUT_CHUNK_ROWS` at a time."""
+        start, stop = self._rows_until(t0), self._rows_until(t1)
+        for first in range(start, stop, OUTPUT_CHUNK_ROWS):
+            yield np.arange(first, min(first + OUTPUT_CHUNK_ROWS, stop))
+
+    def _time_value(self, row):
+        """Time of an output row: the step number itself when every step is an output and dt is 1."""
+        if self.output_times is None and self.dt == 1.0:
+            return row
+        return self._row_times(row)
+
+    def _columns(self) -> Dict[str, DataDescriptor]:
+        integer_time = self.output_times is None and self.dt == 1.0
+        columns = {"time": DataDescriptor("time", DataType.NDARRAY, units="steps" if integer_time else None,
+                                          group="time_series", dtype="<i8" if integer_time else "<f8")}
+        for name in self.output_names or self.state_names:
+            columns[name] = self.describe_output(name)
+        return columns
+
+    def _outputs(self, y: np.ndarray) -> Dict[str, Any]:
+        return dict(zip(self.output_names or self.state_names, y))
+
+    def _pack(self, state: Dict[str, Any]) -> np.ndarray:
+        return np.array([state[name] for name in self.state_names], dtype=float)
+
+    def _unpack(self, y: np.ndarray) -> Dict[str, Any]:
+        return {name: float(value) for name, value in zip(self.state_names, y)}
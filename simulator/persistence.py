@@ -1,23 +1,258 @@
 # simulator/persistence.py
 import os
 import json
-from .experiment_record import ExperimentRecord
+from .experiment_record import ExperimentRecord, _convert_to_serializable
 from .utils import DataDescriptor  # Import DataDescriptor
-from typing import Dict, Any
+from .blob_store import BlobStore, BLOB_DIR, BLOB_KEY, BLOB_MIN_NBYTES, GC_GRACE_SECONDS, is_blob_reference
+from .codecs import encode_array, decode_array
+from typing import Dict, Any, Optional, TextIO
 from datetime import datetime
+import logging
+import time
+import numpy as np
+import pandas as pd
 
-def save_experiment_record(record: ExperimentRecord, output_dir: str):
-    """Saves the ExperimentRecord to a JSON file."""
+logger = logging.getLogger(__name__)
+
+RECORD_FILE = "experiment_record.json"
+SIDECAR_DIR = "output_arrays"  # Binary sidecars of large array outputs, next to the record
+SIDECAR_KEY = "__ndarray__"  # {"__ndarray__": "<relative .npy path>"} stands for a sidecar array
+ENCODED_KEY = "__encoded__"  # {"__encoded__": {"path": ..., <codec meta>}} stands for a codec-encoded array
+STREAM_CHUNK_ITEMS = 65536  # Array elements / DataFrame rows converted to JSON at a time
+
+def save_experiment_record(record: ExperimentRecord, output_dir: str, streaming: bool = True,
+                           sidecar_min_nbytes: Optional[int] = None, deduplicate: Optional[bool] = None):
+    """
+    Saves the ExperimentRecord to a JSON file.
+
+    Args:
+        record: The record to save.
+        output_dir: Base output directory (the record gets its own subdirectory).
+        streaming: Write the record incrementally with `write_experiment_record`
+                   (compact JSON, arrays converted chunk by chunk) instead of
+                   building the whole `to_dict()` tree and indenting it.
+        sidecar_min_nbytes: Streaming only: numeric arrays of at least this many
+                            bytes are written as .npy sidecars instead of JSON lists.
+        deduplicate: Streaming only: store array and DataFrame outputs in the
+                     content-addressed `BlobStore` of `output_dir` (written once,
+                     compressed, referenced by digest).  Defaults to the
+                     record's `deduplicate_outputs` config key.
+    """
     timestamp = record.start_time.strftime("%Y-%m-%d_%H-%M-%S")
     experiment_dir = os.path.join(output_dir, f"{timestamp}_{record.experiment_id}")
     os.makedirs(experiment_dir, exist_ok=True)
-    record_path = os.path.join(experiment_dir, "experiment_record.json")
-    with open(record_path, "w") as f:
-        json.dump(record.to_dict(), f, indent=4)
+    record_path = os.path.join(experiment_dir, RECORD_FILE)
+    if not streaming:
+        with open(record_path, "w") as f:
+            json.dump(record.to_dict(), f, indent=4)
+        return experiment_dir # Return the full path
+
+    if deduplicate is None:
+        deduplicate = bool(record.config.get("deduplicate_outputs", False))
+    blob_store = BlobStore(os.path.join(output_dir, BLOB_DIR)) if deduplicate else None
+
+    temp_path = record_path + ".tmp"  # Never leave a half-written record behind
+    with open(temp_path, "w") as f:
+        write_experiment_record(record, f, experiment_dir, sidecar_min_nbytes, blob_store)
+    os.replace(temp_path, record_path)
     return experiment_dir # Return the full path
 
-def load_experiment_record(output_dir: str, experiment_id: str) -> ExperimentRecord:
-    """Loads an experiment record from disk."""
+def write_experiment_record(record: ExperimentRecord, f: TextIO, experiment_dir: Optional[str] = None,
+                            sidecar_min_nbytes: Optional[int] = None,
+                            blob_store: Optional[BlobStore] = None) -> None:
+    """
+    Streams a record as JSON to an open text file.
+
+    Only one chunk of an output is converted to Python objects at a time, so
+    the peak memory of saving stays close to the size of the results.  The
+    output matches `json.dump(record.to_dict(), f)`, except for arrays written
+    as sidecars (which requires `experiment_dir`) and outputs put in
+    `blob_store` (referenced by the experiment directory's name).
+
+    NDARRAY outputs whose descriptor names a `codec` are encoded into binary
+    sidecars (requires `experiment_dir`); the compression ratio and
+    encode/decode throughput of each are added to `record.performance['codecs']`.
+    """
+    encoded = _encode_outputs(record, experiment_dir) if experiment_dir is not None else {}
+    f.write("{")
+    for i, (key, value) in enumerate(record.to_dict(include_output_data=False).items()):
+        f.write(", " if i else "")
+        f.write(json.dumps(key) + ": ")
+        if key == "output_data":
+            _write_output_data(record.output_data, f, experiment_dir, sidecar_min_nbytes, blob_store, encoded)
+        else:
+            f.write(json.dumps(value, default=_json_default))
+    f.write("}")
+
+def _write_output_data(output_data: Dict[str, Dict[str, Any]], f: TextIO, experiment_dir: Optional[str],
+                       sidecar_min_nbytes: Optional[int], blob_store: Optional[BlobStore] = None,
+                       encoded: Optional[Dict[str, Dict[str, Any]]] = None) -> None:
+    f.write("{")
+    for i, (name, data_info) in enumerate(output_data.items()):
+        f.write(", " if i else "")
+        f.write(json.dumps(name) + ': {"data": ')
+        data = data_info["data"]
+        mapped_path = _mapped_npy_path(data, experiment_dir) if experiment_dir is not None else None
+        if encoded and name in encoded:
+            f.write(json.dumps({ENCODED_KEY: encoded[name]}, default=_json_default))
+        elif mapped_path is not None:
+            f.write(json.dumps({SIDECAR_KEY: mapped_path}))  # Already on disk (spilled by the recorder)
+        elif (isinstance(data, np.ndarray) and experiment_dir is not None and sidecar_min_nbytes is not None
+                and data.dtype.kind in "biufcmM" and data.nbytes >= sidecar_min_nbytes):
+            f.write(json.dumps({SIDECAR_KEY: _write_sidecar(data, name, experiment_dir)}))
+        elif blob_store is not None and _blob_eligible(data):
+            owner = os.path.basename(os.path.normpath(experiment_dir)) if experiment_dir else None
+            f.write(json.dumps({BLOB_KEY: blob_store.put(data, owner)}))
+        else:
+            _write_value(data, f)
+        f.write(', "descriptor": ' + json.dumps(data_info["descriptor"].to_dict(), default=_json_default) + "}")
+    f.write("}")
+
+def _write_value(data: Any, f: TextIO) -> None:
+    """Writes arrays and DataFrames in chunks; anything else in one piece."""
+    if isinstance(data, np.ndarray) and data.ndim > 0:
+        rows = max(1, STREAM_CHUNK_ITEMS // max(1, data[0].size if len(data) else 1))
+        f.write("[")
+        for start in range(0, len(data), rows):
+            f.write(", " if start else "")
+            f.write(json.dumps(data[start:start + rows].tolist(), default=_json_default)[1:-1])
+        f.write("]")
+    elif isinstance(data, pd.DataFrame):
+        f.write("[")
+        for start in range(0, len(data), STREAM_CHUNK_ITEMS):
+            f.write(", " if start else "")
+            chunk = data.iloc[start:start + STREAM_CHUNK_ITEMS].to_dict(orient='records')
+            f.write(json.dumps(chunk, default=_json_default)[1:-1])
+        f.write("]")
+    else:
+        f.write(json.dumps(_convert_to_serializable(data), default=_json_default))
+
+def _encode_outputs(record: ExperimentRecord, experiment_dir: str) -> Dict[str, Dict[str, Any]]:
+    """Writes the codec sidecars of a record; returns the reference of each encoded output."""
+    encoded, stats = {}, {}
+    for name, data_info in record.output_data.items():
+        data, codec = data_info["data"], getattr(data_info["descriptor"], "codec", None)
+        if codec is None or not isinstance(data, np.ndarray):
+            continue
+        try:
+            start = time.perf_counter()
+            payload, meta = encode_array(data, codec)
+            encode_seconds = time.perf_counter() - start
+            start = time.perf_counter()
+            decoded = decode_array(payload, meta)  # Also verifies the round trip
+            decode_seconds = time.perf_counter() - start
+        except (TypeError, ValueError) as e:
+            logger.warning(f"Output '{name}' is stored without codec {codec}: {e}")
+            stats[name] = {"codec": codec, "error": str(e)}
+            continue
+        max_error = float(np.max(np.abs(decoded - data))) if data.size and data.dtype.kind == "f" else 0.0
+
+        os.makedirs(os.path.join(experiment_dir, SIDECAR_DIR), exist_ok=True)
+        relative_path = os.path.join(SIDECAR_DIR, f"{name.replace(os.sep, '_')}.bin")
+        with open(os.path.join(experiment_dir, relative_path), "wb") as f:
+            f.write(payload)
+        encoded[name] = dict(meta, path=relative_path)
+        stats[name] = {
+            "codec": codec,
+            "raw_bytes": int(data.nbytes),
+            "encoded_bytes": len(payload),
+            "ratio": data.nbytes / max(len(payload), 1),
+            "encode_mb_per_s": data.nbytes / 1e6 / max(encode_seconds, 1e-9),
+            "decode_mb_per_s": data.nbytes / 1e6 / max(decode_seconds, 1e-9),
+            "max_abs_error": max_error,
+        }
+    if stats:
+        record.add_performance_info("codecs", stats)
+    return encoded
+
+def _blob_eligible(data: Any) -> bool:
+    if isinstance(data, np.ndarray):
+        return data.nbytes >= BLOB_MIN_NBYTES
+    if isinstance(data, pd.DataFrame):
+        return int(data.memory_usage(index=False).sum()) >= BLOB_MIN_NBYTES
+    return False
+
+def _write_sidecar(data: np.ndarray, name: str, experiment_dir: str) -> str:
+    os.makedirs(os.path.join(experiment_dir, SIDECAR_DIR), exist_ok=True)
+    relative_path = os.path.join(SIDECAR_DIR, f"{name.replace(os.sep, '_')}.npy")
+    np.save(os.path.join(experiment_dir, relative_path), data)
+    return relative_path
+
+def _mapped_npy_path(data: Any, experiment_dir: str) -> Optional[str]:
+    """
+    Path (relative to `experiment_dir`) of the ``.npy`` file that `data` maps in full, if any.
+
+    Outputs spilled to disk by the recorder are memory-mapped ``.npy`` files in
+    the experiment directory; they are referenced as sidecars instead of being
+    read and written again.
+    """
+    if not isinstance(data, np.memmap) or not data.filename or not data.flags.c_contiguous:
+        return None
+    path = os.path.abspath(data.filename)
+    root = os.path.abspath(experiment_dir)
+    if not path.endswith(".npy") or os.path.commonpath([path, root]) != root:
+        return None
+    if data.mode != "r":
+        data.flush()
+    try:
+        with open(path, "rb") as f:
+            version = np.lib.format.read_magic(f)
+            read_header = (np.lib.format.read_array_header_1_0 if version == (1, 0)
+                           else np.lib.format.read_array_header_2_0)
+            shape, fortran_order, dtype = read_header(f)
+    except (OSError, ValueError):
+        return None
+    if (fortran_order or tuple(shape) != data.shape or dtype != data.dtype
+            or data.offset + data.nbytes != os.path.getsize(path)):
+        return None  # A view of part of the file, or not the file's array
+    return os.path.relpath(path, root)
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, (datetime, pd.Timestamp)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def _load_output_value(value: Any, experiment_dir: str, mmap_mode: Optional[str] = None) -> Any:
+    if isinstance(value, dict) and set(value) == {SIDECAR_KEY}:
+        return np.load(os.path.join(experiment_dir, value[SIDECAR_KEY]), mmap_mode=mmap_mode)
+    if isinstance(value, dict) and set(value) == {ENCODED_KEY}:
+        meta = value[ENCODED_KEY]
+        with open(os.path.join(experiment_dir, meta["path"]), "rb") as f:
+            return decode_array(f.read(), meta)
+    if is_blob_reference(value):
+        output_dir = os.path.dirname(os.path.normpath(experiment_dir))
+        return BlobStore(os.path.join(output_dir, BLOB_DIR)).get(value[BLOB_KEY])
+    return value
+
+def collect_output_garbage(output_dir: str, grace_seconds: float = GC_GRACE_SECONDS) -> Dict[str, int]:
+    """
+    Frees the deduplicated outputs of runs whose directories were deleted.
+
+    References held by experiment directories that no longer exist in
+    `output_dir` are dropped, then every unreferenced blob older than
+    `grace_seconds` is deleted (see `BlobStore.collect_garbage`).
+    """
+    blob_root = os.path.join(output_dir, BLOB_DIR)
+    if not os.path.isdir(blob_root):
+        return {"released_refs": 0, "deleted_blobs": 0, "freed_bytes": 0}
+    live_owners = [item for item in os.listdir(output_dir)
+                   if item != BLOB_DIR and os.path.isdir(os.path.join(output_dir, item))]
+    return BlobStore(blob_root).collect_garbage(live_owners=live_owners, grace_seconds=grace_seconds)
+
+def load_experiment_record(output_dir: str, experiment_id: str, mmap_mode: Optional[str] = None) -> ExperimentRecord:
+    """
+    Loads an experiment record from disk.
+
+    Args:
+        output_dir: Base output directory.
+        experiment_id: ID of the experiment (matched against directory names).
+        mmap_mode: If set (e.g. 'r'), ``.npy`` sidecar outputs are memory-mapped
+                   instead of read into memory.
+    """
     experiment_dir = None
     for item in os.listdir(output_dir):
         item_path = os.path.join(output_dir, item)
@@ -26,7 +261,7 @@ def load_experiment_record(output_dir: str, experiment_id: str) -> ExperimentRec
             break
     if experiment_dir is None:
         raise FileNotFoundError(f"Experiment directory with ID '{experiment_id}' not found in '{output_dir}'.")
-    record_path = os.path.join(experiment_dir, "experiment_record.json")
+    record_path = os.path.join(experiment_dir, RECORD_FILE)
 
     with open(record_path, "r") as f:
         data = json.load(f)
@@ -38,7 +273,7 @@ def load_experiment_record(output_dir: str, experiment_id: str) -> ExperimentRec
     }
     output_data = {
         name: {
-            "data": data_info["data"],
+            "data": _load_output_value(data_info["data"], experiment_dir, mmap_mode),  # Sidecar arrays are read back as ndarrays
             "descriptor": DataDescriptor(**data_info["descriptor"])
         } for name, data_info in data["output_data"].items()
     }
@@ -57,4 +292,6 @@ def load_experiment_record(output_dir: str, experiment_id: str) -> ExperimentRec
     record.system_info = data['system_info']
     record.software_versions = data['software_versions']
     record.llm_usage = data['llm_usage']
-    return record
\ No newline at end of file
+    record.provenance = data.get('provenance', {})  # Absent in older records
+    record.performance = data.get('performance', {})
+    return record
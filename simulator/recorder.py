@@ -0,0 +1,450 @@
+# simulator/recorder.py
+import copy
+import logging
+import os
+import shutil
+import tempfile
+import time
+import weakref
+from typing import Dict, Any, Optional, Tuple, Union
+
+import numpy as np
+
+from .utils import DataDescriptor, DataType
+
+logger = logging.getLogger(__name__)
+
+RECORDING_MODES = ("all", "every", "last", "summary", "interval")
+SUMMARY_STATISTICS = ("mean", "std", "min", "max", "final")
+SPILL_COPY_BYTES = 64 * 1024 ** 2  # Columns are copied between storages this much at a time
+
+
+class RecordingPolicy:
+    """
+    Decides which steps of a run are kept.
+
+    Set through the ``recording`` config key, either as a mode name or as a
+    dictionary with options:
+
+    * ``all`` (default): every step.
+    * ``{'mode': 'every', 'k': 100}``: steps divisible by ``k`` (and the final step).
+    * ``{'mode': 'last', 'n': 1000}``: a ring buffer of the last ``n`` recorded steps.
+    * ``summary``: no series at all, only running statistics
+      (mean, std, min, max, final value) of every column.
+    * ``{'mode': 'interval', 'seconds': 1.0}``: at most one step per interval of
+      wall-clock time (plus the first and the final step).
+
+    Memory is bounded by the policy (``n_steps / k``, ``n`` or a constant),
+    not by the horizon.  For series that may still not fit in RAM, a
+    ``memory_budget`` (bytes) moves the columns to memory-mapped ``.npy``
+    files in ``spill_dir`` once they would exceed it, e.g.
+    ``{'mode': 'all', 'memory_budget': 2 * 1024 ** 3}``.  The engine sets
+    ``spill_dir`` to the run's ``output_arrays`` directory, so the files are
+    also the persisted outputs.
+    """
+
+    def __init__(self, mode: str = "all", k: int = 1, n: Optional[int] = None,
+                 seconds: Optional[float] = None, memory_budget: Optional[int] = None,
+                 spill_dir: Optional[str] = None):
+        if mode not in RECORDING_MODES:
+            raise ValueError(f"Unknown recording mode: {mode}. Must be one of {RECORDING_MODES}.")
+        if mode == "every" and (not isinstance(k, (int, np.integer)) or k < 1):
+            raise ValueError("The 'every' recording mode needs a positive integer 'k'.")
+        if mode == "last" and (n is None or n < 1):
+            raise ValueError("The 'last' recording mode needs a positive integer 'n'.")
+        if mode == "interval" and (seconds is None or seconds <= 0):
+            raise ValueError("The 'interval' recording mode needs a positive 'seconds'.")
+        if memory_budget is not None and memory_budget < 0:
+            raise ValueError("memory_budget must be a non-negative number of bytes.")
+        self.mode = mode
+        self.k = int(k)
+        self.n = n
+        self.seconds = seconds
+        self.memory_budget = memory_budget
+        self.spill_dir = spill_dir
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "RecordingPolicy":
+        spec = config.get("recording") or "all"
+        if isinstance(spec, RecordingPolicy):
+            return spec
+        if isinstance(spec, str):
+            return cls(spec)
+        if isinstance(spec, dict):
+            options = dict(spec)
+            return cls(options.pop("mode", "all"), **options)
+        raise TypeError(f"Invalid recording config: {spec!r}")
+
+    @property
+    def keeps_every_step(self) -> bool:
+        """Whether the recorded series hold every step (so they can be sliced by step)."""
+        return self.mode == "all" or (self.mode == "every" and self.k == 1)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"mode": self.mode, "k": self.k, "n": self.n, "seconds": self.seconds,
+                "memory_budget": self.memory_budget, "spill_dir": self.spill_dir}
+
+
+def records_every_step(config: Dict[str, Any]) -> bool:
+    """Whether runs with this config record a full series (the default)."""
+    return RecordingPolicy.from_config(config).keeps_every_step
+
+
+class Recorder:
+    """
+    Shared recording API for step outputs.
+
+    An experiment declares its recorded columns once (name -> DataDescriptor),
+    calls `record` for every step, and returns `results()` from `get_results`.
+    Which steps are kept is decided by the `RecordingPolicy` of the run's
+    config.  Values go straight into typed NumPy columns preallocated for the
+    horizon (no per-step Python objects), and `results()` hands out views of
+    them (copies of the ring buffer in 'last' mode) with descriptors carrying
+    the actual shape and dtype.  Over the
+    policy's `memory_budget`, the columns are spilled to memory-mapped files
+    and `results()` returns ``np.memmap`` outputs backed by them.
+
+    Example:
+        self.recorder = Recorder.from_config(config, {
+            "time": DataDescriptor("time", DataType.NDARRAY, units="steps", group="time_series"),
+            "value": DataDescriptor("value", DataType.NDARRAY, group="time_series", x_axis="time"),
+        }, index="time")
+        self.recorder.record(0, time=0, value=initial_value)
+    """
+
+    def __init__(self, columns: Dict[str, DataDescriptor], n_steps: Optional[int] = None,
+                 policy: Optional[RecordingPolicy] = None, index: Optional[str] = None):
+        """
+        Args:
+            columns: Descriptor of every recorded column, by output name.  A
+                     descriptor's `dtype` fixes the column's dtype; otherwise it is
+                     taken from the first value (and widened if, e.g., an integer
+                     column later receives floats).
+            n_steps: The run's horizon, if known (the final step is always kept).
+                     Columns are preallocated for it; without it they grow geometrically.
+            policy: Which steps to keep (all of them if None).
+            index: Name of the column holding the step/time axis; it is not
+                   summarized in 'summary' mode.
+        """
+        self.columns = columns
+        self.n_steps = n_steps
+        self.policy = policy or RecordingPolicy()
+        self.index = index
+        self.n_recorded = 0  # Number of steps kept (all of them for 'last', before wrapping)
+        self._last_record_time: Optional[float] = None
+        self._data: Dict[str, np.ndarray] = {}  # Preallocated columns, allocated on the first record
+        self._spill_dir: Optional[str] = None  # Set once the columns are memory-mapped files
+        if self.policy.mode == "summary":
+            self._stats = {name: _RunningStats() for name in columns if name != index}
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any], columns: Dict[str, DataDescriptor],
+                    index: Optional[str] = None) -> "Recorder":
+        """Creates a recorder for a run: horizon from `n_steps`, policy from `recording`."""
+        return cls(columns, n_steps=config.get("n_steps"), policy=RecordingPolicy.from_config(config),
+                   index=index)
+
+    def extend(self, n_steps: int) -> None:
+        """Moves the final step of the run (e.g. when a run is resumed to a longer horizon)."""
+        self.n_steps = n_steps
+        if self._data and self.policy.mode != "last":
+            self._reserve(self._expected_rows())
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the recorded columns (allocated capacity, not counting spilled files)."""
+        return 0 if self.spilled else sum(column.nbytes for column in self._data.values())
+
+    @property
+    def spilled(self) -> bool:
+        """Whether the columns have been moved to memory-mapped files."""
+        return self._spill_dir is not None
+
+    def should_record(self, step: int) -> bool:
+        policy = self.policy
+        final = self.n_steps is not None and step >= self.n_steps
+        if policy.mode == "every":
+            return step % policy.k == 0 or final
+        if policy.mode == "interval":
+            now = time.monotonic()
+            if self._last_record_time is None or final or now - self._last_record_time >= policy.seconds:
+                self._last_record_time = now
+                return True
+            return False
+        return True
+
+    def record(self, step: int, /, **values: Any) -> None:
+        """Records the values of one step (one keyword per column) if the policy keeps it."""
+        if self.policy.mode == "summary":
+            for name, stats in self._stats.items():
+                stats.update(values[name])
+            self.n_recorded += 1
+            return
+        if not self.should_record(step):
+            return
+        if not self._data:
+            self._allocate(values)
+        if self.policy.mode == "last":
+            row = self.n_recorded % self.policy.n
+        else:
+            row = self.n_recorded
+            if row == len(next(iter(self._data.values()))):
+                self._reserve(2 * row)  # Horizon unknown or exceeded: grow geometrically
+        for name, column in list(self._data.items()):
+            value = values[name]
+            if column.dtype.kind in "biu" and not isinstance(value, (int, np.integer)):
+                column = self._widen(name, value)
+            column[row] = value
+        self.n_recorded += 1
+
+    def retained(self, steps: np.ndarray) -> np.ndarray:
+        """
+        Mask of the steps of a block that `record_many` keeps.
+
+        Lets callers compute only the outputs that will be kept.  Every step is
+        retained in 'summary' and 'interval' modes, which look at each of them.
+        """
+        steps = np.asarray(steps)
+        keep = np.ones(len(steps), dtype=bool)
+        if self.policy.mode == "every":
+            keep = steps % self.policy.k == 0
+            if self.n_steps is not None:
+                keep |= steps >= self.n_steps
+        elif self.policy.mode == "last":
+            keep[:-self.policy.n] = False
+        return keep
+
+    def record_many(self, steps: np.ndarray, /, **values: np.ndarray) -> None:
+        """
+        Records a block of consecutive output steps at once.
+
+        Args:
+            steps: Increasing step numbers, one per row.
+            **values: One array per column, with one row per step.
+        """
+        steps = np.asarray(steps)
+        if not len(steps):
+            return
+        mode = self.policy.mode
+        if mode == "summary":
+            for name, stats in self._stats.items():
+                stats.update_many(values[name])
+            self.n_recorded += len(steps)
+            return
+        if mode == "interval":  # Wall-clock intervals only make sense step by step
+            for i, step in enumerate(steps):
+                self.record(step, **{name: value[i] for name, value in values.items()})
+            return
+        keep = self.retained(steps)
+        rows = {name: np.asarray(values[name])[keep] for name in self.columns}
+        count = int(keep.sum())
+        if not count:
+            return
+        if not self._data:
+            self._allocate({name: value[0] for name, value in rows.items()})
+        if mode == "last":
+            index = (self.n_recorded + np.arange(count)) % self.policy.n
+        else:
+            capacity = len(next(iter(self._data.values())))
+            if self.n_recorded + count > capacity:
+                self._reserve(max(self.n_recorded + count, 2 * capacity))
+            index = slice(self.n_recorded, self.n_recorded + count)
+        for name, value in rows.items():
+            column = self._data[name]
+            if column.dtype.kind in "biu" and value.dtype.kind not in "biu":
+                column = self._widen(name, value)
+            column[index] = value
+        self.n_recorded += count
+
+    def spill_path(self, name: str) -> Optional[str]:
+        """The memory-mapped file of a column, if the columns have been spilled."""
+        if not self.spilled:
+            return None
+        return os.path.join(self._spill_dir, f"{name.replace(os.sep, '_')}.npy")
+
+    def column(self, name: str) -> np.ndarray:
+        """
+        The recorded series of a column, in step order.
+
+        A view of the preallocated storage, except in 'last' mode: the ring
+        buffer is overwritten by later steps, so a copy is returned there.
+        """
+        if self.policy.mode == "summary":
+            raise ValueError("No series are kept in 'summary' recording mode; use summary().")
+        if name not in self.columns:
+            raise KeyError(name)
+        if not self._data:
+            return np.array([])
+        column = self._data[name]
+        if self.policy.mode == "last" and self.n_recorded > self.policy.n:
+            start = self.n_recorded % self.policy.n  # Oldest entry of the ring buffer
+            return np.concatenate([column[start:], column[:start]])
+        if self.policy.mode == "last":
+            return column[:self.n_recorded].copy()
+        return column[:min(self.n_recorded, len(column))]
+
+    def _expected_rows(self) -> int:
+        policy = self.policy
+        if policy.mode == "last":
+            return policy.n
+        if self.n_steps is None or policy.mode == "interval":
+            return max(self.n_recorded, 1024)
+        if policy.mode == "every":
+            return self.n_steps // policy.k + 2  # Multiples of k, plus the final step
+        return self.n_steps + 1  # Step 0 through n_steps
+
+    def _allocate(self, values: Dict[str, Any]) -> None:
+        rows = self._expected_rows()
+        for name, descriptor in self.columns.items():
+            value = np.asarray(values[name])
+            dtype = np.dtype(descriptor.dtype) if getattr(descriptor, "dtype", None) else value.dtype
+            self._data[name] = np.empty((rows,) + value.shape, dtype=dtype)  # Pages are committed on write
+        self._check_budget()
+
+    def _reserve(self, rows: int) -> None:
+        for name, column in list(self._data.items()):
+            if rows > len(column):
+                self._replace_column(name, (rows,) + column.shape[1:], column.dtype)
+        self._check_budget()
+
+    def _widen(self, name: str, value: Any) -> np.ndarray:
+        column = self._data[name]
+        dtype = np.result_type(column.dtype, np.asarray(value).dtype)
+        if dtype != column.dtype:
+            self._replace_column(name, column.shape, dtype)
+        return self._data[name]
+
+    def _check_budget(self) -> None:
+        budget = self.policy.memory_budget
+        if budget is None or self.spilled or self.policy.mode == "last" or self.nbytes <= budget:
+            return  # The ring buffer of 'last' is bounded by the policy already
+        spill_dir = self.policy.spill_dir
+        if spill_dir is None:
+            spill_dir = tempfile.mkdtemp(prefix="recorder_")
+            # Mapped files stay readable after removal (POSIX), so arrays handed out keep working.
+            weakref.finalize(self, shutil.rmtree, spill_dir, ignore_errors=True)
+        os.makedirs(spill_dir, exist_ok=True)
+        logger.info(f"Recorded columns exceed the memory budget ({self.nbytes} > {budget} bytes); "
+                    f"spilling them to {spill_dir}")
+        self._spill_dir = spill_dir
+        for name, column in list(self._data.items()):
+            self._replace_column(name, column.shape, column.dtype)
+
+    def _replace_column(self, name: str, shape: Tuple[int, ...], dtype: np.dtype) -> None:
+        """Moves a column to new storage (in memory, or a file once spilled), keeping the recorded rows."""
+        old = self._data[name]
+        path = self.spill_path(name)
+        if path is None:
+            new = np.empty(shape, dtype=dtype)
+        else:
+            new = np.lib.format.open_memmap(path + ".tmp", mode="w+", dtype=dtype, shape=shape)
+        rows = min(self.n_recorded, len(old))
+        chunk = max(1, SPILL_COPY_BYTES // max(1, old[:1].nbytes))
+        for start in range(0, rows, chunk):
+            stop = min(start + chunk, rows)
+            new[start:stop] = old[start:stop]
+        if path is not None:
+            new.flush()
+            del new, old
+            os.replace(path + ".tmp", path)
+            new = np.load(path, mmap_mode="r+")
+        self._data[name] = new
+
+    def _trim_spilled(self) -> None:
+        """Shrinks the spilled files to the recorded rows, so they are complete ``.npy`` outputs."""
+        if not self.spilled or self.policy.mode == "last":
+            return
+        for name, column in list(self._data.items()):
+            if len(column) != self.n_recorded:
+                column.flush()
+                del self._data[name], column
+                path = self.spill_path(name)
+                _truncate_npy(path, self.n_recorded)
+                self._data[name] = np.load(path, mmap_mode="r+")
+
+    def summary(self, name: str) -> Dict[str, float]:
+        """Running statistics of a column (only in 'summary' mode)."""
+        if self.policy.mode != "summary":
+            raise ValueError("Statistics are only kept in 'summary' recording mode.")
+        return self._stats[name].to_dict()
+
+    def results(self) -> Dict[str, Dict[str, Any]]:
+        """Results entries (``{'data', 'descriptor'}``) of all recorded columns."""
+        results = {}
+        if self.policy.mode == "summary":
+            for name, stats in self._stats.items():
+                descriptor = self.columns[name]
+                for statistic, value in stats.to_dict().items():
+                    output = f"{name}_{statistic}"
+                    results[output] = {
+                        "data": value,
+                        "descriptor": DataDescriptor(output, DataType.FLOAT, units=descriptor.units,
+                                                     group="summary"),
+                    }
+            return results
+        self._trim_spilled()
+        for name, descriptor in self.columns.items():
+            data = self.column(name)
+            descriptor = copy.copy(descriptor)
+            descriptor.shape = data.shape
+            descriptor.dtype = data.dtype.str
+            results[name] = {"data": data, "descriptor": descriptor}
+        return results
+
+
+def _truncate_npy(path: str, rows: int) -> None:
+    """Cuts an ``.npy`` file down to its first `rows` rows, rewriting the header in place."""
+    with open(path, "r+b") as f:
+        version = np.lib.format.read_magic(f)
+        read_header = np.lib.format.read_array_header_1_0 if version == (1, 0) else np.lib.format.read_array_header_2_0
+        shape, fortran_order, dtype = read_header(f)
+        offset = f.tell()
+        shape = (rows,) + tuple(shape[1:])
+        header = repr({"descr": np.lib.format.dtype_to_descr(dtype), "fortran_order": fortran_order, "shape": shape})
+        length_size = 2 if version == (1, 0) else 4
+        header_size = offset - 8 - length_size  # Magic and version, then the header length
+        f.seek(8 + length_size)
+        f.write(header.ljust(header_size - 1).encode("latin1") + b"\n")  # Same size: the data does not move
+        f.truncate(offset + int(np.prod(shape)) * dtype.itemsize)
+
+
+class _RunningStats:
+    """Count, mean, variance (Welford), min, max and final value of a stream."""
+
+    def __init__(self):
+        self.count, self.mean, self.m2 = 0, 0.0, 0.0
+        self.min, self.max, self.final = np.inf, -np.inf, np.nan
+
+    def update(self, value: Union[float, np.ndarray]) -> None:
+        value = float(value)
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        self.final = value
+
+    def update_many(self, values: np.ndarray) -> None:
+        """Merges a block of values (Chan et al.'s parallel update)."""
+        values = np.asarray(values, dtype=float).ravel()
+        if not values.size:
+            return
+        count = self.count + values.size
+        mean = values.mean()
+        delta = mean - self.mean
+        self.m2 += ((values - mean) ** 2).sum() + delta ** 2 * self.count * values.size / count
+        self.mean += delta * values.size / count
+        self.count = count
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        self.final = float(values[-1])
+
+    def to_dict(self) -> Dict[str, float]:
+        return {
+            "mean": self.mean if self.count else np.nan,
+            "std": float(np.sqrt(self.m2 / (self.count - 1))) if self.count > 1 else np.nan,
+            "min": self.min if self.count else np.nan,
+            "max": self.max if self.count else np.nan,
+            "final": self.final,
+        }
@@ -0,0 +1,143 @@
+# simulator/result_channel.py
+import os
+import tempfile
+import uuid
+import weakref
+from typing import Dict, Any, Optional, Tuple
+
+import numpy as np
+
+RESULT_TRANSPORTS = ("pickle", "shm", "memmap")
+MIN_SHARED_NBYTES = 64 * 1024  # Smaller arrays are cheaper to pickle than to map
+
+
+class SharedArray:
+    """
+    Picklable handle to an array output written to shared memory by a worker.
+
+    Workers replace the array data of their results with these handles
+    (`export_results`); the parent turns them back into ``np.ndarray`` views
+    (`import_results`) and takes ownership of the underlying segment or file,
+    so only the handle (a few bytes) travels through the pipe.
+    """
+
+    def __init__(self, name: str, backend: str, dtype: str, shape: Tuple[int, ...], keep: bool = False):
+        self.name = name  # Shared memory segment name, or .npy file path
+        self.backend = backend  # 'shm' or 'memmap'
+        self.dtype = dtype
+        self.shape = shape
+        self.keep = keep  # Keep the .npy file after importing (memmap backend only)
+
+
+def export_results(results: Dict[str, Dict[str, Any]], backend: str = "shm",
+                   directory: Optional[str] = None,
+                   min_nbytes: Optional[int] = None) -> Dict[str, Dict[str, Any]]:
+    """
+    Moves the array outputs of a results dictionary out of band (worker side).
+
+    Args:
+        results: The results dictionary, as returned by get_results().
+        backend: 'shm' (`multiprocessing.shared_memory`), 'memmap' (``.npy``
+                 files) or 'pickle' (return the results unchanged).
+        directory: Only used with 'memmap': where to write the files.  Files in a
+                   given directory are kept (and the imported arrays stay backed by
+                   them); if None, temporary files are used and removed on import.
+        min_nbytes: Arrays smaller than this are left in the results and pickled
+                    (default `MIN_SHARED_NBYTES`).
+
+    Returns:
+        A shallow copy of `results` in which every large numeric ndarray is
+        replaced by a `SharedArray` handle.
+    """
+    if backend not in RESULT_TRANSPORTS:
+        raise ValueError(f"Unsupported result transport: {backend}. Must be one of {RESULT_TRANSPORTS}.")
+    if backend == "pickle":
+        return results
+
+    if min_nbytes is None:
+        min_nbytes = MIN_SHARED_NBYTES
+    exported = {}
+    for name, data_info in results.items():
+        data = data_info.get("data") if isinstance(data_info, dict) else None
+        if (isinstance(data, np.ndarray) and data.dtype.kind in "biufcmM"
+                and data.nbytes >= max(min_nbytes, 1)):
+            data_info = dict(data_info)
+            data_info["data"] = _export_array(data, backend, directory)
+        exported[name] = data_info
+    return exported
+
+
+def import_results(results: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """
+    Rebuilds the arrays of an exported results dictionary without copying (parent side).
+
+    The shared segments are unlinked (temporary files removed) as soon as they
+    are mapped, so nothing is left behind if the parent exits early; the memory
+    itself is freed once the last view of an array is garbage-collected.
+    """
+    imported = {}
+    for name, data_info in results.items():
+        if isinstance(data_info, dict) and isinstance(data_info.get("data"), SharedArray):
+            data_info = dict(data_info)
+            data_info["data"] = _import_array(data_info["data"])
+        imported[name] = data_info
+    return imported
+
+
+def _export_array(data: np.ndarray, backend: str, directory: Optional[str]) -> SharedArray:
+    if backend == "shm":
+        segment = _create_unowned_segment(data.nbytes)
+        try:
+            np.ndarray(data.shape, dtype=data.dtype, buffer=segment.buf)[...] = data
+        finally:
+            segment.close()  # The segment lives on until the parent unlinks it
+        return SharedArray(segment.name, backend, data.dtype.str, data.shape)
+
+    keep = directory is not None
+    if directory is None:
+        directory = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"result_{uuid.uuid4().hex}.npy")
+    target = np.lib.format.open_memmap(path, mode="w+", dtype=data.dtype, shape=data.shape)
+    target[...] = data
+    target.flush()
+    del target
+    return SharedArray(path, backend, data.dtype.str, data.shape, keep)
+
+
+def _create_unowned_segment(size: int):
+    """
+    Creates a shared memory segment that the importing (parent) process will own.
+
+    By default the creator's resource tracker would unlink the segment when
+    the worker exits (possibly before the parent attached to it) and warn
+    about the segment the parent already unlinked, so the segment is not
+    registered with it.
+    """
+    from multiprocessing import shared_memory
+    import sys
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(create=True, size=size, track=False)
+    from multiprocessing import resource_tracker
+    segment = shared_memory.SharedMemory(create=True, size=size)
+    resource_tracker.unregister(segment._name, "shared_memory")
+    return segment
+
+
+def _import_array(handle: SharedArray) -> np.ndarray:
+    if handle.backend == "memmap":
+        array = np.load(handle.name, mmap_mode="r+")
+        if not handle.keep:
+            try:
+                os.remove(handle.name)  # The mapping stays valid (POSIX)
+            except OSError:
+                pass  # Still mapped (Windows); the temp directory is cleaned up by the OS
+        return array
+
+    from multiprocessing import shared_memory
+    segment = shared_memory.SharedMemory(name=handle.name)
+    array = np.ndarray(tuple(handle.shape), dtype=np.dtype(handle.dtype), buffer=segment.buf)
+    segment.unlink()  # Removes the name only; the mapping stays valid while referenced
+    # Close the mapping once the array (and every view derived from it) is gone.
+    weakref.finalize(array, segment.close)
+    return array
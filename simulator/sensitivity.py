@@ -0,0 +1,158 @@
+# simulator/sensitivity.py
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, Callable, List, Optional, Sequence, Union
+
+import numpy as np
+
+from .base import ExperimentLogic
+from .calibration import _simulate_population
+
+logger = logging.getLogger(__name__)
+
+OutputSpec = Union[Sequence[str], Dict[str, Callable[[Dict[str, Dict[str, Any]]], Any]]]
+
+# Default relative steps (as in scipy.optimize.approx_derivative): sqrt and cube root of the float64 epsilon
+DEFAULT_REL_STEPS = {'forward': np.finfo(float).eps ** 0.5, 'central': np.finfo(float).eps ** (1 / 3)}
+
+
+class SensitivityAnalysis:
+    """
+    Finite-difference derivatives of experiment outputs with respect to config parameters.
+
+    All the perturbed configurations of a `jacobian` call are simulated
+    together, through the same paths as calibration populations (one
+    `run_batch` when the parameters are `batch_keys`, `get_results_batch` for
+    vectorized experiments, run by run otherwise), without saving records or
+    plots.  The outputs of every simulated configuration are cached, so the
+    base point is run once and later calls (other parameters, forward then
+    central differences) only simulate what they have not seen.
+    """
+
+    def __init__(self, experiment_logic_class: type[ExperimentLogic], base_config: Dict[str, Any],
+                 outputs: Optional[OutputSpec] = None, n_workers: Optional[int] = None):
+        """
+        Args:
+            experiment_logic_class: The *class* of the ExperimentLogic to use (not an instance).
+            base_config: The configuration at which derivatives are taken.
+            outputs: Output names, or a dict mapping names to functions of the
+                     results dictionary (e.g. the final prey population).  Defaults
+                     to every numeric array output except ``time``.
+            n_workers: Simulate the perturbed configurations in this many worker processes.
+        """
+        if not issubclass(experiment_logic_class, ExperimentLogic):
+            raise TypeError("experiment_logic_class must be a subclass of ExperimentLogic")
+        self.experiment_logic_class = experiment_logic_class
+        self.base_config = dict(base_config)
+        if outputs is not None and not isinstance(outputs, dict):
+            outputs = {name: _output_getter(name) for name in outputs}
+        self.outputs = outputs
+        self.n_workers = n_workers
+        self._cache: Dict[Any, Dict[str, np.ndarray]] = {}  # Config key -> extracted outputs
+
+    @property
+    def base_outputs(self) -> Dict[str, np.ndarray]:
+        """The outputs at the base configuration."""
+        return self._evaluate([self.base_config], [])[0]
+
+    def jacobian(self, params: Sequence[str], method: str = 'central', rel_step: Optional[float] = None,
+                 abs_step: Optional[Union[float, Dict[str, float]]] = None) -> Dict[str, np.ndarray]:
+        """
+        Jacobian of every output with respect to `params`.
+
+        Args:
+            params: The numeric config keys to differentiate with respect to.
+            method: 'forward' (p + 1 runs) or 'central' (2p runs, more accurate).
+            rel_step: Step relative to `max(|value|, 1)` (default: the square root
+                      of the machine epsilon for forward, its cube root for central
+                      differences).
+            abs_step: Absolute step, for all parameters or per parameter name;
+                      takes precedence over `rel_step`.
+
+        Returns:
+            A dict mapping each output name to an array of shape
+            `output_shape + (len(params),)`; column `j` is the derivative with
+            respect to `params[j]`.
+        """
+        if method not in DEFAULT_REL_STEPS:
+            raise ValueError(f"Invalid method: '{method}'. Must be 'forward' or 'central'.")
+        params = list(params)
+        missing = [name for name in params if name not in self.base_config]
+        if missing:
+            raise KeyError(f"Parameters not in the base config: {missing}")
+        rel_step = DEFAULT_REL_STEPS[method] if rel_step is None else rel_step
+
+        configs = [self.base_config] if method == 'forward' else []
+        steps = []
+        for name in params:
+            value = float(self.base_config[name])
+            step = abs_step.get(name) if isinstance(abs_step, dict) else abs_step
+            if step is None:
+                step = rel_step * max(abs(value), 1.0)
+            step = (value + step) - value  # Exactly representable
+            steps.append(step)
+            configs.append(dict(self.base_config, **{name: value + step}))
+            if method == 'central':
+                configs.append(dict(self.base_config, **{name: value - step}))
+
+        values = self._evaluate(configs, params)
+        jacobians = {}
+        for output in values[0]:
+            if method == 'forward':
+                base = values[0][output]
+                columns = [(values[1 + j][output] - base) / step for j, step in enumerate(steps)]
+            else:
+                columns = [(values[2 * j][output] - values[2 * j + 1][output]) / (2 * step)
+                           for j, step in enumerate(steps)]
+            jacobians[output] = np.stack(columns, axis=-1)
+            if not np.all(np.isfinite(jacobians[output])):
+                logger.warning(f"The Jacobian of '{output}' has non-finite entries (failed or diverging runs).")
+        return jacobians
+
+    def _evaluate(self, configs: List[Dict[str, Any]], params: List[str]) -> List[Dict[str, np.ndarray]]:
+        """The outputs of every config, simulating only those not in the cache."""
+        keys = [_config_key(config) for config in configs]
+        pending = {}
+        for key, config in zip(keys, configs):
+            if key not in self._cache:
+                pending.setdefault(key, config)
+        if pending:
+            executor = ProcessPoolExecutor(max_workers=self.n_workers) if self.n_workers and self.n_workers > 1 else None
+            try:
+                results_list = _simulate_population(self.experiment_logic_class, list(pending.values()),
+                                                    params, executor, self.n_workers)
+            finally:
+                if executor is not None:
+                    executor.shutdown()
+            if self.outputs is None:
+                self.outputs = {name: _output_getter(name) for name in _numeric_outputs(results_list[0])}
+            for key, results in zip(pending, results_list):
+                self._cache[key] = {name: np.asarray(get(results), dtype=float) for name, get in self.outputs.items()}
+        return [self._cache[key] for key in keys]
+
+
+def jacobian(experiment_logic_class: type[ExperimentLogic], base_config: Dict[str, Any], params: Sequence[str],
+             outputs: Optional[OutputSpec] = None, method: str = 'central', rel_step: Optional[float] = None,
+             abs_step: Optional[Union[float, Dict[str, float]]] = None,
+             n_workers: Optional[int] = None) -> Dict[str, np.ndarray]:
+    """
+    Jacobian of an experiment's outputs with respect to config parameters.
+
+    Shorthand for `SensitivityAnalysis(...).jacobian(...)`; keep a
+    `SensitivityAnalysis` to reuse its simulations across calls.
+    """
+    analysis = SensitivityAnalysis(experiment_logic_class, base_config, outputs, n_workers)
+    return analysis.jacobian(params, method, rel_step, abs_step)
+
+
+def _output_getter(name: str) -> Callable[[Dict[str, Dict[str, Any]]], Any]:
+    return lambda results: results[name]['data']
+
+
+def _numeric_outputs(results: Dict[str, Dict[str, Any]]) -> List[str]:
+    return [name for name, info in results.items()
+            if name != 'time' and isinstance(info['data'], np.ndarray) and np.issubdtype(info['data'].dtype, np.number)]
+
+
+def _config_key(config: Dict[str, Any]) -> Any:
+    return tuple(sorted((key, repr(value)) for key, value in config.items()))
@@ -0,0 +1,350 @@
+# simulator/sweep_result.py
+import json
+import os
+from typing import Dict, Any, List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from .utils import DataDescriptor, DataType
+
+MANIFEST_FILE = "sweep_manifest.json"
+
+
+class SweepResult:
+    """
+    Stacked results of a parameter sweep.
+
+    Holds the parameter table (one row per combination) and, for every output,
+    a single array whose first axis indexes the combinations.  A time series
+    of length ``n_steps + 1`` becomes an ``(n_combinations, n_steps + 1)``
+    array, a scalar output becomes an ``(n_combinations,)`` array and a
+    DataFrame output becomes a structured array of shape
+    ``(n_combinations, n_rows)`` (one field per column).
+
+    Outputs whose length differs between combinations (e.g. when ``n_steps``
+    is swept) are padded at the end; the true length of every row is kept in
+    ``lengths[name]`` so the padding never leaks into ``to_long_dataframe``.
+
+    When a ``directory`` is given, the stacked arrays are ``.npy`` files opened
+    as memory maps, so a sweep larger than RAM can be built and reopened later
+    with ``SweepResult.open``.
+    """
+
+    def __init__(self, params: pd.DataFrame, outputs: Dict[str, np.ndarray],
+                 descriptors: Dict[str, DataDescriptor],
+                 lengths: Optional[Dict[str, np.ndarray]] = None,
+                 columns: Optional[Dict[str, List[str]]] = None,
+                 attrs: Optional[Dict[str, Any]] = None,
+                 directory: Optional[str] = None):
+        self.params = params.reset_index(drop=True)
+        self.outputs = outputs
+        self.descriptors = descriptors
+        self.lengths = lengths or {}
+        self.columns = columns or {}  # Column names of DataFrame outputs
+        self.attrs = attrs or {}  # Free-form metadata (e.g. strategy history)
+        self.directory = directory
+
+        for name, array in self.outputs.items():
+            if array.shape[0] != len(self.params):
+                raise ValueError(f"Output '{name}' has {array.shape[0]} rows, "
+                                 f"but there are {len(self.params)} parameter combinations.")
+
+    # --- Construction ---
+
+    @classmethod
+    def from_runs(cls, params: Union[pd.DataFrame, List[Dict[str, Any]]],
+                  results: List[Dict[str, Dict[str, Any]]],
+                  directory: Optional[str] = None,
+                  attrs: Optional[Dict[str, Any]] = None) -> "SweepResult":
+        """
+        Stacks the per-run results dictionaries of a sweep.
+
+        Args:
+            params: The parameter table (or list of parameter dictionaries), one
+                    row per entry in ``results``.
+            results: One results dictionary (as returned by ``get_results``) per run.
+            directory: Optional directory for memory-mapped ``.npy`` backing.
+            attrs: Optional metadata stored alongside the result.
+
+        Returns:
+            A SweepResult.
+        """
+        if not isinstance(params, pd.DataFrame):
+            params = pd.DataFrame(list(params))
+        if len(params) != len(results):
+            raise ValueError("The number of results must match the number of parameter combinations.")
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+        outputs: Dict[str, np.ndarray] = {}
+        descriptors: Dict[str, DataDescriptor] = {}
+        lengths: Dict[str, np.ndarray] = {}
+        columns: Dict[str, List[str]] = {}
+
+        names: List[str] = []
+        for res in results:
+            for name in res:
+                if name not in names:
+                    names.append(name)
+
+        for name in names:
+            infos = [res.get(name) for res in results]
+            if any(info is None for info in infos):
+                raise ValueError(f"Output '{name}' is missing from some of the runs.")
+            descriptors[name] = infos[0]['descriptor']
+            values = [info['data'] for info in infos]
+
+            if isinstance(values[0], pd.DataFrame):
+                columns[name] = [str(col) for col in values[0].columns]
+                values = [df.to_records(index=False) for df in values]
+            else:
+                values = [np.asarray(v) for v in values]
+
+            path = _backing_path(directory, name)
+            array, row_lengths = _stack(values, path)
+            if path is not None and array.dtype.hasobject:
+                np.save(path, array, allow_pickle=True)  # Object arrays cannot be memory-mapped
+            outputs[name] = array
+            if row_lengths is not None:
+                lengths[name] = row_lengths
+
+        result = cls(params, outputs, descriptors, lengths, columns, attrs, directory)
+        if directory is not None:
+            result._write_manifest()
+        return result
+
+    @classmethod
+    def open(cls, directory: str, mmap_mode: Optional[str] = 'r') -> "SweepResult":
+        """Reopens a directory-backed SweepResult without loading the arrays into memory."""
+        with open(os.path.join(directory, MANIFEST_FILE), "r") as f:
+            manifest = json.load(f)
+
+        params = pd.DataFrame(manifest['params']['records'], columns=manifest['params']['columns'])
+        for col, dtype in manifest['params']['dtypes'].items():
+            params[col] = params[col].astype(dtype)
+
+        outputs, descriptors, lengths, columns = {}, {}, {}, {}
+        for name, entry in manifest['outputs'].items():
+            path = os.path.join(directory, entry['file'])
+            if entry['object']:
+                outputs[name] = np.load(path, allow_pickle=True)
+            else:
+                outputs[name] = np.load(path, mmap_mode=mmap_mode)
+            descriptors[name] = DataDescriptor(**entry['descriptor'])
+            if entry.get('lengths') is not None:
+                lengths[name] = np.asarray(entry['lengths'], dtype=np.int64)
+            if entry.get('columns') is not None:
+                columns[name] = entry['columns']
+        return cls(params, outputs, descriptors, lengths, columns, manifest.get('attrs', {}), directory)
+
+    def save(self, directory: str) -> str:
+        """Writes the result to ``directory`` (readable with ``SweepResult.open``)."""
+        os.makedirs(directory, exist_ok=True)
+        for name, array in self.outputs.items():
+            np.save(_backing_path(directory, name), np.asarray(array), allow_pickle=array.dtype.hasobject)
+        self._write_manifest(directory)
+        return directory
+
+    def _write_manifest(self, directory: Optional[str] = None):
+        directory = directory or self.directory
+        manifest = {
+            'params': {
+                'columns': [str(c) for c in self.params.columns],
+                'dtypes': {str(c): str(t) for c, t in self.params.dtypes.items()},
+                'records': json.loads(self.params.to_json(orient='values')),
+            },
+            'outputs': {
+                name: {
+                    'file': os.path.basename(_backing_path(directory, name)),
+                    'object': bool(array.dtype.hasobject),
+                    'descriptor': self.descriptors[name].to_dict(),
+                    'lengths': self.lengths[name].tolist() if name in self.lengths else None,
+                    'columns': self.columns.get(name),
+                } for name, array in self.outputs.items()
+            },
+            'attrs': self.attrs,
+        }
+        with open(os.path.join(directory, MANIFEST_FILE), "w") as f:
+            json.dump(manifest, f, default=_json_default)
+
+    # --- Access ---
+
+    def __len__(self) -> int:
+        return len(self.params)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.outputs
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.outputs[name]
+
+    def keys(self) -> List[str]:
+        return list(self.outputs.keys())
+
+    def mask(self, **criteria) -> np.ndarray:
+        """
+        Boolean row mask selecting combinations by parameter value.
+
+        Each keyword is a parameter name; its value is either a single value
+        (floats are compared with ``np.isclose``) or a list of accepted values.
+        """
+        mask = np.ones(len(self.params), dtype=bool)
+        for key, value in criteria.items():
+            if key not in self.params.columns:
+                raise KeyError(f"Unknown parameter: '{key}'")
+            column = self.params[key].to_numpy()
+            accepted = value if isinstance(value, (list, tuple, set, np.ndarray)) else [value]
+            key_mask = np.zeros(len(column), dtype=bool)
+            for v in accepted:
+                if isinstance(v, (float, np.floating)) and np.issubdtype(column.dtype, np.number):
+                    key_mask |= np.isclose(column.astype(float), v)
+                else:
+                    key_mask |= column == v
+            mask &= key_mask
+        return mask
+
+    def sel(self, **criteria) -> "SweepResult":
+        """Selects combinations by parameter value (see ``mask``)."""
+        return self.isel(np.flatnonzero(self.mask(**criteria)))
+
+    def isel(self, indices: Union[Sequence[int], np.ndarray, slice]) -> "SweepResult":
+        """Selects combinations by position."""
+        rows = np.arange(len(self.params))[indices]
+        return SweepResult(
+            self.params.iloc[rows],
+            {name: array[rows] for name, array in self.outputs.items()},
+            self.descriptors,
+            {name: length[rows] for name, length in self.lengths.items()},
+            self.columns,
+            dict(self.attrs),
+        )
+
+    def row_lengths(self, name: str) -> np.ndarray:
+        """True (unpadded) length of output ``name`` for every combination."""
+        array = self.outputs[name]
+        if name in self.lengths:
+            return self.lengths[name]
+        size = array.shape[1] if array.ndim > 1 else 1
+        return np.full(len(self.params), size, dtype=np.int64)
+
+    def get_run(self, index: int) -> Dict[str, Dict[str, Any]]:
+        """Rebuilds the results dictionary of a single run (as returned by ``get_results``)."""
+        results = {}
+        for name, array in self.outputs.items():
+            value = array[index]
+            if name in self.lengths:
+                value = value[:self.lengths[name][index]]
+            if name in self.columns:
+                value = pd.DataFrame.from_records(value, columns=self.columns[name])
+            elif np.ndim(value) == 0:
+                value = value.item() if isinstance(value, np.generic) else value
+            results[name] = {'data': value, 'descriptor': self.descriptors[name]}
+        return results
+
+    # --- Conversion ---
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """The parameter table with one column per scalar output."""
+        df = self.params.copy()
+        for name, array in self.outputs.items():
+            if array.ndim == 1 and name not in self.columns:
+                df[name] = array
+        return df
+
+    def to_long_dataframe(self, name: str, index_name: str = "index") -> pd.DataFrame:
+        """
+        Converts one output to long format: one row per (combination, element).
+
+        The parameter columns are repeated for every element, followed by the
+        element position (``index_name``, or ``index_name_<axis>`` for outputs
+        with more than one axis per run) and the value column(s).  Padding is
+        dropped, so the frame holds exactly the values produced by the runs.
+        """
+        array = np.asarray(self.outputs[name])
+        n = len(self.params)
+        if array.ndim == 1 and name not in self.columns:
+            df = self.params.copy()
+            df[name] = array
+            return df
+
+        per_run_shape = array.shape[1:]
+        positions = np.indices(per_run_shape).reshape(len(per_run_shape), -1)
+        n_elements = positions.shape[1]
+        keep = np.ones((n, n_elements), dtype=bool)
+        if name in self.lengths:
+            keep = positions[0][None, :] < self.lengths[name][:, None]
+        rows = np.repeat(np.arange(n), n_elements).reshape(n, n_elements)[keep]
+        flat_positions = np.broadcast_to(positions[:, None, :], (positions.shape[0], n, n_elements))[:, keep]
+
+        df = self.params.iloc[rows].reset_index(drop=True)
+        if len(per_run_shape) == 1:
+            df[index_name] = flat_positions[0]
+        else:
+            for axis in range(len(per_run_shape)):
+                df[f"{index_name}_{axis}"] = flat_positions[axis]
+
+        values = array.reshape(n, n_elements)[keep]
+        if name in self.columns:
+            for field, column in zip(values.dtype.names, self.columns[name]):
+                df[column] = values[field]
+        else:
+            df[name] = values
+        return df
+
+
+def _backing_path(directory: Optional[str], name: str) -> Optional[str]:
+    if directory is None:
+        return None
+    safe_name = "".join(c if c.isalnum() or c in "-_." else "_" for c in name)
+    return os.path.join(directory, f"{safe_name}.npy")
+
+
+def _stack(values: List[np.ndarray], path: Optional[str]):
+    """Stacks per-run arrays along a new first axis, padding ragged first dimensions."""
+    first = values[0]
+    dtype = np.result_type(*values) if first.dtype.names is None else first.dtype
+    shapes = {v.shape for v in values}
+    use_memmap = path is not None and not dtype.hasobject
+
+    if len(shapes) == 1:
+        shape = (len(values),) + first.shape
+        out = _allocate(shape, dtype, path if use_memmap else None)
+        np.stack(values, out=out)
+        return out, None
+
+    if len({v.shape[1:] for v in values}) != 1 or first.ndim == 0:
+        raise ValueError("Only outputs whose shapes differ in the first dimension can be stacked.")
+    row_lengths = np.array([v.shape[0] for v in values], dtype=np.int64)
+    shape = (len(values), int(row_lengths.max())) + first.shape[1:]
+    out = _allocate(shape, dtype, path if use_memmap else None)
+    out[...] = _fill_value(dtype)
+    for i, v in enumerate(values):
+        out[i, :len(v)] = v
+    return out, row_lengths
+
+
+def _allocate(shape, dtype, path: Optional[str]) -> np.ndarray:
+    if path is None:
+        return np.empty(shape, dtype=dtype)
+    return np.lib.format.open_memmap(path, mode='w+', dtype=dtype, shape=shape)
+
+
+def _fill_value(dtype: np.dtype):
+    if dtype.names is not None:
+        return np.zeros((), dtype=dtype)
+    if np.issubdtype(dtype, np.floating) or np.issubdtype(dtype, np.complexfloating):
+        return np.nan
+    if dtype.hasobject:
+        return None
+    return np.zeros((), dtype=dtype)
+
+
+def _json_default(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, (DataType,)):
+        return value.value
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
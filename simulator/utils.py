@@ -25,7 +25,9 @@ class DataDescriptor:
                  units: Optional[str] = None,
                  group: str = "default",
                  plot_type: Optional[str] = None,
-                 x_axis: Optional[str] = None):
+                 x_axis: Optional[str] = None,
+                 dtype: Optional[str] = None,
+                 codec: Optional[Union[str, Dict[str, Any]]] = None):
         self.name = name
         self.data_type = data_type
         self.shape = shape
@@ -33,12 +35,14 @@ class DataDescriptor:
         self.group = group
         self.plot_type = plot_type
         self.x_axis = x_axis
+        self.dtype = dtype  # NumPy dtype string (e.g. '<f8'), when known
+        self.codec = codec  # Storage codec for NDARRAY outputs (see simulator.codecs), e.g. {'name': 'quantize', 'error_bound': 1e-3}
 
     def to_dict(self) -> Dict[str, Any]:
         """
         Converts the DataDescriptor to a dictionary for serialization
         """
-        return {
+        descriptor_dict = {
             'name': self.name,
             'data_type': str(self.data_type),  # Store Enum as string - THIS IS THE FIX
             'shape': self.shape,
@@ -46,4 +50,10 @@ class DataDescriptor:
             'group': self.group,
             'plot_type': self.plot_type,
             'x_axis': self.x_axis
-        }
\ No newline at end of file
+        }
+        # Optional metadata is only written when set, so existing records are unchanged
+        if self.dtype is not None:
+            descriptor_dict['dtype'] = self.dtype
+        if self.codec is not None:
+            descriptor_dict['codec'] = self.codec
+        return descriptor_dict
\ No newline at end of file
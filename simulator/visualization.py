@@ -8,6 +8,14 @@ from .utils import DataType
 import pandas as pd
 import numpy as np
 
+MAX_PLOT_POINTS = 10000  # Longer time series are decimated for plotting
+
+def _decimate(data: Any, max_points: int = MAX_PLOT_POINTS) -> Any:
+    """Every k-th value of a long series (a strided view, so memory-mapped outputs are not read in full)."""
+    if isinstance(data, (np.ndarray, pd.Series)) and len(data) > max_points:
+        return data[::-(-len(data) // max_points)]
+    return data
+
 def generate_plots(results: Dict[str, Dict[str, Any]], output_dir: str, static_format: str = "svg"):
     """
     Generates plots based on the results and their DataDescriptors.
@@ -41,14 +49,14 @@ def generate_plots(results: Dict[str, Dict[str, Any]], output_dir: str, static_f
                 print(f"Warning: X-axis data '{x_axis_name}' not found. Skipping time series plot for {group_name}.")
                 continue
 
-            x_axis_data = results[x_axis_name]['data']
+            x_axis_data = _decimate(results[x_axis_name]['data'])
             x_axis_descriptor = results[x_axis_name]['descriptor']
             # --- Matplotlib ---
             plt.figure()
             for data_info in data_list:
                 descriptor = data_info['descriptor']
                 if descriptor.plot_type == "line" and descriptor.group == "time_series":
-                    data = data_info['data']
+                    data = _decimate(data_info['data'])
                     plt.plot(x_axis_data, data, label=descriptor.name)
 
             plt.xlabel(x_axis_descriptor.units if x_axis_descriptor.units else x_axis_name)
@@ -66,7 +74,7 @@ def generate_plots(results: Dict[str, Dict[str, Any]], output_dir: str, static_f
             for data_info in data_list:
                 descriptor = data_info['descriptor']
                 if descriptor.plot_type == 'line' and descriptor.group == "time_series":
-                    data = data_info['data']
+                    data = _decimate(data_info['data'])
                     df[descriptor.name] = data
 
             # Corrected y label
@@ -124,10 +132,14 @@ def generate_plots(results: Dict[str, Dict[str, Any]], output_dir: str, static_f
 def _generate_combined_plot(results: Dict[str, Dict[str, Any]], output_dir: str, static_format: str = "svg"):
     """Generates a combined plot of prey and predator populations."""
 
+    time = _decimate(results['time']['data'])
+    prey = _decimate(results['prey_population']['data'])
+    predators = _decimate(results['predator_population']['data'])
+
     # Matplotlib
     plt.figure()
-    plt.plot(results['time']['data'], results['prey_population']['data'], label="Prey Population")
-    plt.plot(results['time']['data'], results['predator_population']['data'], label="Predator Population")
+    plt.plot(time, prey, label="Prey Population")
+    plt.plot(time, predators, label="Predator Population")
     if 'observed_data' in results:
         if 'prey_population' in results['observed_data']['data'].columns:
             plt.plot(results['observed_data']['data']['time'], results['observed_data']['data']['prey_population'], label="Observed Prey", linestyle='--')
@@ -144,9 +156,9 @@ def _generate_combined_plot(results: Dict[str, Dict[str, Any]], output_dir: str,
 
     # Plotly
     df = pd.DataFrame({
-      'time': results['time']['data'],
-      'Prey Population': results['prey_population']['data'],
-      'Predator Population': results['predator_population']['data']
+      'time': time,
+      'Prey Population': prey,
+      'Predator Population': predators
     })
     if 'observed_data' in results:
         obs_df = results['observed_data']['data']
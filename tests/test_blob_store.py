@@ -0,0 +1,106 @@
+# tests/test_blob_store.py
+import pytest
+from simulator.blob_store import BlobStore
+from simulator.doe import run_parameter_sweep
+from simulator.persistence import load_experiment_record, collect_output_garbage
+from experiments.predator_prey.logic import PredatorPreyExperiment
+import numpy as np
+import pandas as pd
+import os
+import shutil
+
+
+def test_put_get_deduplicates(tmp_path):
+    store = BlobStore(str(tmp_path / "blobs"))
+    array = np.linspace(0, 1, 500)
+    first = store.put(array, owner="run_a")
+    second = store.put(array.copy(), owner="run_b")
+    assert first == second
+    assert store.stats()["blobs"] == 1
+    assert store.stats()["stored_bytes"] < array.nbytes  # Compressed
+    assert store.refcount(first) == 2
+    assert np.array_equal(store.get(first), array)
+
+    df = pd.DataFrame({'t': np.arange(3), 'label': ['a', 'b', 'c']})
+    digest = store.put(df, owner="run_a")
+    pd.testing.assert_frame_equal(store.get(digest), df)
+    with pytest.raises(KeyError):
+        store.get("0" * 64)
+
+
+def test_garbage_collection_respects_references(tmp_path):
+    store = BlobStore(str(tmp_path / "blobs"))
+    shared = store.put(np.zeros(100), owner="run_a")
+    store.add_ref(shared, "run_b")
+    only_a = store.put(np.ones(100), owner="run_a")
+
+    assert store.release("run_a") == 2
+    stats = store.collect_garbage(grace_seconds=0)
+    assert stats["deleted_blobs"] == 1
+    assert only_a not in store
+    assert shared in store  # Still referenced by run_b
+
+    stats = store.collect_garbage(live_owners=[], grace_seconds=0)  # run_b was deleted
+    assert stats["released_refs"] == 1
+    assert shared not in store
+
+
+def test_garbage_collection_spares_blobs_being_written(tmp_path, monkeypatch):
+    store = BlobStore(str(tmp_path / "blobs"))
+    unreferenced = store.put(np.zeros(100))  # Its writer has not added a reference yet
+    assert store.collect_garbage()["deleted_blobs"] == 0
+    assert unreferenced in store
+
+    # A reference added while the object is being collected keeps it
+    add_ref = store.add_ref
+    monkeypatch.setattr(store, "refcount", lambda digest: add_ref(digest, "run_a") or 1)
+    assert store.collect_garbage(grace_seconds=0)["deleted_blobs"] == 0
+    assert np.array_equal(store.get(unreferenced), np.zeros(100))
+
+
+def test_add_ref_recreates_collected_directory(tmp_path, monkeypatch):
+    store = BlobStore(str(tmp_path / "blobs"))
+    digest = "0" * 64
+    makedirs = os.makedirs
+    calls = []
+
+    def makedirs_then_collect(path, exist_ok=False):
+        makedirs(path, exist_ok=exist_ok)
+        if not calls:
+            calls.append(path)
+            store.collect_garbage(grace_seconds=0)  # Removes the still empty directory
+    monkeypatch.setattr(os, "makedirs", makedirs_then_collect)
+    store.add_ref(digest, "run_a")
+    assert store.refcount(digest) == 1
+
+
+def test_numeric_blobs_load_without_pickle(tmp_path):
+    from simulator.blob_store import _serialize, _deserialize
+    assert _serialize(np.arange(3))[:1] == b"A"
+    assert _serialize(pd.DataFrame({'label': ['a', 'b']}))[:1] == b"d"
+    with pytest.raises(ValueError):
+        _deserialize(b"A" + _serialize(np.array(['a', None], dtype=object))[1:])
+
+
+def test_sweep_records_share_identical_outputs(tmp_path):
+    base_config = {
+        'n_steps': 100, 'initial_prey': 100, 'initial_predators': 20,
+        'predator_growth_rate': 0.01, 'predator_death_rate': 0.05, 'prey_death_rate': 0.01,
+        'deduplicate_outputs': True,
+    }
+    output_dir = str(tmp_path / "out")
+    runs = run_parameter_sweep(PredatorPreyExperiment, base_config, {'prey_growth_rate': [0.1, 0.2]},
+                               output_dir=output_dir)
+    store = BlobStore(os.path.join(output_dir, "blobs"))
+    assert store.stats()["blobs"] == 5  # One shared time axis, two populations per run
+
+    record = load_experiment_record(output_dir, runs[0]['record_id'])
+    assert np.array_equal(record.output_data['time']['data'], runs[0]['results']['time']['data'])
+    assert np.array_equal(record.output_data['prey_population']['data'],
+                          runs[0]['results']['prey_population']['data'])
+
+    run_dir = next(item for item in os.listdir(output_dir) if runs[0]['record_id'] in item)
+    shutil.rmtree(os.path.join(output_dir, run_dir))
+    assert collect_output_garbage(output_dir, grace_seconds=0)["deleted_blobs"] == 2  # The time axis is still used
+    record = load_experiment_record(output_dir, runs[1]['record_id'])
+    assert len(record.output_data['time']['data']) == 101
@@ -0,0 +1,68 @@
+# tests/test_calibration.py
+import pytest
+from simulator.calibration import calibrate, observed_sse
+from simulator.persistence import load_experiment_record
+from experiments.predator_prey.logic import PredatorPreyExperiment
+from experiments.predator_prey_calibration.logic import PredatorPreyCalibrationExperiment
+from experiments.linear_function.logic import LinearFunctionExperiment
+import numpy as np
+import os
+import pandas as pd
+
+
+@pytest.fixture
+def calibration_config(tmp_path):
+    # Observations generated with known rates
+    true_config = {'n_steps': 30, 'initial_prey': 40, 'initial_predators': 9, 'prey_growth_rate': 0.1,
+                   'prey_death_rate': 0.02, 'predator_growth_rate': 0.01, 'predator_death_rate': 0.1}
+    results, _ = PredatorPreyExperiment.run_batch([true_config])
+    observed = pd.DataFrame({'time': results[0]['time']['data'],
+                             'prey_population': results[0]['prey_population']['data'],
+                             'predator_population': results[0]['predator_population']['data']})
+    csv_file = tmp_path / "observed_data.csv"
+    observed.to_csv(csv_file, index=False)
+    return dict(true_config, observed_data_path=str(csv_file))
+
+
+def test_calibrate_recovers_rates(calibration_config, tmp_path):
+    bounds = {'prey_growth_rate': (0.01, 0.3), 'predator_death_rate': (0.01, 0.3)}
+    fit = calibrate(PredatorPreyCalibrationExperiment, calibration_config, bounds, popsize=10,
+                    max_generations=200, seed=1, output_dir=str(tmp_path / "output"))
+    assert fit.best_params['prey_growth_rate'] == pytest.approx(0.1, rel=1e-2)
+    assert fit.best_params['predator_death_rate'] == pytest.approx(0.1, rel=1e-2)
+    assert fit.best_loss == pytest.approx(observed_sse(fit.results))
+    assert fit.trace['best_loss'].is_monotonic_decreasing
+    assert fit.n_evaluations == fit.trace['n_evaluations'].iloc[-1]
+
+    record = load_experiment_record(str(tmp_path / "output"), fit.record_id)
+    assert record.config['prey_growth_rate'] == fit.best_params['prey_growth_rate']
+    assert len(record.output_data['calibration_trace']['data']) == len(fit.trace)
+    assert record.performance['calibration']['stop_reason'] == fit.stop_reason
+
+
+def test_calibrate_stops_on_stagnation():
+    config = {'n_points': 5, 'm': 1.0, 'c': 0.0, 'x_min': 0.0, 'x_max': 1.0}
+    fit = calibrate(LinearFunctionExperiment, config, {'m': (0.0, 2.0)}, objective=lambda results: round(results['y']['data'][-1]),
+                    tol=0, patience=3, max_generations=100, seed=0, output_dir=None)
+    assert fit.stop_reason == 'stagnation'
+    assert len(fit.trace) <= 5
+    assert fit.record_id is None
+
+
+def test_calibrate_with_workers(calibration_config):
+    bounds = {'prey_growth_rate': (0.05, 0.2)}
+    serial = calibrate(PredatorPreyCalibrationExperiment, calibration_config, bounds, max_generations=5,
+                       seed=3, output_dir=None)
+    parallel = calibrate(PredatorPreyCalibrationExperiment, calibration_config, bounds, max_generations=5,
+                         seed=3, n_workers=2, output_dir=None)
+    assert parallel.best_params == serial.best_params
+    assert parallel.trace['best_loss'].tolist() == serial.trace['best_loss'].tolist()
+
+
+def test_calibrate_without_finite_loss(tmp_path):
+    config = {'n_points': 5, 'm': 1.0, 'c': 0.0, 'x_min': 0.0, 'x_max': 1.0}
+    fit = calibrate(LinearFunctionExperiment, config, {'m': (0.0, 2.0)}, objective=lambda results: np.nan,
+                    patience=2, seed=0, output_dir=str(tmp_path))
+    assert fit.stop_reason == 'failed'
+    assert fit.best_params is None and fit.results is None and fit.record_id is None
+    assert not os.listdir(tmp_path)
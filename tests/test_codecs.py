@@ -0,0 +1,55 @@
+# tests/test_codecs.py
+import pytest
+from simulator.codecs import encode_array, decode_array, get_codec
+from simulator.experiment_record import ExperimentRecord
+from simulator.persistence import save_experiment_record, load_experiment_record
+from simulator.utils import DataDescriptor, DataType
+import numpy as np
+
+
+@pytest.fixture
+def trajectory():
+    t = np.linspace(0, 50, 20001)
+    return np.column_stack([100 + 20 * np.sin(t), 20 + 5 * np.cos(t)])
+
+
+@pytest.mark.parametrize("dtype", [np.float64, np.float32, np.int64, np.uint8])
+def test_delta_shuffle_deflate_is_lossless(trajectory, dtype):
+    array = (trajectory * 3).astype(dtype)
+    payload, meta = encode_array(array, "delta_shuffle_deflate")
+    decoded = decode_array(payload, meta)
+    assert decoded.dtype == array.dtype
+    assert np.array_equal(decoded, array)
+
+
+def test_quantize_respects_error_bound(trajectory):
+    payload, meta = encode_array(trajectory, {'name': 'quantize', 'error_bound': 1e-3})
+    decoded = decode_array(payload, meta)
+    assert decoded.shape == trajectory.shape
+    assert np.max(np.abs(decoded - trajectory)) <= 1e-3 * (1 + 1e-9)
+    lossless, _ = encode_array(trajectory, "delta_shuffle_deflate")
+    assert len(payload) < len(lossless) < trajectory.nbytes
+
+    with pytest.raises(ValueError):
+        encode_array(np.array([1.0, np.nan]), {'name': 'quantize', 'error_bound': 0.1})
+    with pytest.raises(ValueError):
+        get_codec("unknown")
+
+
+def test_persistence_applies_codecs(trajectory, tmp_path):
+    record = ExperimentRecord({'n_steps': 10}, None)
+    record.add_output_data("exact", trajectory, DataDescriptor("exact", DataType.NDARRAY, codec="delta_shuffle_deflate"))
+    record.add_output_data("approx", trajectory, DataDescriptor("approx", DataType.NDARRAY,
+                                                                codec={'name': 'quantize', 'error_bound': 0.01}))
+    record.add_output_data("plain", np.arange(3), DataDescriptor("plain", DataType.NDARRAY))
+    save_experiment_record(record, str(tmp_path))
+
+    loaded = load_experiment_record(str(tmp_path), record.experiment_id)
+    assert np.array_equal(loaded.output_data["exact"]["data"], trajectory)
+    assert np.allclose(loaded.output_data["approx"]["data"], trajectory, atol=0.01)
+    assert loaded.output_data["plain"]["data"] == [0, 1, 2]
+    assert loaded.output_data["approx"]["descriptor"].codec == {'name': 'quantize', 'error_bound': 0.01}
+    stats = loaded.performance["codecs"]
+    assert stats["exact"]["ratio"] > 1 and stats["exact"]["max_abs_error"] == 0.0
+    assert stats["approx"]["encoded_bytes"] < stats["exact"]["encoded_bytes"]
+    assert stats["approx"]["decode_mb_per_s"] > 0
@@ -41,4 +41,42 @@ def test_data_analysis_get_results(analysis_config):
 
     # Check a few values using sample standard deviation calculation
     assert np.isclose(results['mean']['data'], 11.0)
-    assert np.isclose(results['std']['data'], np.std([10, 12, 11], ddof=1)) # Corrected STD
\ No newline at end of file
+    assert np.isclose(results['std']['data'], np.std([10, 12, 11], ddof=1)) # Corrected STD
+
+
+def test_data_analysis_streaming_matches_in_memory(tmp_path):
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({'time': np.arange(1000), 'value': rng.normal(5.0, 2.0, 1000)})
+    csv_file = tmp_path / "large.csv"
+    df.to_csv(csv_file, index=False)
+
+    config = {'input_data_path': str(csv_file)}
+    in_memory = DataAnalysisExperiment(config)
+    in_memory.initialize(config)
+    expected = in_memory.get_results()
+
+    streaming_config = dict(config, chunksize=64)
+    streaming = DataAnalysisExperiment(streaming_config)
+    streaming.initialize(streaming_config)
+    results = streaming.get_results()
+    assert streaming.data is None  # Nothing beyond a chunk is kept
+    assert results['count']['data'] == 1000
+    for name in ('mean', 'std', 'max', 'min'):
+        assert np.isclose(results[name]['data'], expected[name]['data'])
+
+
+def test_data_analysis_sweep_mixes_streaming_and_in_memory(tmp_path):
+    from simulator.doe import run_parameter_sweep
+    csv_file = tmp_path / "data.csv"
+    pd.DataFrame({'time': np.arange(100), 'value': np.arange(100.0)}).to_csv(csv_file, index=False)
+
+    # Each mode initializes its own state, even though the file is the same
+    runs = run_parameter_sweep(DataAnalysisExperiment, {'input_data_path': str(csv_file)},
+                               {'chunksize': [None, 16, None]}, output_dir=None)
+    assert [r['params']['chunksize'] for r in runs] == [None, 16, None]
+    for run in runs:
+        results = run['results']
+        streaming = run['params']['chunksize'] is not None
+        assert ('count' in results) == streaming
+        assert ('loaded_data' in results) != streaming
+        assert np.isclose(results['mean']['data'], 49.5)
@@ -159,4 +159,179 @@ def test_save_csv(temp_test_files):
     assert os.path.exists(csv_file2)
     df = pd.read_csv(csv_file2)
     assert 'time' in df.columns
-    assert 'value' in df.columns
\ No newline at end of file
+    assert 'value' in df.columns
+
+
+def test_load_csv_uses_dataset_cache(temp_test_files):
+    from simulator.data_handler import clear_dataset_cache, get_dataset_cache_stats
+    clear_dataset_cache()
+    before = get_dataset_cache_stats()
+    first = load_csv(temp_test_files["csv"])
+    second = load_csv(temp_test_files["csv"])
+    stats = get_dataset_cache_stats(since=before)
+    assert stats['misses'] == 1
+    assert stats['hits'] == 1
+    assert stats['hit_rate'] == 0.5
+    pd.testing.assert_frame_equal(first['data'], second['data'])
+
+    # Modifying a returned frame does not corrupt the cached copy
+    second['data'].loc[0, 'header1'] = 100
+    assert load_csv(temp_test_files["csv"])['data'].loc[0, 'header1'] == 1
+
+    # Changing the file on disk invalidates the entry
+    pd.DataFrame({'a': [1]}).to_csv(temp_test_files["csv"], index=False)
+    assert list(load_csv(temp_test_files["csv"])['data'].columns) == ['a']
+    assert load_csv(temp_test_files["csv"], use_cache=False)['data'].shape == (1, 1)
+
+def test_load_numpy_cached_arrays_are_read_only(temp_test_files):
+    load_numpy(temp_test_files["npy"])
+    data_info = load_numpy(temp_test_files["npy"])
+    with pytest.raises(ValueError):
+        data_info['data'][0] = 10
+    assert load_numpy(temp_test_files["npy"], use_cache=False)['data'].flags.writeable
+
+def test_dataset_cache_lru_eviction():
+    from simulator.data_handler import DatasetCache
+    cache = DatasetCache(max_bytes=100)
+    cache.put(('a',), 'A', 60)
+    cache.put(('b',), 'B', 30)
+    assert cache.get(('a',)) == 'A'  # 'a' is now most recently used
+    cache.put(('c',), 'C', 30)
+    assert cache.get(('b',)) is None
+    assert cache.get(('a',)) == 'A'
+    assert cache.stats()['evictions'] == 1
+    cache.resize(70)  # Evicts the least recently used entry, 'c'
+    assert cache.stats()['entries'] == 1
+    assert cache.stats()['bytes'] == 60
+
+@pytest.mark.parametrize("backend", ["shm", "memmap"])
+def test_shared_dataset_round_trip(backend):
+    from simulator.data_handler import publish_shared_dataset, attach_shared_dataset, release_shared_dataset
+    df = pd.DataFrame({'t': np.arange(5), 'value': np.linspace(0, 1, 5), 'label': list('abcde')})
+    handle = publish_shared_dataset(df, backend=backend)
+    attached = attach_shared_dataset(handle)
+    pd.testing.assert_frame_equal(attached['data'], df)
+    assert not attached['data']['value'].to_numpy().flags.writeable
+    release_shared_dataset(handle)
+    with pytest.raises(ValueError):
+        publish_shared_dataset(df, backend="pipe")
+
+def test_iter_csv_chunks_typed(tmp_path):
+    from simulator.data_handler import iter_csv_chunks
+    csv_file = tmp_path / "log.csv"
+    pd.DataFrame({'time': range(10), 'value': range(10), 'note': ['x'] * 10}).to_csv(csv_file, index=False)
+    chunks = list(iter_csv_chunks(str(csv_file), chunksize=4, dtype={'value': 'float32'}, usecols=['time', 'value']))
+    assert [len(c) for c in chunks] == [4, 4, 2]
+    assert all(list(c.columns) == ['time', 'value'] for c in chunks)
+    assert all(c['value'].dtype == np.float32 for c in chunks)
+
+    headerless = tmp_path / "headerless.csv"
+    headerless.write_text("1,2.5\n3,4.5\n")
+    chunk = next(iter_csv_chunks(str(headerless), header=False, dtype={'col_1': 'float32'}))
+    assert list(chunk.columns) == ['col_0', 'col_1']
+    assert chunk['col_1'].dtype == np.float32
+    with pytest.raises(FileNotFoundError):
+        next(iter_csv_chunks("missing.csv"))
+    with pytest.raises(ValueError):
+        next(iter_csv_chunks(str(csv_file), engine="python"))
+
+def test_load_csv_typed_columns(temp_test_files):
+    data_info = load_csv(temp_test_files["csv"], dtype={'header1': 'float32'}, usecols=['header1'])
+    assert list(data_info['data'].columns) == ['header1']
+    assert data_info['data']['header1'].dtype == np.float32
+    assert load_csv(temp_test_files["csv"])['data'].shape[1] > 1  # Cached separately from the typed load
+
+def test_load_numpy_mmap(temp_test_files):
+    data_info = load_numpy(temp_test_files["npy"], mmap_mode="r")
+    assert isinstance(data_info['data'], np.memmap)
+    assert data_info['descriptor'].shape == data_info['data'].shape
+    assert data_info['descriptor'].dtype == data_info['data'].dtype.str
+
+@pytest.mark.parametrize("save", [np.savez, np.savez_compressed])
+def test_load_numpy_lazy_npz(tmp_path, save):
+    from simulator.data_handler import NpzArchive
+    npz_file = tmp_path / "arrays.npz"
+    arrays = {'a': np.arange(12, dtype=np.int32).reshape(3, 4), 'b': np.asfortranarray(np.ones((2, 5)))}
+    save(npz_file, **arrays)
+
+    archive = load_numpy(str(npz_file), mmap_mode="r")
+    assert isinstance(archive, NpzArchive)
+    assert sorted(archive) == ['a', 'b']
+    assert archive.descriptors['a'].shape == (3, 4)
+    assert archive.descriptors['a'].dtype == np.dtype(np.int32).str
+    assert not archive.is_loaded('a')  # Descriptors come from the headers only
+    assert np.array_equal(archive['a']['data'], arrays['a'])
+    assert np.array_equal(archive['b']['data'], arrays['b'])
+    assert archive.is_loaded('a')
+    assert isinstance(archive['a']['data'], np.memmap) == (save is np.savez)
+    with pytest.raises(KeyError):
+        archive['c']
+
+@pytest.mark.parametrize("suffix", [".ndjson", ".json"])
+def test_load_json_records_streams_numeric_records(tmp_path, suffix, monkeypatch):
+    from simulator.data_handler import load_json_records, iter_json_chunks
+    monkeypatch.setattr("simulator.data_handler._JSON_READ_SIZE", 7)  # Force records to straddle reads
+    records = [{'time': i, 'value': i * 0.5} for i in range(50)]
+    json_file = tmp_path / f"records{suffix}"
+    if suffix == ".ndjson":
+        json_file.write_text("\n".join(json.dumps(r) for r in records) + "\n")
+    else:
+        json_file.write_text(json.dumps(records, indent=1))
+
+    data_info = load_json_records(str(json_file))
+    assert data_info['descriptor'].shape == (50, 2)
+    assert list(data_info['data'].columns) == ['time', 'value']
+    assert np.allclose(data_info['data']['value'], np.arange(50) * 0.5)
+
+    chunks = list(iter_json_chunks(str(json_file), chunksize=20, columns=['value']))
+    assert [len(c) for c in chunks] == [20, 20, 10]
+    assert list(chunks[0].columns) == ['value']
+
+def test_load_json_records_arrays_and_errors(tmp_path):
+    from simulator.data_handler import load_json_records
+    json_file = tmp_path / "pairs.json"
+    json_file.write_text("[[0, 1.5], [1, 2.5], [2, 3.5]]")
+    data_info = load_json_records(str(json_file))
+    assert data_info['data'].shape == (3, 2)
+    assert data_info['descriptor'].shape == (3, 2)
+
+    scalars = tmp_path / "scalars.json"
+    scalars.write_text("[1, 2, 3e2]")
+    assert np.array_equal(load_json_records(str(scalars))['data'], [1, 2, 300])
+
+    mixed = tmp_path / "mixed.ndjson"
+    mixed.write_text('{"a": 1}\n{"a": "x"}\n')
+    with pytest.raises(ValueError):
+        load_json_records(str(mixed))
+    broken = tmp_path / "broken.json"
+    broken.write_text("[1, 2")
+    with pytest.raises(ValueError):
+        load_json_records(str(broken))
+
+def test_results_to_frame_keeps_all_outputs():
+    from simulator.data_handler import results_to_frame
+    results = {
+        "series": {"data": np.array([1, 2, 3]), "descriptor": DataDescriptor("series", DataType.NDARRAY)},
+        "short": {"data": [0.5, 1.5], "descriptor": DataDescriptor("short", DataType.LIST)},
+        "table": {"data": pd.DataFrame({'a': [1, 2, 3]}), "descriptor": DataDescriptor("table", DataType.DATAFRAME)},
+        "pair": {"data": np.ones((3, 2)), "descriptor": DataDescriptor("pair", DataType.NDARRAY)},
+        "total": {"data": 4.0, "descriptor": DataDescriptor("total", DataType.FLOAT)},
+    }
+    df = results_to_frame(results)
+    assert list(df.columns) == ['series', 'short', 'table.a', 'pair.0', 'pair.1', 'total']
+    assert len(df) == 3
+    assert np.isnan(df['short'].iloc[2])
+    assert (df['total'] == 4.0).all()
+
+@pytest.mark.parametrize("results_format", ["csv", "csv.gz", "parquet", "feather"])
+def test_save_results_formats(tmp_path, results_format):
+    from simulator.data_handler import save_results
+    if results_format in ("parquet", "feather"):
+        pytest.importorskip("pyarrow")
+    df = pd.DataFrame({'time': np.arange(100), 'value': np.linspace(0, 1, 100)})
+    path = save_results(df, str(tmp_path / "results"), results_format=results_format, chunksize=30)
+    assert path.endswith(results_format)
+    read = {"parquet": pd.read_parquet, "feather": pd.read_feather}.get(results_format, pd.read_csv)
+    pd.testing.assert_frame_equal(read(path), df)
+    with pytest.raises(ValueError):
+        save_results(df, str(tmp_path / "results"), results_format="xlsx")
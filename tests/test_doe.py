@@ -0,0 +1,394 @@
+# tests/test_doe.py
+import pytest
+import os
+from simulator.doe import create_doe_table, run_parameter_sweep
+from simulator.utils import DataDescriptor, DataType
+from experiments.linear_function.logic import LinearFunctionExperiment
+import numpy as np
+import pandas as pd
+
+
+@pytest.fixture
+def linear_base_config():
+    return {'n_points': 5, 'x_min': 0.0, 'x_max': 4.0}
+
+
+def test_full_factorial():
+    table = create_doe_table({'m': [1.0, 2.0], 'c': [0.0, 1.0, 2.0]})
+    assert table.shape == (6, 2)
+
+
+@pytest.mark.parametrize("design_type", ['latin_hypercube', 'sobol', 'halton', 'random'])
+def test_space_filling_designs(design_type):
+    param_ranges = {'m': (0.0, 10.0), 'c': [-1.0, 0.0, 1.0], 'n_points': (2, 20)}
+    table = create_doe_table(param_ranges, design_type=design_type, n_samples=16, seed=0)
+    assert table.shape == (16, 3)
+    assert table['m'].between(0.0, 10.0).all()
+    assert set(table['c']).issubset({-1.0, 0.0, 1.0})
+    assert table['n_points'].between(2, 20).all()
+    assert np.issubdtype(table['n_points'].dtype, np.integer)
+
+    # Seeded designs are reproducible
+    again = create_doe_table(param_ranges, design_type=design_type, n_samples=16, seed=0)
+    pd.testing.assert_frame_equal(table, again)
+
+
+def test_latin_hypercube_stratifies_each_factor():
+    table = create_doe_table({'a': (0.0, 1.0), 'b': (0.0, 1.0)}, design_type='latin_hypercube', n_samples=10, seed=1)
+    for col in ['a', 'b']:
+        bins = np.floor(table[col].to_numpy() * 10).astype(int)
+        assert sorted(bins) == list(range(10))
+
+
+@pytest.mark.parametrize("design_type", ['latin_hypercube', 'random'])
+def test_space_filling_integer_ranges_include_both_bounds(design_type):
+    table = create_doe_table({'flag': (0, 1), 'k': (2, 4)}, design_type=design_type, n_samples=30, seed=0)
+    assert set(table['flag']) == {0, 1}
+    assert set(table['k']) == {2, 3, 4}
+
+
+def test_space_filling_requires_n_samples():
+    with pytest.raises(ValueError):
+        create_doe_table({'a': (0.0, 1.0)}, design_type='sobol')
+
+
+def test_fractional_factorial_automatic_generators():
+    param_ranges = {name: (0.0, 1.0) for name in 'abcdefg'}
+    table = create_doe_table(param_ranges, design_type='fractional_factorial')
+    # 7 factors fit in a saturated 2^(7-4) design with 8 runs
+    assert table.shape == (8, 7)
+    coded = table.to_numpy() * 2 - 1
+    # Columns are balanced and mutually orthogonal
+    assert np.all(coded.sum(axis=0) == 0)
+    assert np.allclose(coded.T @ coded, 8 * np.eye(7))
+
+
+def test_fractional_factorial_explicit_generators():
+    param_ranges = {'a': [1, 2], 'b': [10, 20], 'c': [100, 200], 'd': ['lo', 'hi']}
+    table = create_doe_table(param_ranges, design_type='fractional_factorial', generators={'d': 'a*b*c'})
+    assert table.shape == (8, 4)
+    coded = {k: np.where(table[k] == v[0], -1, 1) for k, v in param_ranges.items()}
+    assert np.array_equal(coded['d'], coded['a'] * coded['b'] * coded['c'])
+
+    with pytest.raises(ValueError):
+        create_doe_table(param_ranges, design_type='fractional_factorial', generators={'d': 'a*x'})
+
+
+def test_fractional_factorial_rejects_mismatched_n_samples():
+    param_ranges = {name: (0.0, 1.0) for name in 'abc'}
+    assert len(create_doe_table(param_ranges, design_type='fractional_factorial', n_samples=8)) == 8
+    with pytest.raises(ValueError, match="exceeds"):
+        create_doe_table(param_ranges, design_type='fractional_factorial', n_samples=16)
+    with pytest.raises(ValueError, match="n_samples=16"):
+        create_doe_table(param_ranges, design_type='fractional_factorial', n_samples=16, generators={'c': 'a*b'})
+
+
+def test_unsupported_design_type():
+    with pytest.raises(ValueError):
+        create_doe_table({'a': [1, 2]}, design_type='taguchi')
+
+
+def test_run_parameter_sweep_with_design_table(linear_base_config, tmp_path):
+    design = create_doe_table({'m': (0.0, 2.0), 'c': (-1.0, 1.0)}, design_type='halton', n_samples=5, seed=3)
+    results = run_parameter_sweep(LinearFunctionExperiment, linear_base_config, design, output_dir=str(tmp_path))
+    assert len(results) == 5
+    for row, run in zip(design.to_dict('records'), results):
+        assert run['params'] == row
+        assert np.allclose(run['results']['y']['data'], row['m'] * run['results']['x']['data'] + row['c'])
+
+
+def test_run_adaptive_sweep_refines_steep_region(linear_base_config):
+    from simulator.doe import run_adaptive_sweep
+
+    def summary(results):
+        # y[0] == c, so the summary is a sharp step around c = 0.3
+        return float(np.tanh(20 * (results['y']['data'][0] - 0.3)))
+
+    sweep = run_adaptive_sweep(LinearFunctionExperiment, dict(linear_base_config, m=1.0),
+                               {'c': (0.0, 1.0)}, summary, initial_levels=5, max_runs=15,
+                               output_dir=None)
+    assert len(sweep) == 15
+    assert sweep.attrs['stop_reason'] == 'budget'
+    refined = sweep.params[sweep.params['iteration'] > 0]['c']
+    # Refinement concentrates around the step, not in the flat region above 0.5
+    assert (refined.between(0.0, 0.5)).all()
+    assert len(sweep.attrs['history']) == 11
+    assert sweep.attrs['history'][0]['n_runs'] == 5
+
+
+def test_run_adaptive_sweep_tolerance(linear_base_config, tmp_path):
+    from simulator.doe import run_adaptive_sweep
+
+    # y[-1] == 4 * m, so links must be shorter than 0.075 in m to get below the tolerance
+    sweep = run_adaptive_sweep(LinearFunctionExperiment, dict(linear_base_config, c=0.0),
+                               {'m': (0.0, 1.0)}, lambda r: float(r['y']['data'][-1]),
+                               initial_levels=3, max_runs=200, tolerance=0.3, batch_size=4,
+                               output_dir=str(tmp_path))
+    assert sweep.attrs['stop_reason'] == 'tolerance'
+    assert 17 <= len(sweep) < 30
+    assert sweep.params['record_id'].notna().all()
+
+
+def test_run_adaptive_sweep_integer_bounds(linear_base_config):
+    from simulator.doe import run_adaptive_sweep
+
+    sweep = run_adaptive_sweep(LinearFunctionExperiment, dict(linear_base_config, m=1.0, c=0.0),
+                               {'n_points': (2, 10)}, lambda r: float(len(r['y']['data'])),
+                               initial_levels=2, max_runs=100, output_dir=None)
+    # Integer parameters stop refining once every value has been run
+    assert sweep.attrs['stop_reason'] == 'resolution'
+    assert sorted(sweep.params['n_points']) == list(range(2, 11))
+
+
+@pytest.fixture
+def predator_prey_base_config():
+    return {
+        'n_steps': 40, 'initial_prey': 100, 'initial_predators': 20,
+        'predator_growth_rate': 0.01, 'predator_death_rate': 0.05,
+    }
+
+
+def test_run_successive_halving(predator_prey_base_config):
+    from simulator.doe import run_successive_halving
+    from experiments.predator_prey.logic import PredatorPreyExperiment
+
+    param_ranges = {'prey_growth_rate': [0.05, 0.1, 0.15, 0.2], 'prey_death_rate': [0.01, 0.02]}
+    sweep = run_successive_halving(PredatorPreyExperiment, predator_prey_base_config, param_ranges,
+                                   objective=lambda r: abs(r['prey_population']['data'][-1] - 50.0),
+                                   min_steps=10, eta=2, keep_fraction=0.5, output_dir=None)
+    assert sweep.attrs['horizons'] == [10, 20, 40]
+    table = sweep.params
+    assert list(table.groupby('rung').size()) == [8, 4, 2]
+    assert list(table.groupby('rung')['n_steps'].first()) == [10, 20, 40]
+    # Promoted runs continue from their checkpoint
+    assert table[table['rung'] > 0]['resumed'].all()
+    assert table[table['rung'] == 0]['promoted'].sum() == 4
+    assert np.array_equal(sweep.row_lengths('prey_population'), table['n_steps'] + 1)
+
+    # A resumed run matches a fresh run over the full horizon
+    final = sweep.sel(rung=2)
+    best = final.params.iloc[0]
+    fresh = PredatorPreyExperiment(dict(predator_prey_base_config, prey_growth_rate=best['prey_growth_rate'],
+                                        prey_death_rate=best['prey_death_rate']))
+    state = fresh.initialize({})
+    for step in range(40):
+        state = fresh.run_step(state, step)
+    assert np.allclose(final['prey_population'][0], fresh.get_results()['prey_population']['data'])
+    assert sweep.attrs['best'] == {k: best[k] for k in param_ranges}
+
+
+def test_run_successive_halving_without_resume(linear_base_config):
+    from simulator.doe import run_successive_halving
+
+    sweep = run_successive_halving(LinearFunctionExperiment, dict(linear_base_config, n_steps=8),
+                                   {'m': [1.0, 2.0, 3.0], 'c': [0.0]}, objective=lambda r: r['y']['data'][-1],
+                                   min_steps=2, maximize=True, output_dir=None)
+    assert not sweep.params['resumed'].any()
+    assert sweep.attrs['best'] == {'m': 3.0, 'c': 0.0}
+
+
+def test_run_parameter_sweep_reuses_n_steps_prefixes(predator_prey_base_config, tmp_path):
+    from experiments.predator_prey.logic import PredatorPreyExperiment
+    from simulator.persistence import load_experiment_record
+
+    created = []
+
+    class CountingPredatorPrey(PredatorPreyExperiment):
+        def __init__(self, config):
+            created.append(config['n_steps'])
+            super().__init__(config)
+
+    base_config = dict(predator_prey_base_config, prey_death_rate=0.02)
+    param_ranges = {'n_steps': [5, 20, 10], 'prey_growth_rate': [0.1, 0.2]}
+    reused = run_parameter_sweep(CountingPredatorPrey, base_config, param_ranges, output_dir=str(tmp_path))
+    assert sorted(created) == [20, 20]
+
+    full = run_parameter_sweep(CountingPredatorPrey, base_config, param_ranges, output_dir=None,
+                               reuse_prefixes=False)
+    assert len(created) == 8
+    for derived, direct in zip(reused, full):
+        assert derived['params'] == direct['params']
+        for name in ['time', 'prey_population', 'predator_population']:
+            assert np.allclose(derived['results'][name]['data'], direct['results'][name]['data'])
+            assert derived['results'][name]['descriptor'].shape == direct['results'][name]['descriptor'].shape
+
+    derived_run = reused[0]  # n_steps=5, served from the n_steps=20 run
+    record = load_experiment_record(str(tmp_path), derived_run['record_id'])
+    assert record.provenance['method'] == 'prefix_slice'
+    assert record.provenance['source_n_steps'] == 20
+    assert record.provenance['derived_from'] == reused[2]['record_id']
+    assert load_experiment_record(str(tmp_path), reused[2]['record_id']).provenance == {}
+
+
+def test_run_parameter_sweep_adaptive_integrator_is_not_sliced(predator_prey_base_config):
+    from experiments.predator_prey.logic import PredatorPreyExperiment
+
+    created = []
+
+    class CountingPredatorPrey(PredatorPreyExperiment):
+        def __init__(self, config):
+            created.append(config['n_steps'])
+            super().__init__(config)
+
+    base_config = dict(predator_prey_base_config, prey_death_rate=0.02, prey_growth_rate=0.1,
+                       integrator='RK45', rtol=1e-3, atol=1e-3)
+    runs = run_parameter_sweep(CountingPredatorPrey, base_config, {'n_steps': [30, 200]}, output_dir=None)
+    assert sorted(created) == [30, 200]  # Adaptive steps depend on the horizon: every run is direct
+    direct = run_parameter_sweep(PredatorPreyExperiment, dict(base_config, n_steps=30), {'prey_growth_rate': [0.1]},
+                                 output_dir=None)
+    assert np.array_equal(runs[0]['results']['prey_population']['data'], direct[0]['results']['prey_population']['data'])
+
+
+def test_run_parameter_sweep_prefix_opt_out(tmp_path):
+    from experiments.example_random_walk.logic import RandomWalkExperiment
+
+    results = run_parameter_sweep(RandomWalkExperiment, {'step_size': 1.0}, {'n_steps': [3, 6]},
+                                  output_dir=None)
+    assert [len(r['results']['position']['data']) for r in results] == [4, 7]
+
+
+def test_run_parameter_sweep_slices_only_step_indexed_outputs():
+    from experiments.example_experiment.logic import ExampleExperiment
+    from simulator.base import ExperimentLogic
+
+    created = []
+
+    class WithFinalValue(ExampleExperiment):
+        vectorized_sweeps = False
+
+        def __init__(self, config):
+            created.append(config['n_steps'])
+            super().__init__(config)
+
+        def get_results(self):
+            results = super().get_results()
+            value = results['value']['data']
+            results['final_value'] = {'data': float(value[-1]), 'descriptor': DataDescriptor('final_value', DataType.FLOAT)}
+            return results
+
+    runs = run_parameter_sweep(WithFinalValue, {'amplitude': 2.0}, {'n_steps': [3, 6]}, output_dir=None)
+    assert sorted(created) == [3, 6]  # The scalar output cannot be sliced from the longer run
+    assert runs[0]['results']['final_value']['data'] == pytest.approx(2.0 * np.sin(2))
+    assert len(runs[0]['results']['value']['data']) == 3
+
+    # Experiments that do not opt in always run every horizon
+    assert ExperimentLogic.prefix_consistent is False
+
+
+def test_run_parameter_sweep_warm_starts_shared_initial_state(tmp_path):
+    from experiments.data_analysis.logic import DataAnalysisExperiment
+
+    csv_file = tmp_path / "data.csv"
+    pd.DataFrame({'time': [0, 1, 2], 'value': [10.0, 12.0, 11.0]}).to_csv(csv_file, index=False)
+    initialized = []
+
+    class CountingAnalysis(DataAnalysisExperiment):
+        def initialize(self, config):
+            initialized.append(config['label'])
+            return super().initialize(config)
+
+    results = run_parameter_sweep(CountingAnalysis, {'input_data_path': str(csv_file)},
+                                  {'label': ['a', 'b', 'c']}, output_dir=None)
+    assert initialized == ['a']
+    assert [r['results']['mean']['data'] for r in results] == [11.0, 11.0, 11.0]
+
+
+def test_share_state_hands_out_read_only_views():
+    from simulator.doe import _share_state
+
+    state = {'array': np.arange(3.0), 'frame': pd.DataFrame({'a': [1, 2]}), 'nested': [np.ones(2)]}
+    shared = _share_state(state)
+    assert np.shares_memory(shared['array'], state['array'])
+    with pytest.raises(ValueError):
+        shared['array'][0] = 5.0
+    with pytest.raises(ValueError):
+        shared['nested'][0][0] = 5.0
+    shared['frame'].loc[0, 'a'] = 100
+    assert state['frame'].loc[0, 'a'] == 1
+
+
+def test_run_parameter_sweep_workers_with_shared_inputs(predator_prey_base_config, tmp_path):
+    from experiments.predator_prey_calibration.logic import PredatorPreyCalibrationExperiment
+    from simulator.persistence import load_experiment_record
+
+    observed = tmp_path / "observed.csv"
+    pd.DataFrame({'time': np.arange(8), 'prey_population': np.linspace(100, 80, 8),
+                  'predator_population': np.linspace(20, 25, 8)}).to_csv(observed, index=False)
+    base_config = dict(predator_prey_base_config, prey_death_rate=0.02, observed_data_path=str(observed))
+    param_ranges = {'prey_growth_rate': [0.1, 0.15, 0.2, 0.25]}
+
+    serial = run_parameter_sweep(PredatorPreyCalibrationExperiment, base_config, param_ranges, output_dir=None)
+    parallel = run_parameter_sweep(PredatorPreyCalibrationExperiment, base_config, param_ranges,
+                                   output_dir=str(tmp_path / "out"), n_workers=2, shared_inputs=[str(observed)])
+    for a, b in zip(serial, parallel):
+        assert a['params'] == b['params']
+        assert np.allclose(a['results']['prey_population']['data'], b['results']['prey_population']['data'])
+        pd.testing.assert_frame_equal(a['results']['observed_data']['data'], b['results']['observed_data']['data'])
+        # Workers never read the observed data file themselves
+        record = load_experiment_record(str(tmp_path / "out"), b['record_id'])
+        assert record.performance['dataset_cache']['misses'] == 0
+
+
+@pytest.mark.parametrize("transport", ["shm", "memmap", "pickle"])
+def test_run_parameter_sweep_result_transport(predator_prey_base_config, transport, monkeypatch):
+    from experiments.predator_prey.logic import PredatorPreyExperiment
+    monkeypatch.setattr("simulator.result_channel.MIN_SHARED_NBYTES", 0)
+    param_ranges = {'prey_growth_rate': [0.1, 0.2], 'prey_death_rate': [0.01, 0.02]}
+    serial = run_parameter_sweep(PredatorPreyExperiment, predator_prey_base_config, param_ranges, output_dir=None)
+    parallel = run_parameter_sweep(PredatorPreyExperiment, predator_prey_base_config, param_ranges,
+                                   output_dir=None, n_workers=2, result_transport=transport)
+    for a, b in zip(serial, parallel):
+        assert isinstance(b['results']['prey_population']['data'], np.ndarray)
+        assert np.array_equal(a['results']['prey_population']['data'], b['results']['prey_population']['data'])
+    with pytest.raises(ValueError):
+        run_parameter_sweep(PredatorPreyExperiment, predator_prey_base_config, param_ranges,
+                            output_dir=None, result_transport='pipe')
+
+
+def test_run_parameter_sweep_decimated_recording_runs_every_horizon(predator_prey_base_config):
+    from experiments.predator_prey.logic import PredatorPreyExperiment
+    base_config = dict(predator_prey_base_config, prey_growth_rate=0.1, prey_death_rate=0.02,
+                       recording={'mode': 'every', 'k': 4})
+    runs = run_parameter_sweep(PredatorPreyExperiment, base_config, {'n_steps': [6, 10]}, output_dir=None)
+    assert np.array_equal(runs[0]['results']['time']['data'], [0, 4, 6])
+    assert np.array_equal(runs[1]['results']['time']['data'], [0, 4, 8, 10])
+
+
+@pytest.mark.parametrize("integrator", ["euler", "RK45"])
+def test_run_parameter_sweep_batches_ode_runs(predator_prey_base_config, integrator, tmp_path):
+    from experiments.predator_prey.logic import PredatorPreyExperiment
+
+    base_config = dict(predator_prey_base_config, integrator=integrator)
+    param_ranges = {'prey_growth_rate': [0.05, 0.1, 0.15], 'prey_death_rate': [0.01, 0.02]}
+    batched = run_parameter_sweep(PredatorPreyExperiment, base_config, param_ranges, output_dir=str(tmp_path),
+                                  batch_size=1024)
+    single = run_parameter_sweep(PredatorPreyExperiment, base_config, param_ranges, output_dir=None)
+    for run, reference in zip(batched, single):
+        assert run['params'] == reference['params']
+        assert np.allclose(run['results']['prey_population']['data'],
+                           reference['results']['prey_population']['data'], rtol=1e-4)
+    assert len(os.listdir(tmp_path)) == 6
+
+
+def test_run_parameter_sweep_vectorized(linear_base_config, tmp_path):
+    param_ranges = {'m': [1.0, 2.0, 3.0], 'c': [0.0, 1.0]}
+    vectorized = run_parameter_sweep(LinearFunctionExperiment, linear_base_config, param_ranges,
+                                     output_dir=str(tmp_path / "runs"), batch_size=4)
+    single = run_parameter_sweep(LinearFunctionExperiment, linear_base_config, param_ranges,
+                                 output_dir=None, batch_size=None)
+    for run, reference in zip(vectorized, single):
+        assert run['params'] == reference['params']
+        assert np.array_equal(run['results']['y']['data'], reference['results']['y']['data'])
+    assert len(os.listdir(tmp_path / "runs")) == 6  # Still one record per combination
+
+    stacked = run_parameter_sweep(LinearFunctionExperiment, linear_base_config, param_ranges, output_dir=None,
+                                  output_transform='stacked', stacked_dir=str(tmp_path / "store"), batch_size=4)
+    assert stacked['y'].shape == (6, 5) and isinstance(stacked['y'], np.memmap)
+    assert np.array_equal(stacked['y'][5], single[5]['results']['y']['data'])
+
+
+def test_run_parameter_sweep_vectorized_falls_back(linear_base_config):
+    # Outputs of different lengths cannot be computed together
+    results = run_parameter_sweep(LinearFunctionExperiment, linear_base_config,
+                                  {'m': [1.0], 'c': [0.0], 'n_points': [3, 5]}, output_dir=None, batch_size=4)
+    assert [len(r['results']['y']['data']) for r in results] == [3, 5]
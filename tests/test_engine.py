@@ -62,6 +62,7 @@ def test_run_experiment_valid_config(temp_test_dir):
     assert len(record.output_data) == 2
     assert record.output_data['time']['descriptor'].name == "time"
     assert record.output_data['value']['data'][0] == 0.0
+    assert 'hit_rate' in record.performance['dataset_cache']
 
 
 
@@ -114,4 +115,54 @@ def test_load_experiment_record_nonexistent(temp_test_dir):
     """Test loading a non-existent experiment record."""
     engine = SimulatorEngine(output_dir=temp_test_dir)
     with pytest.raises(FileNotFoundError):
-        engine.load_experiment_record("nonexistent_id")
\ No newline at end of file
+        engine.load_experiment_record("nonexistent_id")
+
+
+def test_run_experiment_results_format(temp_test_dir):
+    """results_format selects the table writer (here gzip-compressed CSV)."""
+    import pandas as pd
+    engine = SimulatorEngine(output_dir=temp_test_dir)
+    config_path = os.path.join(temp_test_dir, "config.yaml")
+    with open(config_path, "w") as f:
+        yaml.dump({
+            "experiment_type": "experiments.example_experiment.logic.ExampleExperiment",
+            "n_steps": 3,
+            "amplitude": 5,
+            "results_format": "csv.gz",
+        }, f)
+
+    experiment_id = engine.run_experiment(str(config_path))
+    experiment_dir = next(os.path.join(temp_test_dir, item) for item in os.listdir(temp_test_dir) if experiment_id in item)
+    results_path = os.path.join(experiment_dir, "results.csv.gz")
+    assert os.path.exists(results_path)
+    assert len(pd.read_csv(results_path)) > 0
+
+
+def test_run_experiment_spills_to_output_arrays(temp_test_dir):
+    """Over the memory budget, recorded columns are memory-mapped files that the record references in place."""
+    import numpy as np
+    engine = SimulatorEngine(output_dir=temp_test_dir)
+    config_path = os.path.join(temp_test_dir, "config.yaml")
+    with open(config_path, "w") as f:
+        yaml.dump({
+            "experiment_type": "experiments.predator_prey.logic.PredatorPreyExperiment",
+            "n_steps": 50,
+            "initial_prey": 100,
+            "initial_predators": 20,
+            "prey_growth_rate": 0.1,
+            "prey_death_rate": 0.01,
+            "predator_growth_rate": 0.01,
+            "predator_death_rate": 0.1,
+            "recording": {"mode": "all", "memory_budget": 0},
+        }, f)
+
+    experiment_id = engine.run_experiment(str(config_path))
+    experiment_dir = next(os.path.join(temp_test_dir, item) for item in os.listdir(temp_test_dir) if experiment_id in item)
+    with open(os.path.join(experiment_dir, "experiment_record.json")) as f:
+        data = json.load(f)
+    assert data["output_data"]["prey_population"]["data"] == {"__ndarray__": os.path.join("output_arrays", "prey_population.npy")}
+
+    record = engine.load_experiment_record(experiment_id)
+    prey = record.output_data["prey_population"]["data"]
+    assert prey.shape == (51,) and prey[0] == 100
+    assert np.array_equal(prey, np.load(os.path.join(experiment_dir, "output_arrays", "prey_population.npy")))
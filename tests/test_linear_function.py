@@ -48,4 +48,15 @@ def test_linear_function_get_results(linear_function_config):
     assert np.isclose(results['x']['data'][0], 0.0)
     assert np.isclose(results['x']['data'][4], 4.0)
     assert np.isclose(results['y']['data'][0], 1.0)  # y = 2*0 + 1
-    assert np.isclose(results['y']['data'][4], 9.0)  # y = 2*4 + 1
\ No newline at end of file
+    assert np.isclose(results['y']['data'][4], 9.0)  # y = 2*4 + 1
+
+
+def test_linear_function_get_results_batch(linear_function_config):
+    import pandas as pd
+    table = pd.DataFrame([dict(linear_function_config, m=m, c=c) for m, c in [(2, 1), (0.5, -1), (1, 0)]])
+    batch = LinearFunctionExperiment.get_results_batch(table)
+    assert batch['y']['data'].shape == (3, 5)
+    for i, config in enumerate(table.to_dict('records')):
+        results = LinearFunctionExperiment(config).get_results()
+        assert np.allclose(batch['x']['data'][i], results['x']['data'])
+        assert np.allclose(batch['y']['data'][i], results['y']['data'])
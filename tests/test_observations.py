@@ -0,0 +1,55 @@
+# tests/test_observations.py
+import pytest
+from simulator.observations import ObservationMap, sse, weighted_sse, gaussian_log_likelihood, stack_outputs
+import numpy as np
+
+
+def test_observation_map_interpolates():
+    grid = np.array([0.0, 1.0, 2.0, 4.0])
+    mapping = ObservationMap([0.0, 0.5, 3.0, 4.0], grid)
+    assert list(mapping.left) == [0, 0, 2, 2]
+    assert np.allclose(mapping.weight, [0.0, 0.5, 0.5, 1.0])
+    simulated = np.array([[0.0, 2.0, 4.0, 8.0], [1.0, 1.0, 1.0, 1.0]])  # A batch of two trajectories
+    assert np.allclose(mapping.interpolate(simulated), [[0.0, 1.0, 6.0, 8.0], [1.0, 1.0, 1.0, 1.0]])
+    assert np.allclose(mapping.interpolate(simulated[0]), np.interp(mapping.times, grid, simulated[0]))
+
+
+def test_observation_map_rejects_times_outside_grid():
+    with pytest.raises(ValueError):
+        ObservationMap([0.0, 5.0], np.arange(5))
+    with pytest.raises(ValueError):
+        ObservationMap([0.0], [0.0, 2.0, 1.0])
+
+
+def test_losses_over_batches():
+    rng = np.random.default_rng(0)
+    grid = np.arange(11.0)
+    times = np.array([0.0, 2.5, 7.0, 9.9])
+    mapping = ObservationMap(times, grid)
+    simulated = rng.normal(size=(5, 2, 11))  # (batch, columns, grid)
+    observed = rng.normal(size=(2, 4))
+    observed[1, 2] = np.nan  # Missing observations are skipped
+
+    aligned = np.array([[np.interp(times, grid, trajectory) for trajectory in run] for run in simulated])
+    valid = ~np.isnan(observed)
+    residuals = np.where(valid, aligned - np.nan_to_num(observed), 0.0)
+    assert np.allclose(sse(simulated, observed, mapping), (residuals ** 2).sum(axis=(1, 2)))
+
+    weights = np.array([[1.0], [4.0]])
+    assert np.allclose(weighted_sse(simulated, observed, mapping, weights),
+                       (weights * residuals ** 2).sum(axis=(1, 2)))
+
+    sigma = np.array([[0.5], [2.0]])
+    expected = -0.5 * ((residuals / sigma) ** 2 + np.where(valid, np.log(2 * np.pi * sigma ** 2), 0)).sum(axis=(1, 2))
+    assert np.allclose(gaussian_log_likelihood(simulated, observed, mapping, sigma), expected)
+
+
+def test_failed_runs_score_nan():
+    mapping = ObservationMap([0.0, 1.0], [0.0, 1.0])
+    losses = sse(np.array([[1.0, 2.0], [np.nan, 2.0]]), np.array([1.0, 1.0]), mapping)
+    assert losses[0] == 1.0 and np.isnan(losses[1])
+
+
+def test_stack_outputs():
+    results = [{'a': {'data': np.arange(3)}, 'b': {'data': np.ones(3)}} for _ in range(2)]
+    assert stack_outputs(results, ['a', 'b']).shape == (2, 2, 3)
@@ -0,0 +1,139 @@
+# tests/test_ode.py
+import pytest
+from simulator.ode import ODEExperiment, rk4_integrate
+from experiments.predator_prey.logic import PredatorPreyExperiment
+import numpy as np
+
+
+class DecayExperiment(ODEExperiment):
+    state_names = ('x',)
+
+    def __init__(self, config):
+        self.rate = config['rate']
+        super().__init__(config)
+
+    def rhs(self, t, y):
+        return -self.rate * y
+
+
+def run(experiment_class, config):
+    experiment = experiment_class(config)
+    state = experiment.initialize(config)
+    experiment.advance(state, 0, config['n_steps'])
+    return experiment.get_results()
+
+
+@pytest.mark.parametrize("integrator", ["RK45", "LSODA", "DOP853", "rk4"])
+def test_integrators_match_exact_solution(integrator):
+    config = {'n_steps': 50, 'dt': 0.1, 'rate': 0.5, 'initial_x': 2.0, 'integrator': integrator,
+              'rtol': 1e-8, 'atol': 1e-10, 'substeps': 4}
+    results = run(DecayExperiment, config)
+    time = results['time']['data']
+    assert np.allclose(time, np.arange(51) * 0.1)
+    assert np.allclose(results['x']['data'], 2.0 * np.exp(-0.5 * time), rtol=1e-6)
+
+
+def test_output_times_grid():
+    config = {'n_steps': 10, 'rate': 1.0, 'initial_x': 1.0, 'integrator': 'RK45', 'rtol': 1e-9,
+              'output_times': [0.5, 2.0, 7.25]}
+    results = run(DecayExperiment, config)
+    assert np.array_equal(results['time']['data'], [0.5, 2.0, 7.25])
+    assert np.allclose(results['x']['data'], np.exp(-np.array([0.5, 2.0, 7.25])), rtol=1e-6)
+
+
+def test_advance_matches_step_by_step():
+    config = {'n_steps': 20, 'rate': 0.3, 'initial_x': 1.0, 'integrator': 'rk4', 'substeps': 2}
+    stepped = DecayExperiment(config)
+    state = stepped.initialize(config)
+    for step in range(20):
+        state = stepped.run_step(state, step)
+    assert np.allclose(stepped.get_results()['x']['data'], run(DecayExperiment, config)['x']['data'])
+
+
+def test_predator_prey_adaptive_is_accurate():
+    config = {'n_steps': 200, 'initial_prey': 40, 'initial_predators': 9, 'prey_growth_rate': 0.1,
+              'prey_death_rate': 0.02, 'predator_growth_rate': 0.01, 'predator_death_rate': 0.1}
+    reference = run(PredatorPreyExperiment, dict(config, integrator='DOP853', rtol=1e-11, atol=1e-11))
+    for integrator in ('LSODA', 'RK45'):
+        results = run(PredatorPreyExperiment, dict(config, integrator=integrator, rtol=1e-8, atol=1e-8))
+        assert np.allclose(results['prey_population']['data'], reference['prey_population']['data'], rtol=1e-4)
+    # Default Euler steps keep the per-step update of run_step
+    euler = run(PredatorPreyExperiment, config)
+    assert euler['time']['data'].dtype == np.int64 and len(euler['prey_population']['data']) == 201
+
+
+def test_rhs_is_required():
+    class NoRhs(ODEExperiment):
+        state_names = ('x',)
+
+    with pytest.raises(TypeError):
+        NoRhs({'n_steps': 5, 'initial_x': 1.0})
+
+
+def test_invalid_integrator_settings():
+    with pytest.raises(ValueError):
+        DecayExperiment({'n_steps': 5, 'rate': 1.0, 'initial_x': 1.0, 'integrator': 'leapfrog'})
+    with pytest.raises(ValueError):
+        DecayExperiment({'n_steps': 5, 'rate': 1.0, 'initial_x': 1.0, 'output_times': [0, 1]})
+
+
+def test_rk4_integrate_batched_state():
+    rates = np.array([0.5, 1.0, 2.0])
+    values = rk4_integrate(lambda t, y: -rates * y, np.ones((1, 3)), np.linspace(0, 1, 11), substeps=5)
+    assert values.shape == (11, 1, 3)
+    assert np.allclose(values[-1, 0], np.exp(-rates), rtol=1e-6)
+
+
+@pytest.mark.parametrize("integrator", ["euler", "rk4", "RK45", "LSODA"])
+def test_run_batch_matches_single_runs(integrator):
+    configs = [{'n_steps': 30, 'dt': 0.5, 'rate': rate, 'initial_x': x0, 'integrator': integrator,
+                'rtol': 1e-8, 'atol': 1e-10} for rate, x0 in [(0.1, 1.0), (0.5, 2.0), (1.0, 3.0)]]
+    results, failed = DecayExperiment.run_batch(configs)
+    assert not failed.any()
+    for config, batch_results in zip(configs, results):
+        assert np.allclose(batch_results['x']['data'], run(DecayExperiment, config)['x']['data'], rtol=1e-6)
+        assert np.allclose(batch_results['time']['data'], np.arange(31) * 0.5)
+
+
+def test_run_batch_masks_failed_rows():
+    class Blowup(DecayExperiment):
+        def rhs(self, t, y):
+            return -self.rate * y ** 2  # Finite-time blow-up for negative rates
+
+    configs = [{'n_steps': 20, 'rate': rate, 'initial_x': 1.0, 'integrator': 'RK45'} for rate in (1.0, -1.0)]
+    results, failed = Blowup.run_batch(configs)
+    assert list(failed) == [False, True]
+    assert np.allclose(results[0]['x']['data'], 1.0 / (1.0 + np.arange(21)), rtol=1e-5)
+    assert np.isnan(results[1]['x']['data'][-1])
+
+
+def test_memory_follows_the_recording_policy():
+    import tracemalloc
+    n_steps = 4_000_000
+    config = {'n_steps': n_steps, 'dt': 1e-5, 'rate': 0.5, 'initial_x': 1.0, 'integrator': 'RK45',
+              'recording': {'mode': 'every', 'k': 100_000}}
+    tracemalloc.start()
+    try:
+        results = run(DecayExperiment, config)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    time = results['time']['data']
+    assert np.allclose(time, np.arange(0, n_steps + 1, 100_000) * 1e-5)
+    assert np.allclose(results['x']['data'], np.exp(-0.5 * time), rtol=1e-6)
+    assert peak < 8 * 1024 ** 2  # The full grid alone would be 32 MB
+
+
+@pytest.mark.parametrize("integrator", ["rk4", "RK45", "euler"])
+def test_chunked_grid_matches_single_chunk(integrator, monkeypatch):
+    from simulator import ode
+    configs = [{'n_steps': 40, 'dt': 0.25, 'rate': rate, 'initial_x': 1.0, 'integrator': integrator,
+                'substeps': 2, 'recording': {'mode': 'every', 'k': 3}} for rate in (0.2, 0.7)]
+    expected = run(DecayExperiment, configs[0])
+    expected_batch, _ = DecayExperiment.run_batch(configs)
+    monkeypatch.setattr(ode, 'OUTPUT_CHUNK_ROWS', 7)
+    assert np.array_equal(run(DecayExperiment, configs[0])['time']['data'], expected['time']['data'])
+    assert np.allclose(run(DecayExperiment, configs[0])['x']['data'], expected['x']['data'], rtol=1e-12)
+    for results, reference in zip(DecayExperiment.run_batch(configs)[0], expected_batch):
+        assert np.array_equal(results['time']['data'], reference['time']['data'])
+        assert np.allclose(results['x']['data'], reference['x']['data'], rtol=1e-5)
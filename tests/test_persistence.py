@@ -86,4 +86,29 @@ def test_save_and_load_record(example_record, temp_output_dir):
 def test_load_record_not_found(temp_output_dir):
     """Test loading a record with a non-existent experiment ID."""
     with pytest.raises(FileNotFoundError):
-        load_experiment_record(temp_output_dir, "nonexistent_id")
\ No newline at end of file
+        load_experiment_record(temp_output_dir, "nonexistent_id")
+
+def test_streaming_writer_matches_to_dict(example_record, monkeypatch):
+    """The streamed JSON decodes to exactly what to_dict() produces."""
+    import io
+    from simulator.persistence import write_experiment_record
+    monkeypatch.setattr("simulator.persistence.STREAM_CHUNK_ITEMS", 3)  # Force several chunks per array
+    example_record.add_output_data("long", np.arange(10.0).reshape(5, 2), DataDescriptor("long", DataType.NDARRAY))
+    buffer = io.StringIO()
+    write_experiment_record(example_record, buffer)
+    assert json.loads(buffer.getvalue()) == example_record.to_dict()
+    assert "\n" not in buffer.getvalue()
+
+
+def test_sidecar_arrays_round_trip(example_record, temp_output_dir):
+    """Large arrays can be written as .npy sidecars and are loaded back as arrays."""
+    big = np.linspace(0, 1, 1000)
+    example_record.add_output_data("big", big, DataDescriptor("big", DataType.NDARRAY, shape=big.shape))
+    saved_dir = save_experiment_record(example_record, temp_output_dir, sidecar_min_nbytes=1024)
+    assert os.path.exists(os.path.join(saved_dir, "output_arrays", "big.npy"))
+    assert not os.path.exists(os.path.join(saved_dir, "experiment_record.json.tmp"))
+
+    loaded_record = load_experiment_record(temp_output_dir, example_record.experiment_id)
+    assert isinstance(loaded_record.output_data["big"]["data"], np.ndarray)
+    assert np.array_equal(loaded_record.output_data["big"]["data"], big)
+    assert loaded_record.output_data["output_array"]["data"] == [1, 2, 3]  # Small arrays stay inline
@@ -70,4 +70,32 @@ def test_calibration_missing_file(tmp_path):
         'observed_data_path': str(tmp_path / "missing.csv")  # Non-existent file
     }
     experiment = PredatorPreyCalibrationExperiment(config)  # Should not raise an error
-    assert experiment.observed_data_info is None  # observed_data_info should be None
\ No newline at end of file
+    assert experiment.observed_data_info is None  # observed_data_info should be None
+
+
+def test_calibration_warm_start(calibration_config):
+    first = PredatorPreyCalibrationExperiment(calibration_config)
+    initial_state = first.initialize(calibration_config)
+
+    # A warm-started instance adopts the loaded data instead of reading the file again
+    config = dict(calibration_config, observed_data_path="does_not_exist.csv")
+    second = PredatorPreyCalibrationExperiment(config)
+    state = second.warm_start(config, initial_state)
+    assert state['prey'] == 100
+    assert second.observed_data_info is first.observed_data_info
+
+
+def test_calibration_irregular_observation_times(calibration_config, tmp_path):
+    from simulator.calibration import observed_sse
+    csv_file = tmp_path / "irregular.csv"
+    pd.DataFrame({'time': [0, 1.5, 3.25], 'prey_population': [100, 90, 85]}).to_csv(csv_file, index=False)
+    config = dict(calibration_config, n_steps=10, observed_data_path=str(csv_file))
+    experiment = PredatorPreyCalibrationExperiment(config)
+    experiment.advance(experiment.initialize(config), 0, config['n_steps'])
+    results = experiment.get_results()
+
+    # The simulation is kept up to the first grid point after the last observation
+    assert list(results['time']['data']) == [0, 1, 2, 3, 4]
+    prey = results['prey_population']['data']
+    expected = np.interp([0, 1.5, 3.25], results['time']['data'], prey)
+    assert observed_sse(results) == pytest.approx(np.sum((expected - [100, 90, 85]) ** 2))
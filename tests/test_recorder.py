@@ -0,0 +1,157 @@
+# tests/test_recorder.py
+import pytest
+from simulator.recorder import Recorder, RecordingPolicy
+from simulator.utils import DataDescriptor, DataType
+from experiments.predator_prey.logic import PredatorPreyExperiment
+import numpy as np
+
+
+def make_recorder(recording=None, n_steps=10):
+    config = {'n_steps': n_steps}
+    if recording is not None:
+        config['recording'] = recording
+    recorder = Recorder.from_config(config, {
+        "time": DataDescriptor("time", DataType.NDARRAY, units="steps"),
+        "value": DataDescriptor("value", DataType.NDARRAY, x_axis="time"),
+    }, index="time")
+    for step in range(n_steps + 1):
+        recorder.record(step, time=step, value=float(step) ** 2)
+    return recorder
+
+
+def test_all_steps_by_default():
+    results = make_recorder().results()
+    assert np.array_equal(results['time']['data'], np.arange(11))
+    assert results['value']['descriptor'].shape == (11,)
+    assert results['value']['descriptor'].x_axis == 'time'
+
+
+def test_every_k_keeps_final_step():
+    recorder = make_recorder({'mode': 'every', 'k': 4})
+    assert np.array_equal(recorder.column('time'), [0, 4, 8, 10])
+    assert np.array_equal(recorder.column('value'), [0.0, 16.0, 64.0, 100.0])
+
+
+def test_last_n_ring_buffer():
+    recorder = make_recorder({'mode': 'last', 'n': 3})
+    assert np.array_equal(recorder.column('time'), [8, 9, 10])
+    assert recorder.results()['value']['descriptor'].shape == (3,)
+    assert np.array_equal(make_recorder({'mode': 'last', 'n': 30}).column('time'), np.arange(11))
+
+
+def test_last_n_results_are_not_overwritten():
+    recorder = make_recorder({'mode': 'last', 'n': 12})  # The buffer wraps only after the extension
+    results = recorder.results()
+    expected = results['time']['data'].copy()
+    recorder.extend(20)
+    for step in range(11, 21):
+        recorder.record(step, time=step, value=float(step) ** 2)
+    assert np.array_equal(results['time']['data'], expected)
+    assert recorder.column('time')[-1] == 20
+
+
+def test_summary_only():
+    recorder = make_recorder('summary')
+    results = recorder.results()
+    assert sorted(results) == ['value_final', 'value_max', 'value_mean', 'value_min', 'value_std']
+    values = np.arange(11.0) ** 2
+    assert np.isclose(results['value_mean']['data'], values.mean())
+    assert np.isclose(results['value_std']['data'], values.std(ddof=1))
+    assert results['value_final']['data'] == 100.0
+    with pytest.raises(ValueError):
+        recorder.column('value')
+
+
+def test_interval_keeps_first_and_final_step():
+    recorder = make_recorder({'mode': 'interval', 'seconds': 3600})
+    assert np.array_equal(recorder.column('time'), [0, 10])
+
+
+def test_invalid_policies():
+    for spec in ('sometimes', {'mode': 'every', 'k': 0}, {'mode': 'last'}, {'mode': 'interval'}):
+        with pytest.raises(ValueError):
+            RecordingPolicy.from_config({'recording': spec})
+
+
+def test_predator_prey_respects_recording_policy():
+    config = {
+        'n_steps': 1000, 'initial_prey': 100, 'initial_predators': 20, 'prey_growth_rate': 0.1,
+        'prey_death_rate': 0.02, 'predator_growth_rate': 0.01, 'predator_death_rate': 0.05,
+    }
+    full = PredatorPreyExperiment(config)
+    decimated = PredatorPreyExperiment(dict(config, recording={'mode': 'every', 'k': 100}))
+    for experiment in (full, decimated):
+        state = experiment.initialize(config)
+        for step in range(config['n_steps']):
+            state = experiment.run_step(state, step)
+    expected = full.get_results()['prey_population']['data'][::100]
+    results = decimated.get_results()
+    assert len(results['prey_population']['data']) == 11
+    assert np.allclose(results['prey_population']['data'], expected)
+
+
+def test_columns_are_preallocated_views():
+    recorder = make_recorder(n_steps=10)
+    data = recorder.column("value")
+    assert data.base is recorder._data["value"]  # No copy on the way out
+    assert recorder.nbytes == 2 * 11 * 8  # Sized for the horizon, nothing more
+    results = recorder.results()
+    assert results["time"]["descriptor"].dtype == np.dtype(np.int64).str
+    assert results["value"]["descriptor"].shape == (11,)
+
+
+def test_columns_grow_without_horizon():
+    recorder = Recorder({"x": DataDescriptor("x", DataType.NDARRAY)})
+    for step in range(3000):
+        recorder.record(step, x=step)
+    assert np.array_equal(recorder.column("x"), np.arange(3000))
+
+
+def test_declared_dtype_and_widening():
+    recorder = Recorder({
+        "x": DataDescriptor("x", DataType.NDARRAY, dtype="<f4"),
+        "y": DataDescriptor("y", DataType.NDARRAY),
+        "v": DataDescriptor("v", DataType.NDARRAY),
+    }, n_steps=2)
+    recorder.record(0, x=0, y=100, v=np.zeros(3))
+    recorder.record(1, x=1, y=99.5, v=np.ones(3))
+    assert recorder.column("x").dtype == np.float32
+    assert np.array_equal(recorder.column("y"), [100.0, 99.5])  # Integer column widened to float
+    assert recorder.column("v").shape == (2, 3)
+
+
+def test_spills_to_memory_mapped_files(tmp_path):
+    recorder = Recorder({"x": DataDescriptor("x", DataType.NDARRAY)},
+                        policy=RecordingPolicy(memory_budget=4096, spill_dir=str(tmp_path)))
+    for step in range(2000):
+        recorder.record(step, x=step)
+    assert recorder.spilled and recorder.nbytes == 0
+    data = recorder.results()["x"]["data"]
+    assert isinstance(data, np.memmap)
+    assert np.array_equal(np.load(recorder.spill_path("x")), np.arange(2000))  # Trimmed to a complete .npy
+    recorder.extend(3000)  # Recording can go on after results()
+    for step in range(2000, 3001):
+        recorder.record(step, x=step)
+    assert np.array_equal(recorder.results()["x"]["data"], np.arange(3001))
+
+
+def test_budget_within_limit_stays_in_memory():
+    recorder = Recorder({"x": DataDescriptor("x", DataType.NDARRAY)}, n_steps=10,
+                        policy=RecordingPolicy(memory_budget=1024))
+    for step in range(11):
+        recorder.record(step, x=float(step))
+    assert not recorder.spilled and type(recorder.column("x")) is np.ndarray
+
+
+@pytest.mark.parametrize("recording", [None, {'mode': 'every', 'k': 3}, {'mode': 'last', 'n': 4}, 'summary'])
+def test_record_many_matches_record(recording):
+    stepped = make_recorder(recording)
+    block = Recorder.from_config(dict({'n_steps': 10}, **({'recording': recording} if recording else {})),
+                                 stepped.columns, index="time")
+    block.record(0, time=0, value=0.0)
+    steps = np.arange(1, 11)
+    block.record_many(steps, time=steps, value=steps.astype(float) ** 2)
+    expected, actual = stepped.results(), block.results()
+    assert expected.keys() == actual.keys()
+    for name in expected:
+        assert np.allclose(expected[name]['data'], actual[name]['data'], equal_nan=True)
@@ -0,0 +1,72 @@
+# tests/test_result_channel.py
+import pytest
+from simulator.result_channel import SharedArray, export_results, import_results
+from simulator.utils import DataDescriptor, DataType
+import numpy as np
+import os
+
+
+@pytest.fixture
+def results():
+    return {
+        "series": {
+            "data": np.linspace(0, 1, 1000).reshape(10, 100),
+            "descriptor": DataDescriptor("series", DataType.NDARRAY, shape=(10, 100)),
+        },
+        "small": {
+            "data": np.arange(3),
+            "descriptor": DataDescriptor("small", DataType.NDARRAY, shape=(3,)),
+        },
+        "total": {"data": 1.5, "descriptor": DataDescriptor("total", DataType.FLOAT)},
+    }
+
+
+@pytest.mark.parametrize("backend", ["shm", "memmap"])
+def test_export_import_round_trip(results, backend):
+    exported = export_results(results, backend=backend, min_nbytes=100)
+    assert isinstance(exported["series"]["data"], SharedArray)
+    assert isinstance(exported["small"]["data"], np.ndarray)  # Below min_nbytes
+    assert exported["total"]["data"] == 1.5
+    assert isinstance(results["series"]["data"], np.ndarray)  # Input left untouched
+
+    imported = import_results(exported)
+    assert np.array_equal(imported["series"]["data"], results["series"]["data"])
+    assert imported["series"]["descriptor"] is results["series"]["descriptor"]
+    if backend == "memmap":
+        assert not os.path.exists(exported["series"]["data"].name)  # Temporary file removed on import
+
+
+def test_memmap_export_to_directory_keeps_files(results, tmp_path):
+    exported = export_results(results, backend="memmap", directory=str(tmp_path), min_nbytes=100)
+    imported = import_results(exported)
+    assert os.path.exists(exported["series"]["data"].name)
+    assert np.array_equal(np.load(exported["series"]["data"].name), imported["series"]["data"])
+
+
+def test_pickle_transport_and_invalid_backend(results):
+    assert export_results(results, backend="pickle") is results
+    with pytest.raises(ValueError):
+        export_results(results, backend="pipe")
+
+
+def test_parallel_shm_sweep_leaves_no_tracked_segments():
+    import subprocess
+    import sys
+    script = (
+        "import simulator.result_channel as rc\n"
+        "from simulator.doe import run_parameter_sweep\n"
+        "from experiments.predator_prey.logic import PredatorPreyExperiment\n"
+        "rc.MIN_SHARED_NBYTES = 0\n"
+        "config = {'n_steps': 50, 'initial_prey': 40, 'initial_predators': 9,\n"
+        "          'predator_growth_rate': 0.01, 'predator_death_rate': 0.1}\n"
+        "if __name__ == '__main__':\n"
+        "    runs = run_parameter_sweep(PredatorPreyExperiment, config, {'prey_growth_rate': [0.1, 0.2],\n"
+        "                               'prey_death_rate': [0.01, 0.02]}, output_dir=None, n_workers=2)\n"
+        "    assert len(runs) == 4\n"
+    )
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    completed = subprocess.run([sys.executable, "-c", script], cwd=root, capture_output=True, text=True,
+                               env=dict(os.environ, PYTHONPATH=root), timeout=120)
+    assert completed.returncode == 0, completed.stderr
+    assert "resource_tracker" not in completed.stderr
+    assert "leaked" not in completed.stderr
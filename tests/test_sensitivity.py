@@ -0,0 +1,60 @@
+# tests/test_sensitivity.py
+import pytest
+from simulator.ode import ODEExperiment
+from simulator.sensitivity import SensitivityAnalysis, jacobian
+from experiments.predator_prey.logic import PredatorPreyExperiment
+import numpy as np
+
+
+class DecayExperiment(ODEExperiment):
+    state_names = ('x',)
+    batch_keys = ('rate', 'initial_x')
+
+    def __init__(self, config):
+        self.rate = config['rate']
+        super().__init__(config)
+
+    def rhs(self, t, y):
+        return -self.rate * y
+
+
+CONFIG = {'n_steps': 20, 'dt': 0.1, 'rate': 0.5, 'initial_x': 2.0, 'integrator': 'rk4', 'substeps': 10}
+
+
+@pytest.mark.parametrize("method", ["forward", "central"])
+def test_jacobian_matches_exact_derivatives(method):
+    final = {'final_x': lambda results: results['x']['data'][-1]}
+    derivatives = jacobian(DecayExperiment, CONFIG, ['rate', 'initial_x'], outputs=final, method=method)
+    t = 2.0
+    expected = [-t * 2.0 * np.exp(-0.5 * t), np.exp(-0.5 * t)]
+    assert derivatives['final_x'].shape == (2,)
+    assert np.allclose(derivatives['final_x'], expected, rtol=1e-5)
+
+
+def test_jacobian_of_trajectories_and_cache():
+    analysis = SensitivityAnalysis(DecayExperiment, CONFIG)
+    forward = analysis.jacobian(['rate', 'initial_x'], method='forward')
+    assert set(forward) == {'x'} and forward['x'].shape == (21, 2)
+    assert len(analysis._cache) == 3  # Base point plus one run per parameter
+    central = analysis.jacobian(['rate', 'initial_x'], abs_step={'rate': 1e-4, 'initial_x': 1e-3})
+    assert len(analysis._cache) == 7
+    assert np.allclose(central['x'][:, 1], np.exp(-0.5 * np.arange(21) * 0.1), rtol=1e-6)
+    analysis.base_outputs  # Served from the cache
+    assert len(analysis._cache) == 7
+
+
+def test_jacobian_in_worker_processes():
+    config = {'n_steps': 50, 'initial_prey': 40, 'initial_predators': 9, 'prey_growth_rate': 0.1,
+              'prey_death_rate': 0.02, 'predator_growth_rate': 0.01, 'predator_death_rate': 0.1}
+    params = ['prey_growth_rate', 'predator_death_rate', 'initial_prey']
+    serial = jacobian(PredatorPreyExperiment, config, params)
+    parallel = jacobian(PredatorPreyExperiment, config, params, n_workers=2)
+    assert serial['prey_population'].shape == (51, 3)
+    assert np.array_equal(serial['prey_population'], parallel['prey_population'])
+
+
+def test_jacobian_rejects_unknown_parameters():
+    with pytest.raises(KeyError):
+        jacobian(DecayExperiment, CONFIG, ['growth'])
+    with pytest.raises(ValueError):
+        jacobian(DecayExperiment, CONFIG, ['rate'], method='backward')
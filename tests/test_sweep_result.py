@@ -0,0 +1,121 @@
+# tests/test_sweep_result.py
+import pytest
+from simulator.sweep_result import SweepResult
+from simulator.doe import run_parameter_sweep, create_doe_table, stack_sweep_results
+from simulator.utils import DataDescriptor, DataType
+from experiments.predator_prey.logic import PredatorPreyExperiment
+import numpy as np
+import pandas as pd
+
+
+@pytest.fixture
+def runs():
+    params = [{'a': 1.0, 'b': 'x'}, {'a': 2.0, 'b': 'y'}, {'a': 3.0, 'b': 'x'}]
+    results = []
+    for p in params:
+        results.append({
+            "series": {
+                "data": np.arange(4) * p['a'],
+                "descriptor": DataDescriptor("series", DataType.NDARRAY, shape=(4,), group="time_series")
+            },
+            "total": {
+                "data": float(p['a'] * 10),
+                "descriptor": DataDescriptor("total", DataType.FLOAT, group="summary")
+            },
+            "table": {
+                "data": pd.DataFrame({'t': [0, 1], 'v': [p['a'], -p['a']]}),
+                "descriptor": DataDescriptor("table", DataType.DATAFRAME)
+            },
+        })
+    return params, results
+
+
+def test_from_runs_stacks_outputs(runs):
+    params, results = runs
+    sweep = SweepResult.from_runs(params, results)
+    assert len(sweep) == 3
+    assert sweep['series'].shape == (3, 4)
+    assert sweep['total'].shape == (3,)
+    assert sweep['table'].shape == (3, 2)
+    assert np.array_equal(sweep['series'][1], np.arange(4) * 2.0)
+
+
+def test_sel_by_parameter_value(runs):
+    params, results = runs
+    sweep = SweepResult.from_runs(params, results)
+    subset = sweep.sel(b='x')
+    assert len(subset) == 2
+    assert np.allclose(subset['total'], [10.0, 30.0])
+    assert len(sweep.sel(a=2.0, b='y')) == 1
+    assert len(sweep.sel(a=[1.0, 3.0])) == 2
+    with pytest.raises(KeyError):
+        sweep.sel(missing=1)
+
+
+def test_to_long_dataframe_is_lossless(runs):
+    params, results = runs
+    sweep = SweepResult.from_runs(params, results)
+    long_df = sweep.to_long_dataframe('series')
+    assert list(long_df.columns) == ['a', 'b', 'index', 'series']
+    assert len(long_df) == 12
+    assert np.array_equal(long_df[long_df['a'] == 3.0]['series'].to_numpy(), np.arange(4) * 3.0)
+
+    table_df = sweep.to_long_dataframe('table')
+    assert list(table_df.columns) == ['a', 'b', 'index', 't', 'v']
+    pd.testing.assert_frame_equal(sweep.get_run(1)['table']['data'], results[1]['table']['data'])
+
+
+def test_ragged_outputs_are_padded_and_trimmed(runs):
+    params, results = runs
+    results[0]['series']['data'] = np.arange(2, dtype=float)
+    sweep = SweepResult.from_runs(params, results)
+    assert sweep['series'].shape == (3, 4)
+    assert np.isnan(sweep['series'][0, 2:]).all()
+    assert np.array_equal(sweep.row_lengths('series'), [2, 4, 4])
+    assert len(sweep.to_long_dataframe('series')) == 10
+    assert np.array_equal(sweep.get_run(0)['series']['data'], [0.0, 1.0])
+
+
+def test_memmap_backing_and_reopen(runs, tmp_path):
+    params, results = runs
+    sweep = SweepResult.from_runs(params, results, directory=str(tmp_path / "sweep"))
+    assert isinstance(sweep['series'], np.memmap)
+
+    reopened = SweepResult.open(str(tmp_path / "sweep"))
+    assert isinstance(reopened['series'], np.memmap)
+    assert np.array_equal(reopened['series'], sweep['series'])
+    pd.testing.assert_frame_equal(reopened.params, sweep.params)
+    assert reopened.columns['table'] == ['t', 'v']
+
+
+def test_object_outputs_reopen_from_directory(tmp_path):
+    params = [{'a': 1.0}, {'a': 2.0}]
+    results = [{
+        "observed": {
+            "data": pd.DataFrame({'time': [0, 1], 'site': ['north', f'south{i}']}),
+            "descriptor": DataDescriptor("observed", DataType.DATAFRAME)
+        },
+    } for i in range(2)]
+    sweep = SweepResult.from_runs(params, results, directory=str(tmp_path / "sweep"))
+    assert sweep['observed'].dtype.hasobject
+
+    reopened = SweepResult.open(str(tmp_path / "sweep"))
+    pd.testing.assert_frame_equal(reopened.get_run(1)['observed']['data'], results[1]['observed']['data'])
+
+
+def test_run_parameter_sweep_stacked(tmp_path):
+    base_config = {
+        'n_steps': 10, 'initial_prey': 100, 'initial_predators': 20,
+        'predator_growth_rate': 0.01, 'predator_death_rate': 0.05,
+    }
+    param_ranges = {'prey_growth_rate': [0.1, 0.2], 'prey_death_rate': [0.01, 0.02]}
+    sweep = run_parameter_sweep(PredatorPreyExperiment, base_config, param_ranges,
+                                output_dir=str(tmp_path), output_transform='stacked')
+    assert isinstance(sweep, SweepResult)
+    assert sweep['prey_population'].shape == (4, 11)
+    assert 'record_id' in sweep.params.columns
+
+    listed = run_parameter_sweep(PredatorPreyExperiment, base_config, param_ranges,
+                                 output_dir=str(tmp_path), output_transform='list')
+    stacked = stack_sweep_results(create_doe_table(param_ranges), listed)
+    assert np.allclose(stacked['prey_population'], sweep['prey_population'])